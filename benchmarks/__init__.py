@@ -0,0 +1 @@
+"""Offline benchmarks against a local mock OpenAlex server."""
@@ -0,0 +1,57 @@
+"""
+Compare sync and async clients fetching every direction from a local mock server.
+
+Usage:
+    python -m benchmarks.bench_async_client [--latency 0.05] [--rate 50] [--connections 16]
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import time
+
+from benchmarks.mock_server import MockOpenAlexServer
+from src.api.async_openalex_client import AsyncOpenAlexClient
+from src.api.openalex_client import OpenAlexClient
+from src.api.rate_limit import RateLimiter
+from src.config.directions import DIRECTIONS
+
+START_YEAR = 2010
+END_YEAR = 2025
+
+
+def bench_sync(url: str, rate: float) -> float:
+    client = OpenAlexClient(base_url=url, rate_limiter=RateLimiter(rate))
+    start = time.perf_counter()
+    for d in DIRECTIONS:
+        client.fetch_direction_counts(d, START_YEAR, END_YEAR)
+    return time.perf_counter() - start
+
+
+async def bench_async(url: str, rate: float, connections: int) -> float:
+    async with AsyncOpenAlexClient(base_url=url, rate_limiter=RateLimiter(rate), connection_limit=connections) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*[client.fetch_direction_counts(d, START_YEAR, END_YEAR) for d in DIRECTIONS])
+        return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.05, help="mock server latency per request (s)")
+    parser.add_argument("--rate", type=float, default=50.0, help="client rate limit (requests/s)")
+    parser.add_argument("--connections", type=int, default=16, help="async connection pool size")
+    args = parser.parse_args()
+
+    with MockOpenAlexServer(latency=args.latency) as server:
+        sync_s = bench_sync(server.url, args.rate)
+        sync_requests = server.request_count
+        async_s = asyncio.run(bench_async(server.url, args.rate, args.connections))
+        async_requests = server.request_count - sync_requests
+
+    print(f"directions: {len(DIRECTIONS)}  latency: {args.latency * 1000:.0f} ms  rate: {args.rate}/s")
+    print(f"sync : {sync_s:6.2f} s  ({sync_requests} requests)")
+    print(f"async: {async_s:6.2f} s  ({async_requests} requests, {args.connections} connections)")
+    print(f"speedup: {sync_s / async_s:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Local stand-in for the OpenAlex API with configurable latency and rate limiting.
+
+Responses come from a recorded fixture (see `benchmarks.record_fixtures`) keyed by
+path and canonical query parameters. Requests missing from the fixture are either
+answered with deterministic synthetic data (`fallback=True`) or rejected with 404,
+so benchmarks can run without network access and can verify fixture coverage.
+
+Synthetic data covers the shapes the pipeline uses: `group_by=publication_year`,
+`group_by=concepts.id`, cursor-paged `/works` and `/concepts` search.
+"""
+from __future__ import annotations
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlencode, urlparse
+import gzip
+import hashlib
+import json
+import threading
+import time
+
+FIXTURE_VERSION = 1
+
+
+def fixture_key(path: str, params: Dict[str, Any]) -> str:
+    """Canonical "path?sorted&params" key shared by the recorder and the server."""
+    return "/" + path.strip("/") + "?" + urlencode(sorted((str(k), str(v)) for k, v in params.items()))
+
+
+def load_fixture(path: str) -> Dict[str, Any]:
+    """{key: response body} from a (optionally gzipped) fixture file."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:2] == b"\x1f\x8b":
+        data = gzip.decompress(data)
+    fixture = json.loads(data)
+    if fixture.get("version") != FIXTURE_VERSION:
+        raise ValueError(f"Unsupported fixture version in {path}")
+    return fixture["responses"]
+
+
+def _seed(*parts: Any) -> int:
+    return int(hashlib.md5(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()[:6], 16)
+
+
+def _filter_years(params: dict):
+    years = params.get("filter", "").split("publication_year:")[-1].split(",")[0]
+    try:
+        start, end = (int(y) for y in years.split("-"))
+    except ValueError:
+        try:
+            start = end = int(years)
+        except ValueError:
+            start, end = 2010, 2025
+    return start, end
+
+
+def _synthetic_group_by(params: dict) -> dict:
+    start, end = _filter_years(params)
+    seed = _seed(params)
+    rows = [{"key": str(y), "count": (seed % 997 + 1) * (y - start + 1)} for y in range(start, end + 1)]
+    return {"meta": {"count": sum(r["count"] for r in rows)}, "group_by": rows}
+
+
+def _synthetic_concept_groups(params: dict) -> dict:
+    ids = params.get("filter", "").split("concepts.id:")[-1].split(",")[0].split("|")
+    year, _ = _filter_years(params)
+    rows = [{"key": f"https://openalex.org/{c}", "count": (_seed(c) % 997 + 1) * (year - 2000)} for c in ids]
+    return {"meta": {"next_cursor": None}, "group_by": rows}
+
+
+def _synthetic_works_page(params: dict) -> dict:
+    """Cursor pages over 2-4 pages' worth of works per filter."""
+    per_page = int(params.get("per_page", 25))
+    total = per_page * (_seed(params.get("filter")) % 3 + 2) - 17
+    page = 0 if params.get("cursor", "*") == "*" else int(params["cursor"].lstrip("p"))
+    first = page * per_page
+    ids = range(first, min(first + per_page, total))
+    next_cursor = f"p{page + 1}" if first + per_page < total else None
+    return {"meta": {"count": total, "next_cursor": next_cursor}, "results": [{"id": f"https://openalex.org/W{i}"} for i in ids]}
+
+
+def _synthetic_concepts(params: dict) -> dict:
+    query = params.get("search", "")
+    return {"results": [{
+        "id": f"https://openalex.org/C{_seed(query.lower()) % 10**9}",
+        "display_name": query.strip().capitalize(),
+        "works_count": _seed(query) % 100000,
+    }]}
+
+
+def synthetic_response(path: str, params: dict) -> dict:
+    if path.strip("/") == "concepts":
+        return _synthetic_concepts(params)
+    if params.get("group_by") == "concepts.id":
+        return _synthetic_concept_groups(params)
+    if params.get("group_by"):
+        return _synthetic_group_by(params)
+    return _synthetic_works_page(params)
+
+
+class MockOpenAlexServer:
+    """Threaded HTTP server that sleeps `latency` seconds before each response.
+
+    Args:
+        fixture: {fixture_key: body} to replay (see `load_fixture`).
+        fallback: Answer requests missing from `fixture` with synthetic data instead of 404.
+        rate_limit: Requests/second admitted (token bucket, burst of one second);
+            excess requests get 429 with a Retry-After, like the real API.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        port: int = 0,
+        fixture: Optional[Dict[str, Any]] = None,
+        fallback: bool = True,
+        rate_limit: Optional[float] = None,
+    ):
+        self.latency = latency
+        self.fixture = fixture
+        self.fallback = fallback
+        self.rate_limit = rate_limit
+        self.request_count = 0
+        self.throttled = 0
+        self.misses = []
+        self._tokens = rate_limit or 0.0
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                retry_after = server._admit()
+                time.sleep(server.latency)
+                if retry_after is not None:
+                    self._send(429, b"{}", {"Retry-After": f"{retry_after:.3f}"})
+                    return
+                body = server._respond(parsed.path, params)
+                if body is None:
+                    self._send(404, b'{"error": "not in fixture"}')
+                    return
+                self._send(200, json.dumps(body).encode("utf-8"))
+
+            def _send(self, status, payload, headers=None):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def _admit(self) -> Optional[float]:
+        """Count the request; return a Retry-After delay if it exceeds the rate limit."""
+        with self._lock:
+            self.request_count += 1
+            if not self.rate_limit:
+                return None
+            now = time.monotonic()
+            self._tokens = min(self.rate_limit, self._tokens + (now - self._last) * self.rate_limit)
+            self._last = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return None
+            self.throttled += 1
+            return (1 - self._tokens) / self.rate_limit
+
+    def _respond(self, path: str, params: dict) -> Optional[dict]:
+        if self.fixture is not None:
+            body = self.fixture.get(fixture_key(path, params))
+            if body is not None:
+                return body
+            with self._lock:
+                self.misses.append(fixture_key(path, params))
+            if not self.fallback:
+                return None
+        return synthetic_response(path, params)
+
+    def __enter__(self) -> "MockOpenAlexServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,84 @@
+"""
+Record the OpenAlex responses the benchmark suite needs into a replayable fixture.
+
+Runs every network scenario of `benchmarks.run_benchmarks` once through clients that
+keep each response body, keyed by `fixture_key`, and writes them as gzipped JSON.
+Recording against the live API pages every NLP work of PAGING_START..PAGING_END, so it
+takes a while and should be repeated only when the queries the pipeline issues change.
+
+Usage:
+    python -m benchmarks.record_fixtures [--out benchmarks/fixtures/openalex.json.gz]
+    python -m benchmarks.record_fixtures --synthetic   # from the mock server's synthetic data
+"""
+from __future__ import annotations
+from typing import Any, Dict, Optional
+import argparse
+import gzip
+import json
+import os
+import threading
+
+from benchmarks.mock_server import FIXTURE_VERSION, MockOpenAlexServer, fixture_key
+from benchmarks.run_benchmarks import FIXTURE_PATH, NETWORK_SCENARIOS, isolated_workdir
+from src.api.openalex_client import OpenAlexClient
+from src.api.rate_limit import RateLimiter
+
+
+class RecordingClient(OpenAlexClient):
+    """OpenAlexClient that stores every response body it returns in `recorded`."""
+
+    def __init__(self, recorded: Dict[str, Any], lock: threading.Lock, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.recorded = recorded
+        self._record_lock = lock
+
+    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        data = super().get(endpoint, params)
+        with self._record_lock:
+            self.recorded[fixture_key(endpoint, params or {})] = data
+        return data
+
+
+def record(base_url: Optional[str] = None, rate: float = 8.0) -> Dict[str, Any]:
+    """{fixture_key: body} for every request the network scenarios make against `base_url`."""
+    recorded: Dict[str, Any] = {}
+    lock = threading.Lock()
+
+    def make_client() -> OpenAlexClient:
+        return RecordingClient(recorded, lock, base_url=base_url, rate_limiter=RateLimiter(rate))
+
+    with isolated_workdir():
+        for name, scenario in NETWORK_SCENARIOS.items():
+            before = len(recorded)
+            scenario(make_client)
+            print(f"[RECORD] {name}: {len(recorded) - before} new responses")
+    return recorded
+
+
+def write_fixture(responses: Dict[str, Any], path: str = FIXTURE_PATH) -> str:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    raw = json.dumps({"version": FIXTURE_VERSION, "responses": dict(sorted(responses.items()))}, separators=(",", ":"))
+    with open(path, "wb") as f:
+        f.write(gzip.compress(raw.encode("utf-8"), mtime=0))
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", default=FIXTURE_PATH, help="fixture file to write")
+    parser.add_argument("--base-url", default=None, help="API to record from (default: the live OpenAlex API)")
+    parser.add_argument("--rate", type=float, default=8.0, help="client rate limit while recording (requests/s)")
+    parser.add_argument("--synthetic", action="store_true", help="record the mock server's synthetic responses")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        with MockOpenAlexServer(latency=0.0) as server:
+            responses = record(server.url, rate=1000.0)
+    else:
+        responses = record(args.base_url, rate=args.rate)
+    path = write_fixture(responses, args.out)
+    print(f"[RECORD] Wrote {len(responses)} responses to {path} ({os.path.getsize(path) / 1024:.1f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
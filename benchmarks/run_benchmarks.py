@@ -0,0 +1,288 @@
+"""
+Offline benchmark suite: the pipeline's hot paths against a recorded OpenAlex fixture.
+
+Scenarios:
+    fetch_direction_counts    every direction, one sync client, serially
+    aggregate_all_directions  cold in-memory cache, 4 workers, concept batching
+    full_paging               NLP cursor paging for PAGING_START..PAGING_END, 2 workers
+    heatmap                   pivot + log1p transform + PNG render of the aggregated frame
+    publish                   per-direction JSON + snapshot uploads to MemoryStorage, cold then warm
+
+The mock server replays `benchmarks/fixtures/openalex.json.gz` (see
+`benchmarks.record_fixtures`) with configurable latency and rate limiting, so no
+network access is needed. Each run is appended to a JSONL history; runs are compared
+with recent runs of the same configuration on the same machine, and a scenario that
+got slower by more than `--threshold` or issues more requests is reported as a regression.
+
+Usage:
+    python -m benchmarks.run_benchmarks [--latency 0.02] [--rate-limit 0] [--repeat 3] [--check]
+"""
+from __future__ import annotations
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from statistics import median
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+import argparse
+import hashlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.mock_server import MockOpenAlexServer, load_fixture
+from src.api.openalex_client import OpenAlexClient
+from src.api.rate_limit import RateLimiter
+from src.cache import MemoryCache
+from src.config.directions import BY_NAME, DIRECTIONS
+from src.data.aggregate import aggregate_all_directions
+from src.data.process import counts_by_direction
+from src.data.snapshot import build_snapshot, snapshot_bytes, snapshot_name
+from src.publish import publish
+from src.storage_backends import MemoryStorage, Upload, json_upload
+from src.viz.render import render_heatmap
+
+START_YEAR = 2010
+END_YEAR = 2025
+PAGING_START = 2023
+PAGING_END = 2024
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_PATH = os.path.join(BENCH_DIR, "fixtures", "openalex.json.gz")
+HISTORY_PATH = os.path.join(BENCH_DIR, "results", "history.jsonl")
+
+REGRESSION_THRESHOLD = 0.20    # relative slowdown vs. the baseline median
+MIN_REGRESSION_SECONDS = 0.02  # ignore slowdowns smaller than this (timer noise)
+BASELINE_RUNS = 5              # recent matching runs the baseline is taken from
+
+ClientFactory = Callable[[], OpenAlexClient]
+
+
+def client_factory(url: str, rate: float = 200.0) -> ClientFactory:
+    """Fresh clients (cold caches) pointed at `url`, each with its own rate limiter."""
+    return lambda: OpenAlexClient(base_url=url, rate_limiter=RateLimiter(rate), pool_size=8, backoff_base=0.05)
+
+
+@contextmanager
+def isolated_workdir() -> Iterator[str]:
+    """Run in an empty temporary directory so the relative cache/ and output/ dirs start cold."""
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="ai_trend_bench_") as workdir:
+        os.chdir(workdir)
+        try:
+            yield workdir
+        finally:
+            os.chdir(previous)
+
+
+# ---------- Scenarios ----------
+def bench_fetch_direction_counts(make_client: ClientFactory) -> None:
+    client = make_client()
+    for d in DIRECTIONS:
+        client.fetch_direction_counts(d, START_YEAR, END_YEAR)
+
+
+def bench_aggregate(make_client: ClientFactory) -> pd.DataFrame:
+    return aggregate_all_directions(
+        DIRECTIONS, START_YEAR, END_YEAR, max_workers=4, client=make_client(), cache=MemoryCache()
+    )
+
+
+def bench_full_paging(make_client: ClientFactory) -> None:
+    make_client().fetch_nlp_counts_full_paging(PAGING_START, PAGING_END, max_workers=2, on_progress=lambda event: None)
+
+
+NETWORK_SCENARIOS: Dict[str, Callable[[ClientFactory], Any]] = {
+    "fetch_direction_counts": bench_fetch_direction_counts,
+    "aggregate_all_directions": bench_aggregate,
+    "full_paging": bench_full_paging,
+}
+
+
+def bench_heatmap(df: pd.DataFrame) -> None:
+    render_heatmap(df, START_YEAR, END_YEAR, transform="log1p")
+
+
+def publish_uploads(df: pd.DataFrame) -> List[Upload]:
+    """The objects a refresh publishes: per-direction JSON series plus the snapshot."""
+    uploads = [
+        json_upload(BY_NAME[name].object_path(START_YEAR, END_YEAR), counts)
+        for name, counts in counts_by_direction(df).items()
+    ]
+    snapshot = build_snapshot(df, START_YEAR, END_YEAR, directions=[d["name"] for d in DIRECTIONS])
+    uploads.append(Upload(snapshot_name(START_YEAR, END_YEAR), snapshot_bytes(snapshot), "application/json", "gzip"))
+    return uploads
+
+
+def bench_publish(df: pd.DataFrame) -> None:
+    backend = MemoryStorage()
+    publish(backend, publish_uploads(df))
+    publish(backend, publish_uploads(df))
+
+
+FRAME_SCENARIOS: Dict[str, Callable[[pd.DataFrame], Any]] = {
+    "heatmap": bench_heatmap,
+    "publish": bench_publish,
+}
+
+SCENARIOS = tuple(NETWORK_SCENARIOS) + tuple(FRAME_SCENARIOS)
+
+
+def _measure(fn: Callable[[], Any], repeat: int, server: Optional[MockOpenAlexServer]) -> Dict[str, Any]:
+    served = server.request_count - server.throttled if server else 0
+    throttled = server.throttled if server else 0
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    result: Dict[str, Any] = {"seconds": median(times), "min": min(times)}
+    if server is not None:
+        result["requests"] = (server.request_count - server.throttled - served) // repeat
+        result["throttled"] = server.throttled - throttled
+    return result
+
+
+def run_suite(
+    server: MockOpenAlexServer,
+    repeat: int = 3,
+    client_rate: float = 200.0,
+    only: Optional[Sequence[str]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Time each scenario `repeat` times; returns {scenario: {"seconds" (median), "min", ...}}.
+
+    Network scenarios also report the requests answered per run and the 429s received.
+    Everything runs in an `isolated_workdir`, so on-disk caches never leak into timings.
+    """
+    selected = [s for s in SCENARIOS if not only or s in only]
+    make_client = client_factory(server.url, client_rate)
+    results: Dict[str, Dict[str, Any]] = {}
+    with isolated_workdir():
+        for name in selected:
+            if name in NETWORK_SCENARIOS:
+                fn = NETWORK_SCENARIOS[name]
+                results[name] = _measure(lambda: fn(make_client), repeat, server)
+        if any(name in FRAME_SCENARIOS for name in selected):
+            df = bench_aggregate(make_client)
+            for name in selected:
+                if name in FRAME_SCENARIOS:
+                    fn = FRAME_SCENARIOS[name]
+                    results[name] = _measure(lambda: fn(df), repeat, None)
+    return results
+
+
+# ---------- History & regression checks ----------
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR, capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def _fixture_hash(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.md5(f.read()).hexdigest()[:12]
+
+
+def history_entry(results: Dict[str, Dict[str, Any]], config: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "machine": f"{platform.node()}/{platform.machine()}",
+        "python": platform.python_version(),
+        "config": config,
+        "results": results,
+    }
+
+
+def load_history(path: str = HISTORY_PATH) -> List[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def append_history(entry: Dict[str, Any], path: str = HISTORY_PATH) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, sort_keys=True) + "\n")
+
+
+def find_regressions(
+    entry: Dict[str, Any],
+    history: List[Dict[str, Any]],
+    threshold: float = REGRESSION_THRESHOLD,
+    min_seconds: float = MIN_REGRESSION_SECONDS,
+    runs: int = BASELINE_RUNS,
+) -> List[str]:
+    """Scenarios in `entry` that regressed against recent comparable runs in `history`.
+
+    Only runs with the same machine and config are comparable. Time is compared with the
+    median of their medians; request counts (deterministic for a given fixture) with the
+    most recent run.
+    """
+    comparable = [h for h in history if h.get("machine") == entry["machine"] and h.get("config") == entry["config"]][-runs:]
+    messages: List[str] = []
+    for name, result in entry["results"].items():
+        previous = [h["results"][name] for h in comparable if name in h.get("results", {})]
+        if not previous:
+            continue
+        baseline = median(p["seconds"] for p in previous)
+        if result["seconds"] > baseline * (1 + threshold) and result["seconds"] - baseline > min_seconds:
+            messages.append(f"{name}: {result['seconds']:.3f}s vs baseline {baseline:.3f}s (+{result['seconds'] / baseline - 1:.0%})")
+        if "requests" in result and "requests" in previous[-1] and result["requests"] > previous[-1]["requests"]:
+            messages.append(f"{name}: {result['requests']} requests vs {previous[-1]['requests']} last run")
+    return messages
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.02, help="mock server latency per request (s)")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="server rate limit (requests/s, 0 = off)")
+    parser.add_argument("--client-rate", type=float, default=200.0, help="client rate limit (requests/s)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per scenario (median is reported)")
+    parser.add_argument("--only", nargs="+", choices=SCENARIOS, help="run only these scenarios")
+    parser.add_argument("--fixture", default=FIXTURE_PATH, help="recorded responses to replay")
+    parser.add_argument("--fallback", action="store_true", help="answer requests missing from the fixture with synthetic data")
+    parser.add_argument("--history", default=HISTORY_PATH, help="JSONL file runs are appended to")
+    parser.add_argument("--no-record", action="store_true", help="do not append this run to the history")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD, help="relative slowdown reported as a regression")
+    parser.add_argument("--check", action="store_true", help="exit 1 when a regression is found")
+    args = parser.parse_args(argv)
+
+    fixture = load_fixture(args.fixture)
+    with MockOpenAlexServer(latency=args.latency, fixture=fixture, fallback=args.fallback, rate_limit=args.rate_limit or None) as server:
+        results = run_suite(server, repeat=args.repeat, client_rate=args.client_rate, only=args.only)
+        misses = len(server.misses)
+
+    config = {
+        "latency": args.latency,
+        "rate_limit": args.rate_limit,
+        "client_rate": args.client_rate,
+        "repeat": args.repeat,
+        "fixture": _fixture_hash(args.fixture),
+    }
+    entry = history_entry(results, config)
+    print(f"[BENCH] commit {entry['commit']}  latency {args.latency * 1000:.0f} ms  rate limit {args.rate_limit or 'off'}")
+    for name, r in results.items():
+        extra = f"  {r['requests']} requests, {r['throttled']} throttled" if "requests" in r else ""
+        print(f"[BENCH] {name:<26} {r['seconds']:8.3f}s  (min {r['min']:.3f}s){extra}")
+    if misses:
+        print(f"[WARN] {misses} requests were not in the fixture; re-record with benchmarks.record_fixtures")
+
+    regressions = find_regressions(entry, load_history(args.history), threshold=args.threshold)
+    for message in regressions:
+        print(f"[REGRESSION] {message}")
+    if not args.no_record:
+        append_history(entry, args.history)
+        print(f"[BENCH] Appended to {args.history}")
+    return 1 if args.check and (regressions or misses) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
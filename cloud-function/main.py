@@ -1,13 +1,27 @@
+import asyncio
 import functions_framework
 import json
 import pandas as pd
-from google.cloud import storage
 from flask import make_response
 
-from src.config.directions import DIRECTIONS
-from src.data.aggregate import aggregate_all_directions
+from src.config.directions import DIRECTIONS, END_YEAR, REGISTRY, START_YEAR
+from src.config.storage import BUCKET_NAME
+from src.data.aggregate import aggregate_all_directions_async
+from src.data.analytics import analytics_bytes, analytics_name, build_analytics, build_ranking_index, ranking_index_name
+from src.data.process import counts_by_direction
+from src.data.snapshot import build_snapshot, manifest_metadata, snapshot_bytes, snapshot_name
+from src.metrics import Metrics
+from src.publish import publish
+from src.storage_backends import GCSStorage, Upload, json_upload
 
-BUCKET_NAME = "ai-trend-cache"
+# Max open connections to OpenAlex; all directions share the client's rate limiter.
+CONNECTION_LIMIT = 16
+# Warm invocations keep /tmp caches; only the volatile tail years are re-queried.
+REFRESH_YEARS = 2
+# Count keyword-only directions by an exactly matching OpenAlex concept when one exists.
+RESOLVE_CONCEPTS = False
+# Concurrent blob uploads; each upload is one HTTP request to GCS.
+UPLOAD_WORKERS = 8
 
 CORS_HEADERS = {
     "Access-Control-Allow-Origin": "*",
@@ -27,26 +41,47 @@ def refresh(request):
         resp.headers["Content-Type"] = "application/json"
         return resp
 
-    # 1) Aggregate all directions 2010–2025
-    df = aggregate_all_directions(DIRECTIONS, 2010, 2025)
+    # 1) Aggregate all directions over the configured years, fanned out on one event loop
+    metrics = Metrics()
+    df = asyncio.run(aggregate_all_directions_async(
+        DIRECTIONS, START_YEAR, END_YEAR, connection_limit=CONNECTION_LIMIT, refresh_years=REFRESH_YEARS,
+        resolve_concepts=RESOLVE_CONCEPTS, metrics=metrics,
+    ))
+    # One structured log line per refresh, queryable in Cloud Logging
+    print(json.dumps({"metrics": metrics.to_dict()}))
 
     # 2) Convert to per-direction JSON and upload to GCS
-    direction_json = {}
-    for _, row in df.iterrows():
-        direction = row["direction"]
-        year = int(row["year"])
-        count = int(row["count"])
-        direction_json.setdefault(direction, {})[year] = count
-
-    client = storage.Client()
-    bucket = client.bucket(BUCKET_NAME)
-
-    for direction, counts in direction_json.items():
-        slug = direction.lower().replace(" ", "_").replace("/", "_")
-        blob = bucket.blob(f"{slug}_2010_2025.json")
-        blob.upload_from_string(json.dumps(counts), content_type="application/json")
-
-    payload = json.dumps({"status": "ok"})
+    direction_json = counts_by_direction(df)
+
+    uploads = [
+        json_upload(d.object_path(START_YEAR, END_YEAR), direction_json[d.name])
+        for d in REGISTRY
+        if d.name in direction_json
+    ]
+
+    # 3) Consolidated snapshot: one gzipped object with every direction x year
+    snapshot = build_snapshot(df, START_YEAR, END_YEAR, directions=[d.name for d in REGISTRY])
+    uploads.append(Upload(snapshot_name(START_YEAR, END_YEAR), snapshot_bytes(snapshot), "application/json", "gzip"))
+    # Growth rates, shares and per-year ranks, precomputed for the ranking board
+    analytics = build_analytics(snapshot)
+    uploads.append(Upload(analytics_name(START_YEAR, END_YEAR), analytics_bytes(analytics), "application/json", "gzip"))
+    ranking_index = build_ranking_index(snapshot)
+    uploads.append(Upload(ranking_index_name(START_YEAR, END_YEAR), analytics_bytes(ranking_index), "application/json", "gzip"))
+
+    # Concurrent, gzip-encoded uploads; objects unchanged since manifest.json are skipped
+    # manifest.json also lists the directions and year range; the dashboard reads it first on every visit
+    metadata = manifest_metadata(REGISTRY, START_YEAR, END_YEAR)
+    report = publish(GCSStorage(BUCKET_NAME), uploads, max_workers=UPLOAD_WORKERS, metadata=metadata)
+    print(f"[PUBLISH] {report.summary()}")
+
+    payload = json.dumps({
+        "status": "ok",
+        "uploaded": len(report.uploaded),
+        "skipped": len(report.skipped),
+        "bytes_uploaded": report.bytes_uploaded,
+        "bytes_skipped": report.bytes_skipped,
+        "summary": metrics.summary(),
+    })
     resp = make_response((payload, 200))
     for k, v in CORS_HEADERS.items():
         resp.headers[k] = v
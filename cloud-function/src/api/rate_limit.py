@@ -0,0 +1,89 @@
+"""
+Thread-safe request pacing and retry helpers shared by every caller of an OpenAlexClient.
+"""
+from __future__ import annotations
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Optional
+import asyncio
+import random
+import threading
+import time
+
+
+class RateLimiter:
+    """Token-bucket limiter: sustains `rate` requests per second with bursts of up to `burst`.
+
+    A single instance is shared across threads, so a pool of workers issuing
+    requests through the same client stays within one global budget. When the
+    server asks us to back off (HTTP 429 + Retry-After), `pause()` blocks every
+    caller until the requested time has passed.
+    """
+
+    def __init__(self, rate: float = 8.0, burst: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(burst if burst is not None else rate, 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take one token (possibly going into debt) and return how long to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1.0
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def acquire(self) -> float:
+        """Block until the caller may issue its next request. Returns seconds waited."""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return max(delay, 0.0)
+
+    async def acquire_async(self) -> float:
+        """Async variant of `acquire` that yields to the event loop while waiting."""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return max(delay, 0.0)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back all callers for `seconds` (e.g. from a Retry-After header)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            # Drain the bucket so requests resume at the sustained rate, not as a burst.
+            self._tokens = min(self._tokens, 0.0)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds from now."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Exponential backoff with jitter for retry number `attempt` (1-based).
+
+    Returns a delay in [d/2, d], where d = min(cap, base * 2 ** (attempt - 1)).
+    """
+    delay = min(cap, base * (2 ** (attempt - 1)))
+    return delay / 2 + random.uniform(0, delay / 2)
@@ -0,0 +1,207 @@
+"""
+Sharded, resumable cursor paging over /works.
+
+A "full" crawl is split into independent shards (one per year, optionally split
+further by month or by work type). Each shard is its own cursor chain, so shards
+can be paged concurrently through one client whose rate limiter bounds the total
+request rate. Progress is checkpointed per shard, so an interrupted crawl resumes
+from each shard's last cursor instead of starting over. Each checkpoint entry records
+a fingerprint of the shard's filter (base filter plus split), so a run with a
+different filter or split restarts that shard rather than reusing its counts.
+"""
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import calendar
+import json
+import logging
+import os
+import threading
+
+from src.cache import fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Most frequent OpenAlex work types; everything else lands in an "other" shard.
+DEFAULT_TYPES = ("article", "book-chapter", "dissertation", "preprint", "review")
+
+
+@dataclass(frozen=True)
+class Shard:
+    """One independent cursor chain: works of `year` matching `filter`."""
+
+    key: str
+    year: int
+    filter: str
+
+
+@dataclass(frozen=True)
+class ShardProgress:
+    """Structured progress event emitted after every page (and on completion or failure)."""
+
+    shard: str
+    year: int
+    pages: int
+    works: int
+    done: bool
+    error: Optional[str] = None
+
+
+def build_shards(
+    base_filter: str,
+    start_year: int,
+    end_year: int,
+    split_by: Optional[str] = None,
+    types: Sequence[str] = DEFAULT_TYPES,
+) -> List[Shard]:
+    """Split `base_filter` over [start_year, end_year] into shards.
+
+    split_by:
+        None    -> one shard per year
+        "month" -> twelve shards per year (publication date ranges)
+        "type"  -> one shard per entry of `types` plus an "other" shard per year
+    """
+    prefix = f"{base_filter}," if base_filter else ""
+    shards: List[Shard] = []
+    for year in range(start_year, end_year + 1):
+        year_filter = f"{prefix}publication_year:{year}"
+        if split_by is None:
+            shards.append(Shard(str(year), year, year_filter))
+        elif split_by == "month":
+            for month in range(1, 13):
+                last_day = calendar.monthrange(year, month)[1]
+                shards.append(Shard(
+                    f"{year}-{month:02d}",
+                    year,
+                    f"{prefix}from_publication_date:{year}-{month:02d}-01,"
+                    f"to_publication_date:{year}-{month:02d}-{last_day:02d}",
+                ))
+        elif split_by == "type":
+            for t in types:
+                shards.append(Shard(f"{year}:{t}", year, f"{year_filter},type:{t}"))
+            others = ",".join(f"type:!{t}" for t in types)
+            shards.append(Shard(f"{year}:other", year, f"{year_filter},{others}"))
+        else:
+            raise ValueError("Invalid split_by. Use None, 'month' or 'type'.")
+    return shards
+
+
+class ShardCheckpoint:
+    """Per-shard cursor/count state persisted as JSON, written atomically after each page.
+
+    File layout: {shard_key: {"cursor": str | null, "works": int, "pages": int, "done": bool,
+    "fingerprint": str}}, where "fingerprint" identifies the shard filter the entry was paged with.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._state: Dict[str, Dict[str, Any]] = {}
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self._state = json.load(f)
+
+    def get(self, key: str, shard_fingerprint: Optional[str] = None) -> Dict[str, Any]:
+        """Saved state for `key`; a fresh state if the entry was written for a different shard filter."""
+        with self._lock:
+            entry = self._state.get(key)
+            if entry and shard_fingerprint is not None and entry.get("fingerprint") != shard_fingerprint:
+                logger.warning("Discarding checkpoint for shard %s: it was written for a different filter", key)
+                entry = None
+            return dict(entry or {"cursor": "*", "works": 0, "pages": 0, "done": False})
+
+    def update(self, key: str, **fields: Any) -> None:
+        with self._lock:
+            entry = self._state.setdefault(key, {"cursor": "*", "works": 0, "pages": 0, "done": False})
+            entry.update(fields)
+            if not self.path:
+                return
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._state, f)
+            os.replace(tmp_path, self.path)
+
+
+def shard_fingerprint(shard: Shard) -> str:
+    """Identifies what a shard counts: its full filter (base filter, year and split)."""
+    return fingerprint(shard.filter)[:16]
+
+
+def _log_progress(event: ShardProgress) -> None:
+    if event.error:
+        status = f"failed: {event.error}"
+    else:
+        status = "done" if event.done else "in progress"
+    level = logging.ERROR if event.error else logging.INFO
+    logger.log(
+        level, "Shard %s: %d pages, %d works, %s", event.shard, event.pages, event.works, status,
+        extra={"shard_progress": event},
+    )
+
+
+def page_shards(
+    client,
+    shards: Sequence[Shard],
+    max_workers: int = 4,
+    checkpoint_path: Optional[str] = None,
+    select: Sequence[str] = ("id",),
+    on_progress: Optional[Callable[[ShardProgress], None]] = None,
+    on_page: Optional[Callable[[Shard, List[Dict[str, Any]]], None]] = None,
+) -> Dict[str, Optional[int]]:
+    """Page every shard to completion, `max_workers` shards at a time.
+
+    Args:
+        client: An OpenAlexClient; its rate limiter is shared by all workers.
+        shards: Output of `build_shards`.
+        checkpoint_path: JSON file for resumable state; finished shards are skipped
+            and unfinished ones restart from their saved cursor. Entries saved for a
+            different shard filter are discarded.
+        select: Field projection for each page; pass more fields with `on_page`
+            to consume per-work metadata.
+        on_progress: Receives a `ShardProgress` after every page; defaults to logging.
+        on_page: Receives (shard, results) for every page as it arrives.
+    Returns:
+        {shard_key: works counted}, with None for shards that failed.
+    """
+    checkpoint = ShardCheckpoint(checkpoint_path)
+    report = on_progress or _log_progress
+
+    def run(shard: Shard) -> Optional[int]:
+        fp = shard_fingerprint(shard)
+        state = checkpoint.get(shard.key, fp)
+        works, pages = int(state["works"]), int(state["pages"])
+        if state["done"]:
+            report(ShardProgress(shard.key, shard.year, pages, works, True))
+            return works
+        params = {"filter": shard.filter, "per_page": 200, "cursor": state["cursor"] or "*"}
+        try:
+            for results, next_cursor in client.iter_work_pages(params, select=select):
+                if on_page is not None:
+                    on_page(shard, results)
+                works += len(results)
+                pages += 1
+                checkpoint.update(
+                    shard.key, cursor=next_cursor, works=works, pages=pages, done=next_cursor is None, fingerprint=fp,
+                )
+                report(ShardProgress(shard.key, shard.year, pages, works, next_cursor is None))
+        except Exception as e:
+            report(ShardProgress(shard.key, shard.year, pages, works, False, error=str(e)))
+            return None
+        return works
+
+    if max_workers <= 1:
+        counts = [run(s) for s in shards]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            counts = list(pool.map(run, shards))
+    return {s.key: c for s, c in zip(shards, counts)}
+
+
+def sum_by_year(shards: Sequence[Shard], shard_counts: Dict[str, Optional[int]]) -> Dict[int, int]:
+    """Roll shard counts up to {year: count}; a year with any failed shard counts as 0."""
+    out: Dict[int, int] = {}
+    failed = {s.year for s in shards if shard_counts.get(s.key) is None}
+    for s in shards:
+        out[s.year] = 0 if s.year in failed else out.get(s.year, 0) + int(shard_counts[s.key])
+    return out
@@ -0,0 +1,209 @@
+"""
+Pluggable key/value cache with TTL and size-bounded LRU eviction.
+
+Backends store JSON-serializable values:
+- MemoryCache: per-process, bounded by entry count.
+- DiskCache: one JSON (optionally gzipped) file per key under a directory, written
+  atomically (temp file + rename) and bounded by entry count and/or total bytes.
+
+Keys should be derived with `fingerprint()` from everything that affects the value,
+so a change in query strategy or configuration never serves stale results.
+"""
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+import gzip
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+
+
+def fingerprint(*parts: Any) -> str:
+    """Stable SHA-256 hex digest of JSON-serializable parts."""
+    canonical = json.dumps(parts, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class CacheBackend:
+    """Interface shared by cache backends."""
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store `value`; it expires after `ttl` seconds (backend default if None)."""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+def _expiry(ttl: Optional[float], default_ttl: Optional[float]) -> Optional[float]:
+    ttl = default_ttl if ttl is None else ttl
+    return time.time() + ttl if ttl is not None else None
+
+
+class MemoryCache(CacheBackend):
+    """Thread-safe in-process LRU cache."""
+
+    def __init__(self, max_entries: Optional[int] = None, default_ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires is not None and expires <= time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        with self._lock:
+            self._data[key] = (_expiry(ttl, self.default_ttl), value)
+            self._data.move_to_end(key)
+            while self.max_entries is not None and len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class DiskCache(CacheBackend):
+    """One file per key under `directory`.
+
+    Each file holds {"key", "created", "expires", "value"}. Writes go to a temp file
+    in the same directory and are renamed into place, so readers never observe a
+    partial file. Reads refresh the file's mtime, which drives LRU eviction once
+    `max_entries` or `max_bytes` is exceeded.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        default_ttl: Optional[float] = None,
+        compress: bool = False,
+    ):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.compress = compress
+        self._suffix = ".json.gz" if compress else ".json"
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, key: str) -> str:
+        safe = re.sub(r"[^A-Za-z0-9._()-]", "_", key)
+        return os.path.join(self.directory, safe + self._suffix)
+
+    def _load(self, path: str) -> Optional[Dict[str, Any]]:
+        try:
+            if self.compress:
+                with gzip.open(path, "rt", encoding="utf-8") as f:
+                    return json.load(f)
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self.path_for(key)
+        envelope = self._load(path)
+        if envelope is None or envelope.get("key") != key:
+            return None
+        expires = envelope.get("expires")
+        if expires is not None and expires <= time.time():
+            self.delete(key)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return envelope.get("value")
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        envelope = {"key": key, "created": time.time(), "expires": _expiry(ttl, self.default_ttl), "value": value}
+        data = json.dumps(envelope, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        if self.compress:
+            data = gzip.compress(data)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self.path_for(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        if self.max_entries is not None or self.max_bytes is not None:
+            self._evict()
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self.path_for(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        for _, path, _ in self._entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _entries(self):
+        """(mtime, path, size) for every cache file."""
+        out = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(self._suffix) or name.startswith(".tmp-"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            out.append((st.st_mtime, path, st.st_size))
+        return out
+
+    def _evict(self) -> None:
+        """Remove least recently used files until both limits hold."""
+        with self._lock:
+            entries = sorted(self._entries())
+            total = sum(size for _, _, size in entries)
+            count = len(entries)
+            for _, path, size in entries:
+                over_count = self.max_entries is not None and count > self.max_entries
+                over_bytes = self.max_bytes is not None and total > self.max_bytes
+                if not (over_count or over_bytes):
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                count -= 1
+                total -= size
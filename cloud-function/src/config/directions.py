@@ -1,173 +1,149 @@
 """
-Frontend and Cloud Function share the same list of AI sub-directions.
-Copy of src/config/directions.py for Cloud Function packaging.
+Registry of the AI sub-directions tracked by the pipeline.
+
+Directions are defined in one place, directions.json next to this module:
+
+    {
+      "start_year": 2010, "end_year": 2025,
+      "directions": [{"name": "...", "concept_id": "https://openalex.org/C..." | null, "keywords": [...]}, ...]
+    }
+
+- name: Human-readable label
+- concept_id: Optional OpenAlex concept id (full URI like "https://openalex.org/C154945302").
+- keywords: Fallback keyword list to use with `search` when no concept id is available.
+
+Notes:
+- Concept IDs are provided when relatively stable/known; many niche/new topics rely on keywords.
+- Keywords are conservative and short to avoid overly broad matches.
+
+The file is read once at import into `REGISTRY`, a tuple of frozen `Direction`s whose
+slug, query fingerprint and cache key (for START_YEAR..END_YEAR) are computed there,
+so the pipeline, the Cloud Function and the published manifest all use the same
+values. `DIRECTIONS` is the plain-dict view the API clients take.
+
+cloud-function/src/config/ holds byte-identical copies of this module and
+directions.json for Cloud Function packaging; tests/test_directions.py checks them.
 """
 from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+import json
+import os
 
-DIRECTIONS = [
-    {
-        "name": "Natural Language Processing",
-        "concept_id": "https://openalex.org/C154945302",
-        "keywords": ["natural language processing", "nlp"],
-    },
-    {
-        "name": "Large Language Models (LLM)",
-        "concept_id": None,
-        "keywords": ["large language model", "LLM"],
-    },
-    {
-        "name": "Vision-Language Models (VLM)",
-        "concept_id": None,
-        "keywords": ["vision-language", "VLM", "vision language model"],
-    },
-    {
-        "name": "Video LLM",
-        "concept_id": None,
-        "keywords": ["video LLM", "video-language model", "video language model"],
-    },
-    {
-        "name": "Retrieval-Augmented Generation (RAG)",
-        "concept_id": None,
-        "keywords": ["retrieval augmented generation", "RAG"],
-    },
-    {
-        "name": "Graph Neural Networks (GNN)",
-        "concept_id": None,
-        "keywords": ["graph neural network", "GNN"],
-    },
-    {
-        "name": "Graph Representation Learning",
-        "concept_id": None,
-        "keywords": ["graph representation learning"],
-    },
-    {
-        "name": "Causal Machine Learning",
-        "concept_id": None,
-        "keywords": ["causal machine learning", "causal ML"],
-    },
-    {
-        "name": "Causal Inference",
-        "concept_id": None,
-        "keywords": ["causal inference"],
-    },
-    {
-        "name": "Reinforcement Learning",
-        "concept_id": "https://openalex.org/C127413603",
-        "keywords": ["reinforcement learning"],
-    },
-    {
-        "name": "Deep Reinforcement Learning",
-        "concept_id": None,
-        "keywords": ["deep reinforcement learning"],
-    },
-    {
-        "name": "Prompt Engineering",
-        "concept_id": None,
-        "keywords": ["prompt engineering"],
-    },
-    {
-        "name": "Instruction Tuning",
-        "concept_id": None,
-        "keywords": ["instruction tuning", "instruction fine-tuning"],
-    },
-    {
-        "name": "AI Alignment",
-        "concept_id": None,
-        "keywords": ["AI alignment"],
-    },
-    {
-        "name": "RLHF",
-        "concept_id": None,
-        "keywords": ["RLHF", "reinforcement learning from human feedback"],
-    },
-    {
-        "name": "Multimodal Learning",
-        "concept_id": None,
-        "keywords": ["multimodal learning", "multi-modal"],
-    },
-    {
-        "name": "Few-shot Learning",
-        "concept_id": None,
-        "keywords": ["few-shot learning", "few shot"],
-    },
-    {
-        "name": "Self-supervised Learning",
-        "concept_id": None,
-        "keywords": ["self-supervised learning", "self supervised"],
-    },
-    {
-        "name": "Contrastive Learning",
-        "concept_id": None,
-        "keywords": ["contrastive learning"],
-    },
-    {
-        "name": "Federated Learning",
-        "concept_id": None,
-        "keywords": ["federated learning"],
-    },
-    {
-        "name": "Differential Privacy in ML",
-        "concept_id": None,
-        "keywords": ["differential privacy machine learning", "dp ml"],
-    },
-    {
-        "name": "Knowledge Graphs",
-        "concept_id": None,
-        "keywords": ["knowledge graph", "knowledge graphs"],
-    },
-    {
-        "name": "Graph Machine Learning",
-        "concept_id": None,
-        "keywords": ["graph machine learning"],
-    },
-    {
-        "name": "Automatic Speech Recognition",
-        "concept_id": None,
-        "keywords": ["automatic speech recognition", "ASR"],
-    },
-    {
-        "name": "Machine Translation",
-        "concept_id": None,
-        "keywords": ["machine translation", "neural machine translation", "NMT"],
-    },
-    {
-        "name": "Question Answering",
-        "concept_id": None,
-        "keywords": ["question answering", "QA"],
-    },
-    {
-        "name": "Information Retrieval",
-        "concept_id": None,
-        "keywords": ["information retrieval", "IR"],
-    },
-    {
-        "name": "Named Entity Recognition",
-        "concept_id": None,
-        "keywords": ["named entity recognition", "NER"],
-    },
-    {
-        "name": "Summarization",
-        "concept_id": None,
-        "keywords": ["text summarization", "summarization"],
-    },
-    {
-        "name": "Data Augmentation",
-        "concept_id": None,
-        "keywords": ["data augmentation"],
-    },
-    {
-        "name": "Domain Adaptation",
-        "concept_id": None,
-        "keywords": ["domain adaptation"],
-    },
-    {
-        "name": "Computer Vision",
-        "concept_id": "https://openalex.org/C41008148",
-        "keywords": ["computer vision", "object detection", "image classification"],
-    },
-    {
-        "name": "Multimodal (General)",
-        "concept_id": None,
-        "keywords": ["multimodal learning", "multimodal AI", "vision language", "audio-text", "cross-modal"],
-    },
-]
+from src.cache import fingerprint
+from src.config.query import QUERY_VERSION
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "directions.json")
+DEFAULT_KEYWORD_MODE = "or"
+# Bucket prefix of the per-direction JSON objects (the bucket root, where the
+# dashboard has always read them); every publisher goes through `Direction.object_path`.
+DIRECTION_OBJECT_PREFIX = ""
+
+
+def direction_slug(name: str) -> str:
+    """Slug used in published file names, e.g. "Natural Language Processing" -> "natural_language_processing"."""
+    return name.lower().replace(" ", "_").replace("/", "_")
+
+
+def _query(name: str, concept_id: Optional[str], keywords: Tuple[str, ...]) -> Dict[str, Any]:
+    return {"name": name, "concept_id": concept_id, "keywords": list(keywords)}
+
+
+def _cache_key(query: Dict[str, Any], slug: str, start_year: int, end_year: int, keyword_mode: str) -> str:
+    fp = fingerprint(query, start_year, end_year, QUERY_VERSION, keyword_mode)
+    return f"{slug}_{start_year}_{end_year}_{fp[:12]}"
+
+
+@dataclass(frozen=True, slots=True)
+class Direction:
+    """One direction with its derived identifiers precomputed."""
+
+    name: str
+    concept_id: Optional[str]
+    keywords: Tuple[str, ...]
+    slug: str
+    # Digest of the query config (name, concept id, keywords); changes whenever any of them does
+    fingerprint: str
+    # Cache key for `key_years` with the default keyword mode (see `key_for`)
+    cache_key: str
+    key_years: Tuple[int, int]
+
+    @classmethod
+    def from_dict(cls, spec: Mapping[str, Any], start_year: int, end_year: int) -> "Direction":
+        name = spec.get("name", "unknown")
+        concept_id = spec.get("concept_id")
+        keywords = tuple(spec.get("keywords") or ())
+        slug = direction_slug(name)
+        query = _query(name, concept_id, keywords)
+        return cls(
+            name=name,
+            concept_id=concept_id,
+            keywords=keywords,
+            slug=slug,
+            fingerprint=fingerprint(query),
+            cache_key=_cache_key(query, slug, start_year, end_year, DEFAULT_KEYWORD_MODE),
+            key_years=(start_year, end_year),
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        """{"name", "concept_id", "keywords"}, the form the API clients take."""
+        return _query(self.name, self.concept_id, self.keywords)
+
+    def key_for(self, start_year: int, end_year: int, keyword_mode: str = DEFAULT_KEYWORD_MODE) -> str:
+        """Cache key covering everything that determines this direction's counts.
+
+        A readable slug/year prefix plus a fingerprint of the query config, the year
+        range, the query version (src.config.query) and keyword mode. The precomputed key is
+        returned for the registry's range; other ranges are derived on demand.
+        """
+        if (start_year, end_year) == self.key_years and keyword_mode == DEFAULT_KEYWORD_MODE:
+            return self.cache_key
+        return _cache_key(self.as_dict(), self.slug, start_year, end_year, keyword_mode)
+
+    def filename(self, start_year: int, end_year: int) -> str:
+        """Per-direction JSON file name, e.g. "natural_language_processing_2010_2025.json"."""
+        return f"{self.slug}_{start_year}_{end_year}.json"
+
+    def object_path(self, start_year: int, end_year: int) -> str:
+        """Bucket path the per-direction JSON is published under."""
+        return f"{DIRECTION_OBJECT_PREFIX}{self.filename(start_year, end_year)}"
+
+
+def load_registry(path: str = CONFIG_PATH) -> Tuple[int, int, Tuple[Direction, ...]]:
+    """(start_year, end_year, directions) from a directions.json file.
+
+    Raises ValueError if two directions share a name or a slug.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    start_year, end_year = int(config["start_year"]), int(config["end_year"])
+    directions = tuple(Direction.from_dict(spec, start_year, end_year) for spec in config["directions"])
+    for field in ("name", "slug"):
+        values = [getattr(d, field) for d in directions]
+        duplicates = sorted({v for v in values if values.count(v) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate direction {field}s in {path}: {duplicates}")
+    return start_year, end_year, directions
+
+
+START_YEAR, END_YEAR, REGISTRY = load_registry()
+BY_NAME: Dict[str, Direction] = {d.name: d for d in REGISTRY}
+BY_SLUG: Dict[str, Direction] = {d.slug: d for d in REGISTRY}
+DIRECTIONS: List[Dict[str, Any]] = [d.as_dict() for d in REGISTRY]
+
+
+def as_direction(direction: Any) -> Direction:
+    """`direction` as a `Direction`: registry entries are reused, other dicts are built on the fly."""
+    if isinstance(direction, Direction):
+        return direction
+    known = BY_NAME.get(direction.get("name"))
+    query = _query(direction.get("name"), direction.get("concept_id"), tuple(direction.get("keywords") or ()))
+    if known is not None and known.as_dict() == query:
+        return known
+    return Direction.from_dict(direction, START_YEAR, END_YEAR)
+
+
+def slug_for(name: str) -> str:
+    """Registry slug for `name`; names outside the registry are slugified the same way."""
+    known = BY_NAME.get(name)
+    return known.slug if known is not None else direction_slug(name)
@@ -0,0 +1,15 @@
+"""
+Storage backend selection.
+
+- AI_TREND_STORAGE: "gcs" (default), "local" or "memory"
+- AI_TREND_STORAGE_ROOT: directory used by the "local" backend
+- AI_TREND_BUCKET: GCS bucket used by the "gcs" backend
+
+Use AI_TREND_STORAGE=local to run the whole pipeline offline without GCP credentials.
+"""
+from __future__ import annotations
+import os
+
+STORAGE_BACKEND = os.environ.get("AI_TREND_STORAGE", "gcs")
+STORAGE_ROOT = os.environ.get("AI_TREND_STORAGE_ROOT", os.path.join("output", "bucket"))
+BUCKET_NAME = os.environ.get("AI_TREND_BUCKET", "ai-trend-cache")
@@ -0,0 +1,178 @@
+"""
+Trend analytics over the directions x years count matrix, computed once per refresh.
+
+Every metric is a vectorized NumPy operation over the whole matrix (one row per
+direction, one column per year); undefined values (no previous year, zero base) are
+NaN in memory and null once published:
+
+    share          count / total of all directions that year
+    yoy            year-over-year growth, (c[t] - c[t-1]) / c[t-1]
+    cagr_<w>       compound annual growth over the trailing w years, (c[t] / c[t-w]) ** (1/w) - 1
+    acceleration   change in yoy growth, yoy[t] - yoy[t-1] (percentage points / 100)
+    emerging       cagr over the shortest window, only for directions with at least
+                   EMERGING_MIN_COUNT works that year (tiny bases otherwise dominate)
+
+`ranks[metric]` holds each direction's rank per year for every metric but share
+(whose ranks equal those of count; 1 = highest, null when the metric is undefined)
+and `order[metric]` the direction indices sorted by rank for each year,
+so "top N in year Y" is a single lookup. Published as gzipped JSON next to the snapshot
+(like the snapshot, without a build timestamp, so unchanged data keeps its hash):
+
+    {
+      "version": 1, "start_year": 2010, "end_year": 2025,
+      "years": [...], "directions": [...], "slugs": [...],
+      "metrics": {"count": [[...]], "share": [[...]], "yoy": [[...]], ...},   # direction-major
+      "ranks": {"count": [[...]], "yoy": [[...]], ...},                       # direction-major
+      "order": {"count": [[...]], "yoy": [[...]], ...}                        # year-major
+    }
+
+The ranking index is the small subset the ranking board needs: for every year, all
+directions sorted by count as [slug, count, rank, delta], where delta is the change
+in rank since the previous year (positive = moved up, null for the first year):
+
+    {
+      "version": 1, "start_year": 2010, "end_year": 2025,
+      "names": {"natural_language_processing": "Natural Language Processing", ...},
+      "years": {"2010": [["computer_vision", 51234, 1, null], ...], ...}
+    }
+"""
+from __future__ import annotations
+from typing import Any, Dict, List, Sequence
+import gzip
+import json
+
+import numpy as np
+
+ANALYTICS_VERSION = 1
+CAGR_WINDOWS = (3, 5)
+EMERGING_MIN_COUNT = 100
+# Floats are published with this many decimals
+PRECISION = 4
+
+
+def analytics_name(start_year: int, end_year: int) -> str:
+    """Published object name, e.g. "analytics_2010_2025.json"."""
+    return f"analytics_{start_year}_{end_year}.json"
+
+
+def _ratio(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    out = np.full(np.broadcast(num, den).shape, np.nan)
+    np.divide(num, den, out=out, where=den > 0)
+    return out
+
+
+def share_of_total(counts: np.ndarray) -> np.ndarray:
+    return _ratio(counts.astype(float), counts.sum(axis=0, keepdims=True).astype(float))
+
+
+def yoy_growth(counts: np.ndarray) -> np.ndarray:
+    counts = counts.astype(float)
+    out = np.full(counts.shape, np.nan)
+    out[:, 1:] = _ratio(counts[:, 1:] - counts[:, :-1], counts[:, :-1])
+    return out
+
+
+def cagr(counts: np.ndarray, window: int) -> np.ndarray:
+    counts = counts.astype(float)
+    out = np.full(counts.shape, np.nan)
+    if 0 < window < counts.shape[1]:
+        out[:, window:] = _ratio(counts[:, window:], counts[:, :-window]) ** (1.0 / window) - 1.0
+    return out
+
+
+def acceleration(counts: np.ndarray) -> np.ndarray:
+    growth = yoy_growth(counts)
+    out = np.full(growth.shape, np.nan)
+    out[:, 1:] = growth[:, 1:] - growth[:, :-1]
+    return out
+
+
+def rank_order(values: np.ndarray) -> np.ndarray:
+    """Year-major direction indices sorted by `values` descending per year; NaN last, ties by row order."""
+    key = np.where(np.isnan(values), np.inf, -values)
+    return np.argsort(key, axis=0, kind="stable").T
+
+
+def ranks(values: np.ndarray) -> np.ndarray:
+    """Per-year rank of each direction (1 = highest); NaN where the value is undefined."""
+    order = rank_order(values).T
+    out = np.empty(values.shape)
+    np.put_along_axis(out, order, np.arange(1, values.shape[0] + 1, dtype=float)[:, None], axis=0)
+    out[np.isnan(values)] = np.nan
+    return out
+
+
+def compute_metrics(counts: np.ndarray, windows: Sequence[int] = CAGR_WINDOWS) -> Dict[str, np.ndarray]:
+    """{metric name: directions x years array} for a count matrix."""
+    counts = np.asarray(counts, dtype=np.int64)
+    metrics: Dict[str, np.ndarray] = {
+        "count": counts.astype(float),
+        "share": share_of_total(counts),
+        "yoy": yoy_growth(counts),
+        "acceleration": acceleration(counts),
+    }
+    for w in windows:
+        metrics[f"cagr_{w}"] = cagr(counts, w)
+    if windows:
+        emerging = cagr(counts, min(windows))
+        emerging[counts < EMERGING_MIN_COUNT] = np.nan
+        metrics["emerging"] = emerging
+    return metrics
+
+
+def _to_json(values: np.ndarray, integer: bool = False) -> List[List[Any]]:
+    if integer:
+        return [[None if np.isnan(v) else int(v) for v in row] for row in values]
+    rounded = np.round(values, PRECISION)
+    return [[None if np.isnan(v) else float(v) for v in row] for row in rounded]
+
+
+def build_analytics(snapshot: Dict[str, Any], windows: Sequence[int] = CAGR_WINDOWS) -> Dict[str, Any]:
+    """Analytics document for a snapshot (see src.data.snapshot)."""
+    counts = np.asarray(snapshot["counts"], dtype=np.int64).reshape(len(snapshot["directions"]), len(snapshot["years"]))
+    metrics = compute_metrics(counts, windows)
+    ranked = [m for m in metrics if m != "share"]
+    return {
+        "version": ANALYTICS_VERSION,
+        "start_year": snapshot["start_year"],
+        "end_year": snapshot["end_year"],
+        "years": list(snapshot["years"]),
+        "directions": list(snapshot["directions"]),
+        "slugs": list(snapshot["slugs"]),
+        "metrics": {name: _to_json(values, integer=name == "count") for name, values in metrics.items()},
+        "ranks": {name: _to_json(ranks(metrics[name]), integer=True) for name in ranked},
+        "order": {name: rank_order(metrics[name]).tolist() for name in ranked},
+    }
+
+
+def ranking_index_name(start_year: int, end_year: int) -> str:
+    """Published object name, e.g. "ranking_index_2010_2025.json"."""
+    return f"ranking_index_{start_year}_{end_year}.json"
+
+
+def build_ranking_index(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    """Per-year [slug, count, rank, delta] rows sorted by count (see module docstring)."""
+    slugs = list(snapshot["slugs"])
+    counts = np.asarray(snapshot["counts"], dtype=np.int64).reshape(len(slugs), len(snapshot["years"]))
+    values = counts.astype(float)
+    rank = ranks(values).astype(np.int64)
+    delta = np.zeros_like(rank)
+    delta[:, 1:] = rank[:, :-1] - rank[:, 1:]
+    years: Dict[str, List[List[Any]]] = {}
+    for y, (year, order) in enumerate(zip(snapshot["years"], rank_order(values))):
+        years[str(year)] = [
+            [slugs[i], int(counts[i, y]), int(rank[i, y]), int(delta[i, y]) if y else None] for i in order
+        ]
+    return {
+        "version": ANALYTICS_VERSION,
+        "start_year": snapshot["start_year"],
+        "end_year": snapshot["end_year"],
+        "names": dict(zip(slugs, snapshot["directions"])),
+        "years": years,
+    }
+
+
+def analytics_bytes(analytics: Dict[str, Any]) -> bytes:
+    """Gzipped, compact JSON encoding of an analytics document or ranking index (what gets uploaded)."""
+    raw = json.dumps(analytics, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return gzip.compress(raw, mtime=0)
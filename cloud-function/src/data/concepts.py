@@ -0,0 +1,82 @@
+"""
+Auto-resolution of OpenAlex concept ids for keyword-only directions.
+
+Concept-backed directions are counted with a cheap `concepts.id` filter (and can be
+batched), while keyword-only directions need full-text search. This pass looks up
+each keyword-only direction's name and keywords in the concept index and adopts a
+concept only when its display name matches one of them exactly (ignoring case,
+punctuation and a plural "s"), so loose search hits never change what is counted.
+"""
+from __future__ import annotations
+from typing import Any, Dict, List, Optional
+import re
+
+
+def _normalize(text: str) -> str:
+    words = re.sub(r"[^0-9a-z]+", " ", text.lower()).split()
+    if words and len(words[-1]) > 3 and words[-1].endswith("s"):
+        words[-1] = words[-1][:-1]
+    return " ".join(words)
+
+
+def concept_queries(direction: dict) -> List[str]:
+    """Lookup candidates: the name without any "(ABBR)" suffix, then each keyword."""
+    name = re.sub(r"\s*\(.*?\)\s*", " ", direction.get("name", "")).strip()
+    candidates = [name] + list(direction.get("keywords") or [])
+    return list(dict.fromkeys(c for c in candidates if c))
+
+
+def unresolved_queries(directions: List[dict]) -> List[str]:
+    """Every lookup needed for the keyword-only directions, deduplicated."""
+    queries: List[str] = []
+    for d in directions:
+        if not d.get("concept_id"):
+            queries.extend(concept_queries(d))
+    return list(dict.fromkeys(queries))
+
+
+def apply_resolved(directions: List[dict], records: Dict[str, Optional[Dict[str, Any]]]) -> List[dict]:
+    """Copies of `directions` with `concept_id` filled in where a lookup matched exactly."""
+    out: List[dict] = []
+    for d in directions:
+        if d.get("concept_id"):
+            out.append(d)
+            continue
+        match = None
+        for query in concept_queries(d):
+            record = records.get(query)
+            if record and _normalize(record.get("display_name") or "") == _normalize(query):
+                match = record
+                break
+        if match is None:
+            out.append(d)
+            continue
+        print(f"[CONCEPT] {d.get('name')}: using {match['display_name']} ({match['id']})")
+        out.append({**d, "concept_id": match["id"]})
+    return out
+
+
+def auto_resolve_concepts(client, directions: List[dict]) -> List[dict]:
+    """Resolve concept ids for keyword-only directions with one bulk lookup through `client`."""
+    queries = unresolved_queries(directions)
+    if not queries:
+        return list(directions)
+    try:
+        records = client.resolve_concepts(queries)
+    except Exception as e:
+        print(f"[WARN] Concept auto-resolution failed, keeping keyword search: {e}")
+        return list(directions)
+    return apply_resolved(directions, records)
+
+
+async def auto_resolve_concepts_async(client, directions: List[dict]) -> List[dict]:
+    """Async variant of `auto_resolve_concepts`."""
+    queries = unresolved_queries(directions)
+    if not queries:
+        return list(directions)
+    try:
+        records = await client.resolve_concepts(queries)
+    except Exception as e:
+        print(f"[WARN] Concept auto-resolution failed, keeping keyword search: {e}")
+        return list(directions)
+    return apply_resolved(directions, records)
@@ -0,0 +1,120 @@
+"""
+Consolidated snapshot: every direction's yearly counts in one compact artifact.
+
+The snapshot is a directions x years count matrix plus metadata, serialized as
+gzipped JSON:
+
+    {
+      "version": 1,
+      "start_year": 2010, "end_year": 2025,
+      "years": [2010, ..., 2025],
+      "directions": ["Natural Language Processing", ...],
+      "slugs": ["natural_language_processing", ...],
+      "counts": [[...one row per direction, one column per year...], ...]
+    }
+
+It is published next to the legacy per-direction `{slug}_{start}_{end}.json` files,
+so the dashboard can load everything with a single request. The bytes depend only
+on the data, so an unchanged snapshot keeps its content hash and is not re-uploaded;
+the publish manifest records when it last changed.
+"""
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Sequence
+import gzip
+import json
+import os
+
+import pandas as pd
+
+from src.config.directions import Direction, slug_for
+from src.data.process import year_direction_matrix
+
+SNAPSHOT_VERSION = 1
+
+
+def snapshot_name(start_year: int, end_year: int) -> str:
+    """Published object name, e.g. "snapshot_2010_2025.json"."""
+    return f"snapshot_{start_year}_{end_year}.json"
+
+
+def direction_index(directions: Sequence[Direction]) -> List[Dict[str, str]]:
+    """[{"slug", "name"}] in the given order, as listed in the publish manifest."""
+    return [{"slug": d.slug, "name": d.name} for d in directions]
+
+
+def manifest_metadata(directions: Sequence[Direction], start_year: int, end_year: int) -> Dict[str, Any]:
+    """Extra manifest.json keys: the dashboard's direction list and the year range of the artifacts."""
+    return {"start_year": start_year, "end_year": end_year, "directions": direction_index(directions)}
+
+
+def build_snapshot(
+    df: pd.DataFrame,
+    start_year: int,
+    end_year: int,
+    directions: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Build the snapshot dict from a long ["year", "direction", "count"] DataFrame.
+
+    Args:
+        directions: Row order for the matrix; defaults to order of first appearance in `df`.
+            Directions with no rows get an all-zero row.
+    """
+    years = list(range(start_year, end_year + 1))
+    if directions is None:
+        directions = [str(d) for d in pd.unique(df["direction"])] if not df.empty else []
+    matrix = (
+        year_direction_matrix(df, start_year, end_year)
+        .T.reindex(index=pd.Index(directions, dtype=object), fill_value=0)
+        .astype("int64")
+    )
+    return {
+        "version": SNAPSHOT_VERSION,
+        "start_year": start_year,
+        "end_year": end_year,
+        "years": years,
+        "directions": [str(d) for d in directions],
+        "slugs": [slug_for(str(d)) for d in directions],
+        "counts": matrix.to_numpy().tolist(),
+    }
+
+
+def snapshot_bytes(snapshot: Dict[str, Any]) -> bytes:
+    """Gzipped, compact JSON encoding of a snapshot (what gets written and uploaded)."""
+    raw = json.dumps(snapshot, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return gzip.compress(raw, mtime=0)
+
+
+def write_snapshot(snapshot: Dict[str, Any], path: str) -> str:
+    """Atomically write the gzipped snapshot to `path`. Returns the path."""
+    out_dir = os.path.dirname(path)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(snapshot_bytes(snapshot))
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_snapshot(path: str) -> Dict[str, Any]:
+    """Read a snapshot in one I/O; accepts gzipped or plain JSON."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:2] == b"\x1f\x8b":
+        data = gzip.decompress(data)
+    return json.loads(data)
+
+
+def snapshot_to_dataframe(snapshot: Dict[str, Any]) -> pd.DataFrame:
+    """Long ["year", "direction", "count"] DataFrame (direction-major, years ascending)."""
+    years = snapshot["years"]
+    directions = snapshot["directions"]
+    counts = pd.DataFrame(snapshot["counts"], index=directions, columns=years).astype("int64")
+    long = counts.stack().reset_index()
+    long.columns = ["direction", "year", "count"]
+    return long[["year", "direction", "count"]]
+
+
+def load_snapshot(path: str) -> pd.DataFrame:
+    """Load a snapshot file straight into the long DataFrame used across the pipeline."""
+    return snapshot_to_dataframe(read_snapshot(path))
@@ -0,0 +1,120 @@
+"""
+Manifest-driven publishing: upload only objects whose content changed.
+
+The bucket holds a `manifest.json` mapping every published object path to the
+content hash and size of its last upload, and when its content last changed:
+
+    {
+      "version": 1,
+      "updated_at": "2025-01-01T00:00:00+00:00",
+      "objects": {
+        "natural_language_processing_2010_2025.json": {"hash": "...", "bytes": 312, "updated_at": "..."}, ...
+      },
+      "directions": [{"slug": "natural_language_processing", "name": "Natural Language Processing"}, ...]
+    }
+
+`publish` reads the manifest once, skips uploads whose hash is unchanged, uploads
+the rest concurrently and rewrites the manifest. Without a manifest it falls back to
+the backend's stored content hashes, so the first run after a migration still skips.
+Extra top-level keys (such as "directions") are passed as `metadata`; the dashboard
+reads the manifest first and caches every object in the browser by its hash.
+Build timestamps belong here rather than inside the objects: an object whose bytes
+carry the time it was built never hashes the same twice and is always re-uploaded.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+import json
+
+from src.storage_backends import StorageBackend, Upload, content_hash, json_upload
+
+MANIFEST_PATH = "manifest.json"
+MANIFEST_VERSION = 1
+_RESERVED_KEYS = frozenset({"version", "updated_at", "objects"})
+
+
+@dataclass(frozen=True)
+class PublishReport:
+    """What one publish run wrote and skipped."""
+
+    uploaded: List[str]
+    skipped: List[str]
+    bytes_uploaded: int
+    bytes_skipped: int
+
+    def summary(self) -> str:
+        return (
+            f"{len(self.uploaded)} uploaded ({self.bytes_uploaded:,} bytes), "
+            f"{len(self.skipped)} unchanged skipped ({self.bytes_skipped:,} bytes)"
+        )
+
+
+def read_manifest(backend: StorageBackend, path: str = MANIFEST_PATH) -> Optional[Dict[str, Any]]:
+    """The stored manifest, or None if missing or unreadable."""
+    raw = backend.get(path)
+    if raw is None:
+        return None
+    try:
+        manifest = json.loads(raw)
+    except ValueError:
+        return None
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def publish(
+    backend: StorageBackend,
+    uploads: Iterable[Upload],
+    manifest_path: str = MANIFEST_PATH,
+    max_workers: int = 8,
+    metadata: Optional[Dict[str, Any]] = None,
+    retired: Iterable[str] = (),
+) -> PublishReport:
+    """Upload changed objects only and record their hashes in the manifest.
+
+    `metadata` entries are stored as top-level manifest keys (replacing earlier values).
+    `retired` paths are dropped from the manifest (objects moved elsewhere); the
+    blobs themselves are left in the bucket.
+    Objects deleted from the bucket behind the manifest's back are not detected;
+    delete the manifest to force a full re-check against stored hashes.
+    """
+    metadata = dict(metadata or {})
+    reserved = _RESERVED_KEYS.intersection(metadata)
+    if reserved:
+        raise ValueError(f"Reserved manifest keys in metadata: {sorted(reserved)}")
+    uploads = list(uploads)
+    hashes = {u.path: content_hash(u.data) for u in uploads}
+    manifest = read_manifest(backend, manifest_path)
+    if manifest is not None:
+        known = {path: entry.get("hash") for path, entry in manifest["objects"].items()}
+    else:
+        manifest = {"version": MANIFEST_VERSION, "objects": {}}
+        known = backend.hashes(list(hashes))
+
+    changed = [u for u in uploads if known.get(u.path) != hashes[u.path]]
+    unchanged = [u for u in uploads if known.get(u.path) == hashes[u.path]]
+    backend.put_many(changed, max_workers=max_workers)
+
+    objects = manifest["objects"]
+    stale = any(objects.get(u.path, {}).get("hash") != hashes[u.path] for u in uploads)
+    stale = stale or any(manifest.get(key) != value for key, value in metadata.items())
+    for path in retired:
+        stale = objects.pop(path, None) is not None or stale
+    now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    for u in uploads:
+        previous = objects.get(u.path, {})
+        updated_at = previous.get("updated_at") if previous.get("hash") == hashes[u.path] else None
+        objects[u.path] = {"hash": hashes[u.path], "bytes": len(u.data), "updated_at": updated_at or now}
+    manifest.update(metadata)
+    if stale:
+        manifest["updated_at"] = now
+        backend.put(json_upload(manifest_path, manifest, compress=False, cache_control="no-cache"))
+
+    return PublishReport(
+        uploaded=[u.path for u in changed],
+        skipped=[u.path for u in unchanged],
+        bytes_uploaded=sum(len(u.data) for u in changed),
+        bytes_skipped=sum(len(u.data) for u in unchanged),
+    )
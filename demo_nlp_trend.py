@@ -1,10 +1,11 @@
-from src.api.openalex_client import OpenAlexClient
+from src.api.openalex_client import OpenAlexClient, disk_response_cache
 from src.data.process import nlp_dict_to_dataframe
 from src.viz.charts import plot_nlp_trend
 
 
 def main():
-    client = OpenAlexClient()
+    # Repeated runs within an hour are served from the local response cache
+    client = OpenAlexClient(response_cache=disk_response_cache())
     # Use fast aggregated counts via group_by (single API call, ~1s)
     year_counts = client.fetch_nlp_counts(2010, 2025, mode="group_by")
     df = nlp_dict_to_dataframe(year_counts)
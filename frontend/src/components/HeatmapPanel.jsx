@@ -1,45 +1,6 @@
 import React, { useEffect, useState } from 'react'
 import ReactECharts from 'echarts-for-react'
-
-const START = 2010
-const END = 2025
-const GCS_BASE = 'https://storage.googleapis.com/ai-trend-cache'
-
-const SLUGS = [
-  'natural_language_processing',
-  'large_language_models_(llm)',
-  'vision-language_models_(vlm)',
-  'video_llm',
-  'retrieval-augmented_generation_(rag)',
-  'graph_neural_networks_(gnn)',
-  'graph_representation_learning',
-  'causal_machine_learning',
-  'causal_inference',
-  'reinforcement_learning',
-  'deep_reinforcement_learning',
-  'prompt_engineering',
-  'instruction_tuning',
-  'ai_alignment',
-  'rlhf',
-  'multimodal_learning',
-  'few-shot_learning',
-  'self-supervised_learning',
-  'contrastive_learning',
-  'federated_learning',
-  'differential_privacy_in_ml',
-  'knowledge_graphs',
-  'graph_machine_learning',
-  'automatic_speech_recognition',
-  'machine_translation',
-  'question_answering',
-  'information_retrieval',
-  'named_entity_recognition',
-  'summarization',
-  'data_augmentation',
-  'domain_adaptation',
-  'computer_vision',
-  'multimodal_(general)'
-]
+import { loadDirectionSeries } from '../data/snapshot.js'
 
 export default function HeatmapPanel() {
   const [years, setYears] = useState([])
@@ -50,23 +11,15 @@ export default function HeatmapPanel() {
   useEffect(() => {
     let ignore = false
     async function fetchAll() {
-      const yearsArr = Array.from({ length: END - START + 1 }, (_, i) => START + i)
-      const results = await Promise.all(
-        SLUGS.map(async (slug) => {
-          const url = `${GCS_BASE}/${encodeURIComponent(slug)}_${START}_${END}.json`
-          const res = await fetch(url)
-          const json = await res.json()
-          return yearsArr.map(y => json[y] || 0)
-        })
-      )
+      const { years, series } = await loadDirectionSeries()
       if (ignore) return
-      setYears(yearsArr)
-      setDirections(SLUGS)
-      // transpose results to matrix[yearIndex][dirIndex]
-      const matrixByYear = yearsArr.map((_, i) => SLUGS.map((_, j) => results[j][i]))
+      setYears(years)
+      setDirections(series.map(d => d.name))
+      // transpose series[dirIndex].counts[yearIndex] to matrix[yearIndex][dirIndex]
+      const matrixByYear = years.map((_, i) => series.map(d => d.counts[i] || 0))
       setMatrix(matrixByYear)
     }
-    fetchAll()
+    fetchAll().catch(err => console.error('Failed to load snapshot', err))
     return () => { ignore = true }
   }, [])
 
@@ -1,36 +1,24 @@
 import React, { useEffect, useState } from 'react'
 import ReactECharts from 'echarts-for-react'
-
-const START = 2010
-const END = 2025
-const GCS_BASE = 'https://storage.googleapis.com/ai-trend-cache'
-
-function slugify(name) {
-  return name.toLowerCase().replaceAll(' ', '_').replaceAll('/', '_')
-}
+import { directionSeries, loadSnapshot } from '../data/snapshot.js'
 
 export default function TrendChart({ selectedDirection }) {
-  const [years, setYears] = useState([])
-  const [counts, setCounts] = useState([])
+  const [snapshot, setSnapshot] = useState(null)
 
   useEffect(() => {
     let ignore = false
-    async function fetchData() {
-      if (!selectedDirection) return
-      const slug = slugify(selectedDirection)
-      const url = `${GCS_BASE}/${encodeURIComponent(slug)}_${START}_${END}.json`
-      const res = await fetch(url)
-      const json = await res.json()
-      const ys = Object.keys(json).map(y => parseInt(y, 10)).sort((a,b)=>a-b)
-      const cs = ys.map(y => json[y] || 0)
-      if (!ignore) {
-        setYears(ys)
-        setCounts(cs)
-      }
-    }
-    fetchData()
+    loadSnapshot()
+      .then(snap => { if (!ignore) setSnapshot(snap) })
+      .catch(err => console.error('Failed to load snapshot', err))
     return () => { ignore = true }
-  }, [selectedDirection])
+  }, [])
+
+  // Accepts a display name or a slug; both come from the published snapshot
+  const series = snapshot
+    ? directionSeries(snapshot).find(d => d.name === selectedDirection || d.slug === selectedDirection)
+    : null
+  const years = series ? snapshot.years : []
+  const counts = series ? series.counts : []
 
   const option = {
     title: { text: selectedDirection || 'Trend' },
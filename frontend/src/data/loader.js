@@ -0,0 +1,149 @@
+// Shared data loader: one manifest request per visit, everything else from a
+// persistent browser cache.
+//
+// manifest.json (written by src/publish.py, served with no-cache) lists every
+// published object with its content hash, plus the directions to display
+// (slugs and display names, from src/config/directions.json) and the year range
+// the artifacts cover.
+// Objects are stored in IndexedDB (localStorage when IndexedDB is unavailable)
+// together with that hash and are served from there while the hash matches, so
+// a repeat visit with unchanged data makes no data requests. Network fetches
+// add the hash to the URL, so an HTTP cache (objects are served with a one-hour
+// max-age) never answers with an older version of a changed object.
+
+export const GCS_BASE = 'https://storage.googleapis.com/ai-trend-cache'
+
+const MANIFEST_PATH = 'manifest.json'
+const DB_NAME = 'ai-trend-dashboard'
+const STORE = 'objects'
+const LOCAL_PREFIX = 'ai-trend:'
+
+let manifestPromise = null
+let dbPromise = null
+const pending = new Map()
+
+// ---------- persistent cache ----------
+function openDb() {
+  if (!dbPromise) {
+    dbPromise = new Promise((resolve, reject) => {
+      if (typeof indexedDB === 'undefined') throw new Error('IndexedDB unavailable')
+      const req = indexedDB.open(DB_NAME, 1)
+      req.onupgradeneeded = () => req.result.createObjectStore(STORE)
+      req.onsuccess = () => resolve(req.result)
+      req.onerror = () => reject(req.error)
+    })
+  }
+  return dbPromise
+}
+
+function idbRequest(mode, run) {
+  return openDb().then(db => new Promise((resolve, reject) => {
+    const req = run(db.transaction(STORE, mode).objectStore(STORE))
+    req.onsuccess = () => resolve(req.result)
+    req.onerror = () => reject(req.error)
+  }))
+}
+
+// { hash, data } for `path`, or null
+async function readCached(path) {
+  try {
+    return (await idbRequest('readonly', store => store.get(path))) || null
+  } catch {
+    try {
+      return JSON.parse(localStorage.getItem(LOCAL_PREFIX + path)) || null
+    } catch {
+      return null
+    }
+  }
+}
+
+// One entry per path: a new hash replaces the previous version
+async function writeCached(path, entry) {
+  try {
+    await idbRequest('readwrite', store => store.put(entry, path))
+  } catch {
+    try {
+      localStorage.setItem(LOCAL_PREFIX + path, JSON.stringify(entry))
+    } catch {
+      // Quota exceeded or storage disabled: the data is still returned, just not kept
+    }
+  }
+}
+
+// ---------- manifest ----------
+export function loadManifest() {
+  if (!manifestPromise) {
+    manifestPromise = fetch(`${GCS_BASE}/${MANIFEST_PATH}`, { cache: 'no-cache' })
+      .then(res => {
+        if (!res.ok) throw new Error(`Manifest request failed: ${res.status}`)
+        return res.json()
+      })
+      .then(manifest => {
+        writeCached(MANIFEST_PATH, { hash: manifest.updated_at, data: manifest })
+        return manifest
+      })
+      .catch(async err => {
+        // Offline or bucket unreachable: fall back to the last manifest seen
+        const cached = await readCached(MANIFEST_PATH)
+        if (cached) return cached.data
+        manifestPromise = null
+        throw err
+      })
+  }
+  return manifestPromise
+}
+
+// [{ slug, name }] in display order
+export async function loadDirections() {
+  const manifest = await loadManifest()
+  return manifest.directions || []
+}
+
+// { start, end }: the year range the published artifacts cover. Manifests written
+// before the range was listed are read from the snapshot's object name.
+export async function loadYearRange() {
+  const manifest = await loadManifest()
+  if (manifest.start_year != null && manifest.end_year != null) {
+    return { start: manifest.start_year, end: manifest.end_year }
+  }
+  for (const path of Object.keys(manifest.objects || {})) {
+    const match = /^snapshot_(\d+)_(\d+)\.json$/.exec(path)
+    if (match) return { start: Number(match[1]), end: Number(match[2]) }
+  }
+  throw new Error('Manifest lists no year range')
+}
+
+// { slug: display name } from the manifest's direction list
+export async function loadDirectionNames() {
+  const directions = await loadDirections()
+  return Object.fromEntries(directions.map(d => [d.slug, d.name]))
+}
+
+// ---------- objects ----------
+async function fetchObject(path, hash) {
+  const url = hash ? `${GCS_BASE}/${path}?v=${encodeURIComponent(hash)}` : `${GCS_BASE}/${path}`
+  const res = await fetch(url)
+  if (!res.ok) throw new Error(`${path} request failed: ${res.status}`)
+  return res.json()
+}
+
+// Parsed JSON of a published object; requests it only if its manifest hash changed
+export function loadObject(path) {
+  if (!pending.has(path)) {
+    const promise = (async () => {
+      const manifest = await loadManifest()
+      const hash = manifest.objects?.[path]?.hash
+      const cached = await readCached(path)
+      if (cached && hash && cached.hash === hash) return cached.data
+      const data = await fetchObject(path, hash)
+      if (hash) writeCached(path, { hash, data })
+      return data
+    })().catch(err => {
+      // Allow a later mount to retry
+      pending.delete(path)
+      throw err
+    })
+    pending.set(path, promise)
+  }
+  return pending.get(path)
+}
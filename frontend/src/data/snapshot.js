@@ -0,0 +1,62 @@
+// Published artifacts of the refresh pipeline: the consolidated snapshot (all
+// directions x years), the precomputed analytics and the per-year ranking index.
+// All loads go through the manifest-driven, persistently cached loader, and
+// promises are shared so components mounting together do not refetch.
+// Artifact names carry the year range, which is read from the manifest.
+import { loadDirections, loadObject, loadYearRange } from './loader.js'
+
+async function loadRangeObject(prefix) {
+  const { start, end } = await loadYearRange()
+  return loadObject(`${prefix}_${start}_${end}.json`)
+}
+
+export function loadSnapshot() {
+  return loadRangeObject('snapshot')
+}
+
+// Growth rates, shares and per-year ranks (see src/data/analytics.py)
+export function loadAnalytics() {
+  return loadRangeObject('analytics')
+}
+
+// { slug: { yoy, cagr } } for the last analytics year; values are null when undefined
+export function latestGrowth(analytics, cagrWindow = 3) {
+  const last = analytics.years.length - 1
+  const cagr = analytics.metrics[`cagr_${cagrWindow}`] || []
+  return Object.fromEntries(analytics.slugs.map((slug, i) => [
+    slug, { yoy: analytics.metrics.yoy[i][last], cagr: cagr[i]?.[last] ?? null }
+  ]))
+}
+
+// [{ slug, name, counts: [...] }] in snapshot order; counts align with snapshot.years
+export function directionSeries(snapshot) {
+  return snapshot.slugs.map((slug, i) => ({
+    slug,
+    name: snapshot.directions[i],
+    counts: snapshot.counts[i]
+  }))
+}
+
+// Snapshot series in the manifest's direction order, named by the manifest.
+// Falls back to snapshot order when the manifest lists no directions.
+export async function loadDirectionSeries() {
+  const [snapshot, directions] = await Promise.all([loadSnapshot(), loadDirections()])
+  const bySlug = new Map(directionSeries(snapshot).map(d => [d.slug, d]))
+  const series = directions.length
+    ? directions.filter(d => bySlug.has(d.slug)).map(d => ({ ...bySlug.get(d.slug), name: d.name }))
+    : [...bySlug.values()]
+  return { years: snapshot.years, series }
+}
+
+// Per-year rankings: { names, years: { "2024": [[slug, count, rank, delta], ...] } }
+export function loadRankingIndex() {
+  return loadRangeObject('ranking_index')
+}
+
+// Ranked rows of `year` (clamped to the index range): [{ slug, name, count, rank, delta }]
+export function rankingFor(index, year) {
+  const y = Math.max(index.start_year, Math.min(index.end_year, year))
+  return (index.years[String(y)] || []).map(([slug, count, rank, delta]) => ({
+    slug, name: index.names[slug], count, rank, delta
+  }))
+}
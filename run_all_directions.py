@@ -11,30 +11,65 @@ from __future__ import annotations
 import os
 import pandas as pd
 
-from src.config.directions import DIRECTIONS
+from src.api.openalex_client import OpenAlexClient
+from src.config.directions import DIRECTIONS, END_YEAR, REGISTRY, START_YEAR
 from src.data.aggregate import aggregate_all_directions
-from src.storage import upload_json   # GCS uploader
-from src.viz.heatmap import plot_direction_heatmap
-
-
-START_YEAR = 2010
-END_YEAR = 2025
+from src.data.analytics import analytics_bytes, analytics_name, build_analytics, build_ranking_index, ranking_index_name
+from src.data.process import counts_by_direction
+from src.data.snapshot import build_snapshot, manifest_metadata, snapshot_bytes, snapshot_name, write_snapshot
+from src.data.timeseries import fetch_timeseries, timeseries_bytes, timeseries_name
+from src.metrics import Metrics
+from src.publish import publish
+from src.storage import Upload, get_backend, json_upload, upload_json, upload_many   # GCS uploader
+from src.viz.render import render_direction_trends, render_heatmap
+
+
+# START_YEAR / END_YEAR come from src/config/directions.json
+# Historical years are served from cache; only the last N years are re-queried when stale.
+REFRESH_YEARS = 2
+# Count keyword-only directions by an exactly matching OpenAlex concept when one exists.
+RESOLVE_CONCEPTS = False
+# Also publish monthly/weekly series (~2 extra requests per direction per year).
+FETCH_TIMESERIES = False
 OUTPUT_DIR = "output"
 CSV_NAME = "ai_directions_counts.csv"
 HEATMAP_NAME = "ai_directions_heatmap.png"
+CHARTS_DIR = os.path.join(OUTPUT_DIR, "charts")
+METRICS_JSON_NAME = "metrics.json"
+METRICS_PROM_NAME = "metrics.prom"
+
+SNAPSHOT_NAME = snapshot_name(START_YEAR, END_YEAR)
+TIMESERIES_NAME = timeseries_name(START_YEAR, END_YEAR)
+ANALYTICS_NAME = analytics_name(START_YEAR, END_YEAR)
+RANKING_INDEX_NAME = ranking_index_name(START_YEAR, END_YEAR)
 
 # Remote GCS paths
 CSV_GCS_PATH = f"output/{CSV_NAME}"
 HEATMAP_GCS_PATH = f"output/{HEATMAP_NAME}"
+CHARTS_GCS_DIR = "output/charts"
+# Served next to the per-direction JSON files the frontend reads
+SNAPSHOT_GCS_PATH = SNAPSHOT_NAME
+TIMESERIES_GCS_PATH = TIMESERIES_NAME
+ANALYTICS_GCS_PATH = ANALYTICS_NAME
+RANKING_INDEX_GCS_PATH = RANKING_INDEX_NAME
+# Per-direction JSON used to be published under cache/ as well; drop those manifest entries
+RETIRED_GCS_PATHS = [f"cache/{d.filename(START_YEAR, END_YEAR)}" for d in REGISTRY]
+# Extra manifest.json keys: the dashboard builds its direction list and artifact names from these
+MANIFEST_METADATA = manifest_metadata(REGISTRY, START_YEAR, END_YEAR)
 
 
 def main() -> None:
     os.makedirs(OUTPUT_DIR, exist_ok=True)
+    metrics = Metrics()
 
     # ----------------------------------------
     # 1) Aggregate counts for all directions
     # ----------------------------------------
-    df = aggregate_all_directions(DIRECTIONS, START_YEAR, END_YEAR)
+    df = aggregate_all_directions(
+        DIRECTIONS, START_YEAR, END_YEAR, refresh_years=REFRESH_YEARS, resolve_concepts=RESOLVE_CONCEPTS,
+        metrics=metrics,
+    )
+    print(f"[METRICS] {metrics.summary()}")
 
     # ----------------------------------------
     # 2) Save combined CSV locally
@@ -53,47 +88,84 @@ def main() -> None:
     print(f"[GCS] Uploaded merged JSON to: gs://ai-trend-cache/{CSV_GCS_PATH}")
 
     # ----------------------------------------
-    # 4) Save heatmap locally
+    # 3b) Consolidated snapshot (all directions x years in one object)
     # ----------------------------------------
-    local_heatmap = os.path.join(OUTPUT_DIR, HEATMAP_NAME)
-    plot_direction_heatmap(df, START_YEAR, END_YEAR, save_path=local_heatmap)
-    print(f"[LOCAL] Saved heatmap: {local_heatmap}")
+    snapshot = build_snapshot(df, START_YEAR, END_YEAR, directions=[d.name for d in REGISTRY])
+    local_snapshot = write_snapshot(snapshot, os.path.join(OUTPUT_DIR, f"{SNAPSHOT_NAME}.gz"))
+    print(f"[LOCAL] Saved snapshot: {local_snapshot}")
+    artifacts = [Upload(SNAPSHOT_GCS_PATH, snapshot_bytes(snapshot), "application/json", "gzip")]
+
+    # Growth rates, shares and ranks computed once here instead of in the browser
+    artifacts.append(Upload(ANALYTICS_GCS_PATH, analytics_bytes(build_analytics(snapshot)), "application/json", "gzip"))
+    # Per-year ranking index: the ranking board reads it once and switches years locally
+    artifacts.append(Upload(RANKING_INDEX_GCS_PATH, analytics_bytes(build_ranking_index(snapshot)), "application/json", "gzip"))
 
     # ----------------------------------------
-    # 5) Upload heatmap ("image as bytes") to GCS
+    # 3c) Monthly/weekly time series (quarters and years are rollups of it)
     # ----------------------------------------
-    with open(local_heatmap, "rb") as f:
-        image_bytes = f.read()
+    if FETCH_TIMESERIES:
+        store = fetch_timeseries(OpenAlexClient(metrics=metrics), DIRECTIONS, START_YEAR, END_YEAR)
+        artifacts.append(Upload(TIMESERIES_GCS_PATH, timeseries_bytes(store), "application/json", "gzip"))
 
-    # wrap upload for image
-    upload_json(
-        HEATMAP_GCS_PATH,
-        {"file_bytes_b64": image_bytes.hex()}  # store binary as hex
-    )
-    print(f"[GCS] Uploaded heatmap to: gs://ai-trend-cache/{HEATMAP_GCS_PATH}")
+    for artifact in artifacts[1:]:  # the snapshot was saved above
+        with open(os.path.join(OUTPUT_DIR, f"{artifact.path}.gz"), "wb") as f:
+            f.write(artifact.data)
+        print(f"[LOCAL] Saved {OUTPUT_DIR}/{artifact.path}.gz")
 
     # ----------------------------------------
-    # 6) Upload each direction’s JSON to GCS
-    # (each produced inside aggregate step)
+    # 3d) Each direction’s JSON, named by the registry slug the manifest lists
     # ----------------------------------------
-    print("[INFO] Uploading each direction JSON to GCS...")
+    direction_counts = counts_by_direction(df)
+    for d in REGISTRY:
+        if d.name in direction_counts:
+            artifacts.append(json_upload(d.object_path(START_YEAR, END_YEAR), direction_counts[d.name]))
+        else:
+            print(f"[WARN] No counts for {d.name}")
 
-    for d in DIRECTIONS:
-        fname = d.safe_filename()
-        local_path = f"cache/{fname}"
-        if os.path.exists(local_path):
-            # load local file
-            import json
-            with open(local_path, "r", encoding="utf-8") as f:
-                content = json.load(f)
+    # ----------------------------------------
+    # 3e) Publish everything in one call, so manifest.json is written once and never
+    # lists a partial set; only objects whose content hash changed are uploaded
+    # ----------------------------------------
+    report = publish(get_backend(), artifacts, metadata=MANIFEST_METADATA, retired=RETIRED_GCS_PATHS)
+    for path in report.uploaded:
+        print(f"[GCS] Uploaded {path} → gs://ai-trend-cache/{path}")
+    print(f"[GCS] Dashboard artifacts: {report.summary()}")
 
-            # GCS path
-            gcs_path = f"cache/{fname}"
+    # ----------------------------------------
+    # 4) Render heatmap + per-direction charts headlessly and save locally
+    # ----------------------------------------
+    image_bytes = render_heatmap(df, START_YEAR, END_YEAR, fmt="png")
+    local_heatmap = os.path.join(OUTPUT_DIR, HEATMAP_NAME)
+    with open(local_heatmap, "wb") as f:
+        f.write(image_bytes)
+    print(f"[LOCAL] Saved heatmap: {local_heatmap}")
 
-            upload_json(gcs_path, content)
-            print(f"[GCS] Uploaded {fname} → gs://ai-trend-cache/{gcs_path}")
-        else:
-            print(f"[WARN] Local JSON missing: {local_path}")
+    os.makedirs(CHARTS_DIR, exist_ok=True)
+    charts = render_direction_trends(df, fmt="png")
+    for slug, chart in charts.items():
+        with open(os.path.join(CHARTS_DIR, f"{slug}.png"), "wb") as f:
+            f.write(chart)
+    print(f"[LOCAL] Rendered {len(charts)} direction charts to {CHARTS_DIR}")
+
+    # ----------------------------------------
+    # 5) Upload heatmap + charts as real PNG objects, concurrently; images whose
+    #    bytes match the stored object are skipped
+    # ----------------------------------------
+    uploads = [Upload(HEATMAP_GCS_PATH, image_bytes, "image/png")]
+    uploads += [Upload(f"{CHARTS_GCS_DIR}/{slug}.png", chart, "image/png") for slug, chart in charts.items()]
+    results = upload_many(uploads, if_changed=True)
+    skipped = sum(r["status"] == "skipped" for r in results)
+    print(f"[GCS] Heatmap at: gs://ai-trend-cache/{HEATMAP_GCS_PATH}")
+    print(f"[GCS] {len(results) - skipped} images uploaded, {skipped} unchanged under: gs://ai-trend-cache/{CHARTS_GCS_DIR}/")
+
+    # ----------------------------------------
+    # 6) Export run metrics (JSON + Prometheus text)
+    # ----------------------------------------
+    with open(os.path.join(OUTPUT_DIR, METRICS_JSON_NAME), "w", encoding="utf-8") as f:
+        f.write(metrics.to_json())
+    with open(os.path.join(OUTPUT_DIR, METRICS_PROM_NAME), "w", encoding="utf-8") as f:
+        f.write(metrics.to_prometheus())
+    print(f"[LOCAL] Saved metrics: {OUTPUT_DIR}/{METRICS_JSON_NAME}, {OUTPUT_DIR}/{METRICS_PROM_NAME}")
 
     print("\n🎉 All data written to GCS successfully!\n")
 
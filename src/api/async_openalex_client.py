@@ -0,0 +1,291 @@
+"""
+Asyncio OpenAlex client backed by a pooled aiohttp session.
+
+Mirrors the multi-direction API of `OpenAlexClient` so that a single process can
+keep many requests in flight over a bounded set of keep-alive connections, e.g.
+to refresh every direction within one Cloud Function invocation.
+"""
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import asyncio
+import json
+import time
+
+import aiohttp
+
+from src.api.openalex_client import (
+    RETRY_STATUSES,
+    OpenAlexClient,
+    CONCEPT_MISS_TTL,
+    MAX_CONCEPT_GROUP_PAGES,
+    MAX_FILTER_VALUES,
+    _check_keyword_mode,
+    concept_index_key,
+    concept_search_params,
+    concept_query_plan,
+    concept_year_params,
+    keyword_search_expression,
+    parse_concept_counts,
+    parse_concept_record,
+    parse_year_counts,
+    short_concept_id,
+)
+from src.api.rate_limit import RateLimiter, backoff_delay, parse_retry_after
+from src.cache import CacheBackend, MemoryCache
+from src.metrics import Metrics
+
+
+class AsyncOpenAlexClient:
+    """Async counterpart of `OpenAlexClient`.
+
+    Use as an async context manager so the connection pool is closed deterministically:
+
+        async with AsyncOpenAlexClient(connection_limit=16) as client:
+            counts = await client.fetch_direction_counts(direction, 2010, 2025)
+
+    Requests share one token-bucket `RateLimiter` and are retried like the sync client.
+    At most `connection_limit` connections are opened; further requests queue on the pool.
+    """
+
+    BASE_URL = OpenAlexClient.BASE_URL
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        connection_limit: int = 16,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        request_deadline: float = 120.0,
+        timeout: float = 30.0,
+        keyword_mode: str = "or",
+        concept_cache: Optional[CacheBackend] = None,
+        metrics: Optional[Metrics] = None,
+    ):
+        self.base_url = base_url or self.BASE_URL
+        self.keyword_mode = _check_keyword_mode(keyword_mode)
+        self.concept_cache = concept_cache if concept_cache is not None else MemoryCache()
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.connection_limit = connection_limit
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.request_deadline = request_deadline
+        self.timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> "AsyncOpenAlexClient":
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def open(self) -> None:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.connection_limit, keepalive_timeout=30)
+            self._session = aiohttp.ClientSession(connector=connector, raise_for_status=False)
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Rate-limited GET with the same retry policy as `OpenAlexClient.get`.
+
+        Raises:
+            aiohttp.ClientResponseError for non-retryable statuses or when retries /
+            the per-request deadline are exhausted; aiohttp.ClientError /
+            asyncio.TimeoutError for network failures likewise.
+        """
+        await self.open()
+        url = f"{self.base_url.rstrip('/')}/{endpoint.lstrip('/')}"
+        query = {k: str(v) for k, v in (params or {}).items()}
+        name = endpoint.strip("/")
+        deadline = time.monotonic() + self.request_deadline
+        attempt = 0
+        while True:
+            waited = await self.rate_limiter.acquire_async()
+            if waited:
+                self.metrics.inc("openalex_rate_limit_wait_seconds_total", waited)
+            remaining = deadline - time.monotonic()
+            retry_after = None
+            started = time.perf_counter()
+            try:
+                timeout = aiohttp.ClientTimeout(total=max(min(self.timeout, remaining), 0.1))
+                async with self._session.get(url, params=query, timeout=timeout) as resp:
+                    body = await resp.read()
+                    self.metrics.inc("openalex_requests_total", endpoint=name, status=resp.status)
+                    self.metrics.inc("openalex_response_bytes_total", len(body), endpoint=name)
+                    self.metrics.observe("openalex_request_seconds", time.perf_counter() - started, endpoint=name)
+                    if resp.status not in RETRY_STATUSES:
+                        resp.raise_for_status()
+                        return json.loads(body)
+                    retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                    reason = "status"
+                    error: Exception = aiohttp.ClientResponseError(
+                        resp.request_info, resp.history, status=resp.status, message=resp.reason or "", headers=resp.headers
+                    )
+            except aiohttp.ClientResponseError:
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = e
+                reason = "network"
+                self.metrics.inc("openalex_requests_total", endpoint=name, status="error")
+                self.metrics.observe("openalex_request_seconds", time.perf_counter() - started, endpoint=name)
+
+            attempt += 1
+            delay = retry_after if retry_after is not None else backoff_delay(attempt, self.backoff_base, self.backoff_max)
+            if attempt > self.max_retries or time.monotonic() + delay >= deadline:
+                raise error
+            self.metrics.inc("openalex_retries_total", endpoint=name, reason=reason)
+            if retry_after is not None:
+                self.rate_limiter.pause(delay)
+            else:
+                self.metrics.inc("openalex_backoff_sleep_seconds_total", delay)
+                await asyncio.sleep(delay)
+
+    async def get_works(self, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Retrieve all works for given params using cursor-based pagination.
+
+        Cursor pages depend on each other, so a single query is paged sequentially;
+        run several `get_works` calls concurrently to overlap independent queries.
+        """
+        params = dict(params or {})
+        params.setdefault("per_page", 200)
+        cursor = params.pop("cursor", "*")
+
+        all_results: List[Dict[str, Any]] = []
+        while True:
+            data = await self.get("works", {**params, "cursor": cursor})
+            all_results.extend(data.get("results", []))
+            next_cursor = data.get("meta", {}).get("next_cursor")
+            if not next_cursor:
+                break
+            cursor = next_cursor
+        return all_results
+
+    async def resolve_concept(self, query: str) -> Optional[Dict[str, Any]]:
+        """Async `OpenAlexClient.resolve_concept` (same cache layout)."""
+        key = concept_index_key(query)
+        cached = self.concept_cache.get(key)
+        if cached is not None:
+            return cached.get("record")
+        record = parse_concept_record(await self.get("concepts", concept_search_params(query)))
+        self.concept_cache.set(key, {"record": record}, ttl=CONCEPT_MISS_TTL if record is None else None)
+        return record
+
+    async def resolve_concepts(self, queries: Sequence[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Bulk `resolve_concept`, uncached queries looked up concurrently."""
+        unique = list(dict.fromkeys(queries))
+        records = await asyncio.gather(*[self.resolve_concept(q) for q in unique])
+        return dict(zip(unique, records))
+
+    async def fetch_counts_by_concept(self, concept_id: str, start_year: int, end_year: int) -> Dict[int, int]:
+        """Fast counts by concept id using group_by=publication_year."""
+        params = {
+            "filter": f"concepts.id:{concept_id},publication_year:{start_year}-{end_year}",
+            "group_by": "publication_year",
+            "per_page": 200,
+        }
+        return parse_year_counts(await self.get("works", params))
+
+    async def fetch_counts_by_concepts(
+        self,
+        concept_ids: Sequence[str],
+        start_year: int,
+        end_year: int,
+        strategy: str = "auto",
+    ) -> Dict[str, Dict[int, int]]:
+        """Async `OpenAlexClient.fetch_counts_by_concepts`; per-year queries run concurrently.
+
+        Paging per year is capped at MAX_CONCEPT_GROUP_PAGES like the sync client, with
+        the same per-concept fallback for concepts not found by then.
+        """
+        ids = list(dict.fromkeys(concept_ids))
+        if strategy == "auto":
+            strategy = concept_query_plan(len(ids), start_year, end_year)
+        if strategy == "per_concept":
+            series = await asyncio.gather(*[self.fetch_counts_by_concept(cid, start_year, end_year) for cid in ids])
+            return dict(zip(ids, series))
+        if strategy != "per_year":
+            raise ValueError("Invalid strategy. Use 'auto', 'per_concept' or 'per_year'.")
+
+        by_short = {short_concept_id(cid): cid for cid in ids}
+        shorts = list(by_short)
+
+        async def one_year(chunk: List[str], year: int) -> Tuple[Dict[str, int], List[str]]:
+            """(counts found, ids still unresolved after MAX_CONCEPT_GROUP_PAGES pages)."""
+            found: Dict[str, int] = {}
+            wanted, cursor, pages = set(chunk), "*", 0
+            while cursor and wanted and pages < MAX_CONCEPT_GROUP_PAGES:
+                data = await self.get("works", concept_year_params(chunk, year, cursor))
+                pages += 1
+                for sid, count in parse_concept_counts(data).items():
+                    if sid in wanted:
+                        found[sid] = count
+                        wanted.discard(sid)
+                cursor = data.get("meta", {}).get("next_cursor") if data.get("group_by") else None
+            # A group list read to the end settles the rest as 0
+            return found, sorted(wanted) if cursor else []
+
+        jobs = [
+            (shorts[i:i + MAX_FILTER_VALUES], year)
+            for i in range(0, len(shorts), MAX_FILTER_VALUES)
+            for year in range(start_year, end_year + 1)
+        ]
+        results = await asyncio.gather(*[one_year(chunk, year) for chunk, year in jobs])
+        out: Dict[str, Dict[int, int]] = {cid: {} for cid in ids}
+        unresolved: Dict[str, List[int]] = {}
+        for (_, year), (found, missing) in zip(jobs, results):
+            for sid, count in found.items():
+                out[by_short[sid]][year] = count
+            for sid in missing:
+                unresolved.setdefault(by_short[sid], []).append(year)
+        # One per-concept request each for concepts the bounded paging did not reach
+        fallback = list(unresolved)
+        series = await asyncio.gather(*[self.fetch_counts_by_concept(cid, start_year, end_year) for cid in fallback])
+        for cid, counts in zip(fallback, series):
+            out[cid].update({y: counts[y] for y in unresolved[cid] if y in counts})
+        return out
+
+    async def fetch_counts_by_keywords(
+        self,
+        keywords: List[str],
+        start_year: int,
+        end_year: int,
+        mode: Optional[str] = None,
+    ) -> Dict[int, int]:
+        """Keyword counts: one OR-combined search ("or"), or one concurrent request per keyword summed per year ("sum")."""
+        mode = _check_keyword_mode(mode or self.keyword_mode)
+        searches = [keyword_search_expression(keywords)] if mode == "or" else list(keywords)
+        pages = await asyncio.gather(*[
+            self.get("works", {
+                "search": search,
+                "filter": f"publication_year:{start_year}-{end_year}",
+                "group_by": "publication_year",
+                "per_page": 200,
+            })
+            for search in searches
+        ])
+        combined: Dict[int, int] = {}
+        for data in pages:
+            for year, count in parse_year_counts(data).items():
+                combined[year] = combined.get(year, 0) + count
+        return combined
+
+    async def fetch_direction_counts(self, direction: Dict[str, Any], start_year: int, end_year: int) -> Dict[int, int]:
+        """Fetch counts for a given direction, preferring concept id then falling back to keywords."""
+        concept_id = direction.get("concept_id")
+        if concept_id:
+            try:
+                return await self.fetch_counts_by_concept(concept_id, start_year, end_year)
+            except Exception as e:
+                print(f"[WARN] Concept-based query failed for {direction.get('name')}: {e}")
+        keywords = direction.get("keywords") or []
+        if not keywords:
+            raise ValueError(f"No keywords available for direction: {direction}")
+        return await self.fetch_counts_by_keywords(keywords, start_year, end_year)
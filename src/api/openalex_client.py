@@ -1,6 +1,153 @@
 import time
 import requests
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.api.rate_limit import RateLimiter, backoff_delay, parse_retry_after
+from src.cache import CacheBackend, DiskCache, MemoryCache, fingerprint
+from src.config.query import QUERY_VERSION
+from src.metrics import Metrics
+from src.api.sharded_paging import ShardProgress, build_shards, page_shards, sum_by_year
+
+# Responses worth retrying: throttling and transient server-side failures.
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# How multi-keyword directions are counted:
+# - "or":  one request with a boolean `kw1 OR kw2 ...` search; each work counted once
+# - "sum": one request per keyword, counts summed per year (double-counts overlaps)
+KEYWORD_MODES = ("or", "sum")
+
+# Opt-in HTTP response cache defaults (see `disk_response_cache`).
+RESPONSE_CACHE_DIR = "cache/http"
+RESPONSE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_RESPONSE_MAX_AGE = 3600.0
+
+# Failed concept lookups are remembered for this long (hits use the index's own TTL).
+CONCEPT_MISS_TTL = 7 * 24 * 3600
+
+# OpenAlex accepts at most this many values in one OR (`a|b|c`) filter.
+MAX_FILTER_VALUES = 100
+# Batched concept counts page at most this many group_by=concepts.id pages per year;
+# concepts not seen by then (usually zero works that year) get one per-concept request.
+MAX_CONCEPT_GROUP_PAGES = 3
+
+
+def parse_year_counts(data: Dict[str, Any]) -> Dict[int, int]:
+    """Turn a `group_by=publication_year` response into {year: count}."""
+    rows = data.get("group_by") or data.get("results") or []
+    out: Dict[int, int] = {}
+    for r in rows:
+        try:
+            year = int(r.get("key"))
+        except Exception:
+            continue
+        out[year] = int(r.get("count", 0))
+    return out
+
+
+def keyword_search_expression(keywords: Sequence[str]) -> str:
+    """Boolean OR of keywords for the `search` parameter.
+
+    Multi-word keywords are parenthesized so each keeps its own all-words semantics,
+    e.g. ["large language model", "LLM"] -> "(large language model) OR LLM".
+    Case-insensitive duplicates are dropped.
+    """
+    seen = set()
+    terms: List[str] = []
+    for kw in keywords:
+        kw = kw.strip()
+        if not kw or kw.lower() in seen:
+            continue
+        seen.add(kw.lower())
+        terms.append(f"({kw})" if len(kw.split()) > 1 else kw)
+    return " OR ".join(terms)
+
+
+def short_concept_id(concept_id: str) -> str:
+    """"https://openalex.org/C154945302" -> "C154945302" (short ids pass through)."""
+    return concept_id.rstrip("/").rsplit("/", 1)[-1].upper()
+
+
+def concept_query_plan(n_concepts: int, start_year: int, end_year: int) -> str:
+    """Cheaper way to get per-year counts for `n_concepts` concepts.
+
+    "per_concept": one group_by=publication_year request per concept.
+    "per_year": one group_by=concepts.id request per year (and per MAX_FILTER_VALUES
+    concepts), filtered on `concepts.id:C1|C2|...`, split back per concept.
+    """
+    chunks = -(-n_concepts // MAX_FILTER_VALUES)
+    per_year = chunks * (end_year - start_year + 1)
+    return "per_year" if per_year < n_concepts else "per_concept"
+
+
+def concept_year_params(short_ids: Sequence[str], year: int, cursor: str = "*") -> Dict[str, Any]:
+    """One page of `group_by=concepts.id` for works in `year` tagged with any of `short_ids`."""
+    return {
+        "filter": f"concepts.id:{'|'.join(short_ids)},publication_year:{year}",
+        "group_by": "concepts.id",
+        "per_page": 200,
+        "cursor": cursor,
+    }
+
+
+def parse_concept_counts(data: Dict[str, Any]) -> Dict[str, int]:
+    """Turn a `group_by=concepts.id` response into {short concept id: count}."""
+    return {
+        short_concept_id(str(r.get("key"))): int(r.get("count", 0))
+        for r in data.get("group_by") or []
+        if r.get("key")
+    }
+
+
+def parse_date_counts(data: Dict[str, Any]) -> Dict[str, int]:
+    """Turn a `group_by=publication_date` response into {"YYYY-MM-DD": count}."""
+    out: Dict[str, int] = {}
+    for r in data.get("group_by") or []:
+        key = str(r.get("key") or "")[:10]
+        if len(key) == 10 and key[4] == "-" and key[7] == "-":
+            out[key] = out.get(key, 0) + int(r.get("count", 0))
+    return out
+
+
+def date_range_filter(start_year: int, end_year: int) -> str:
+    """Publication-date filter covering whole years [start_year, end_year]."""
+    return f"from_publication_date:{start_year}-01-01,to_publication_date:{end_year}-12-31"
+
+
+def response_cache_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Key for a GET of `url` with `params`, independent of parameter order and value types."""
+    canonical = sorted((str(k), str(v)) for k, v in (params or {}).items() if v is not None)
+    return "http_" + fingerprint(url.rstrip("/"), canonical)[:40]
+
+
+def disk_response_cache(directory: str = RESPONSE_CACHE_DIR, max_bytes: int = RESPONSE_CACHE_MAX_BYTES) -> DiskCache:
+    """Gzipped on-disk response cache, LRU-evicted beyond `max_bytes`."""
+    return DiskCache(directory, max_bytes=max_bytes, compress=True)
+
+
+def concept_index_key(query: str) -> str:
+    """Concept index key for a free-text query (case/whitespace-insensitive)."""
+    return "concept:" + " ".join(query.lower().split())
+
+
+def parse_concept_record(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Top hit of a /concepts search as {"id", "display_name", "works_count"}, or None."""
+    results = data.get("results", []) if isinstance(data, dict) else []
+    if not results or not results[0].get("id"):
+        return None
+    top = results[0]
+    return {"id": top["id"], "display_name": top.get("display_name"), "works_count": top.get("works_count")}
+
+
+def concept_search_params(query: str) -> Dict[str, Any]:
+    return {"search": query, "per_page": 1, "select": "id,display_name,works_count"}
+
+
+def _check_keyword_mode(mode: str) -> str:
+    if mode not in KEYWORD_MODES:
+        raise ValueError(f"Invalid keyword mode {mode!r}. Use one of {KEYWORD_MODES}.")
+    return mode
 
 
 class OpenAlexClient:
@@ -15,17 +162,66 @@ class OpenAlexClient:
     Two ways to get yearly counts:
     - group_by mode: fast, aggregated counts (no pagination) using `group_by=publication_year`.
     - full mode: slow, fetches all works via cursor pagination and then counts.
+
+    A client may be shared between threads: every request goes through one
+    token-bucket `RateLimiter`, and the session's connection pool is sized by `pool_size`.
+    Throttled (429), 5xx and connection failures are retried with exponential backoff
+    and jitter, honoring `Retry-After`, until `max_retries` or `request_deadline` is hit.
+
+    `keyword_mode` (see KEYWORD_MODES) selects how keyword-only directions are counted.
+    Concept lookups are memoized in `concept_cache` (per instance by default; pass a
+    DiskCache to share resolutions across processes and runs).
+
+    Pass `response_cache` (e.g. `disk_response_cache()`) to cache successful GETs by
+    canonical URL + params: responses younger than `response_max_age` seconds are
+    served without a request; older ones carrying an ETag / Last-Modified are
+    revalidated with a conditional request, and a 304 keeps the stored body.
+
+    Request counts, latencies, bytes, retries, cache results and rate-limit/backoff
+    waits are recorded in `metrics` (see src.metrics for the metric names).
     """
 
     BASE_URL = "https://api.openalex.org"
-
-    def __init__(self, base_url: Optional[str] = None):
+    # Cache keys include it; see src.config.query
+    QUERY_VERSION = QUERY_VERSION
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        pool_size: int = 10,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        request_deadline: float = 120.0,
+        timeout: float = 30.0,
+        keyword_mode: str = "or",
+        concept_cache: Optional[CacheBackend] = None,
+        response_cache: Optional[CacheBackend] = None,
+        response_max_age: float = DEFAULT_RESPONSE_MAX_AGE,
+        metrics: Optional[Metrics] = None,
+    ):
         self.base_url = base_url or self.BASE_URL
+        self.keyword_mode = _check_keyword_mode(keyword_mode)
+        self.concept_cache = concept_cache if concept_cache is not None else MemoryCache()
+        self.response_cache = response_cache
+        self.response_max_age = response_max_age
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.request_deadline = request_deadline
+        self.timeout = timeout
         self.session = requests.Session()
-        self._concept_cache: Dict[str, str] = {}
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
     def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Make a GET request and raise for HTTP errors.
+        """Make a rate-limited GET request, retrying transient failures.
+
+        Served from / revalidated against `response_cache` when one is configured.
 
         Args:
             endpoint: API endpoint (e.g., "works").
@@ -33,70 +229,199 @@ class OpenAlexClient:
         Returns:
             Parsed JSON as a dict.
         Raises:
-            requests.HTTPError for non-2xx responses.
+            requests.HTTPError for non-2xx responses that are not retryable, or once
+            retries / the per-request deadline are exhausted.
+            requests.ConnectionError / requests.Timeout likewise for network failures.
         """
         url = f"{self.base_url.rstrip('/')}/{endpoint.lstrip('/')}"
-        resp = self.session.get(url, params=params, timeout=30)
-        resp.raise_for_status()
-        return resp.json()
-
-    def get_works(self, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        """Retrieve all works for given params using cursor-based pagination.
+        name = endpoint.strip("/")
+        if self.response_cache is None:
+            return self._request(name, url, params).json()
+
+        key = response_cache_key(url, params)
+        entry = self.response_cache.get(key)
+        if entry is not None and time.time() - entry["stored"] < self.response_max_age:
+            self.metrics.inc("openalex_response_cache_total", result="hit")
+            return entry["body"]
+        validators = {}
+        if entry is not None:
+            if entry.get("etag"):
+                validators["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                validators["If-Modified-Since"] = entry["last_modified"]
+        resp = self._request(name, url, params, headers=validators or None)
+        if resp.status_code == 304 and entry is not None:
+            self.metrics.inc("openalex_response_cache_total", result="revalidated")
+            body = entry["body"]
+            etag, last_modified = entry.get("etag"), entry.get("last_modified")
+        else:
+            self.metrics.inc("openalex_response_cache_total", result="miss")
+            body = resp.json()
+            etag, last_modified = resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+        # Without validators an entry is useless once it is too old to serve
+        ttl = None if (etag or last_modified) else self.response_max_age
+        self.response_cache.set(
+            key, {"stored": time.time(), "etag": etag, "last_modified": last_modified, "body": body}, ttl=ttl
+        )
+        return body
+
+    def _request(
+        self,
+        endpoint: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> requests.Response:
+        """Rate-limited GET with retries (see `get`); returns the final non-retryable 2xx/3xx response."""
+        deadline = time.monotonic() + self.request_deadline
+        attempt = 0
+        while True:
+            waited = self.rate_limiter.acquire()
+            if waited:
+                self.metrics.inc("openalex_rate_limit_wait_seconds_total", waited)
+            remaining = deadline - time.monotonic()
+            retry_after = None
+            started = time.perf_counter()
+            try:
+                resp = self.session.get(url, params=params, headers=headers, timeout=max(min(self.timeout, remaining), 0.1))
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error: Exception = e
+                reason = "network"
+                self.metrics.inc("openalex_requests_total", endpoint=endpoint, status="error")
+            else:
+                self.metrics.inc("openalex_requests_total", endpoint=endpoint, status=resp.status_code)
+                self.metrics.inc("openalex_response_bytes_total", len(resp.content), endpoint=endpoint)
+                if resp.status_code not in RETRY_STATUSES:
+                    self.metrics.observe("openalex_request_seconds", time.perf_counter() - started, endpoint=endpoint)
+                    resp.raise_for_status()
+                    return resp
+                error = requests.HTTPError(f"{resp.status_code} Server Error for url: {resp.url}", response=resp)
+                reason = "status"
+                retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+            self.metrics.observe("openalex_request_seconds", time.perf_counter() - started, endpoint=endpoint)
+
+            attempt += 1
+            delay = retry_after if retry_after is not None else backoff_delay(attempt, self.backoff_base, self.backoff_max)
+            if attempt > self.max_retries or time.monotonic() + delay >= deadline:
+                raise error
+            self.metrics.inc("openalex_retries_total", endpoint=endpoint, reason=reason)
+            if retry_after is not None:
+                # Server-imposed wait applies to every thread sharing this client.
+                self.rate_limiter.pause(delay)
+            else:
+                self.metrics.inc("openalex_backoff_sleep_seconds_total", delay)
+                time.sleep(delay)
+
+    def iter_work_pages(
+        self,
+        params: Optional[Dict[str, Any]] = None,
+        select: Optional[Sequence[str]] = None,
+    ) -> Iterator[Tuple[List[Dict[str, Any]], Optional[str]]]:
+        """Walk /works with cursor pagination, yielding one page at a time.
 
         Args:
-            params: Query parameters to pass to /works.
-        Returns:
-            A combined list of works (results from all pages).
+            params: Query parameters to pass to /works. A `cursor` entry resumes
+                from that position (default "*", the first page).
+            select: Optional field projection (e.g. ["id", "publication_year"]),
+                sent as `select=` so the API returns only those fields.
+        Yields:
+            (results, next_cursor) per page; next_cursor is None on the last page.
+            Only the current page is held in memory.
         """
         params = dict(params or {})
         # Ensure correct pagination params
         params.setdefault("per_page", 200)
+        if select:
+            params["select"] = ",".join(select)
         cursor = params.pop("cursor", "*")
 
-        all_results: List[Dict[str, Any]] = []
-        while True:
-            page_params = {**params, "cursor": cursor}
-            data = self.get("works", page_params)
+        while cursor:
+            data = self.get("works", {**params, "cursor": cursor})
             results = data.get("results", [])
-            all_results.extend(results)
-            next_cursor = data.get("meta", {}).get("next_cursor")
-            if not next_cursor:
-                break
-            cursor = next_cursor
-            # Be polite
-            time.sleep(0.2)
-        return all_results
+            cursor = data.get("meta", {}).get("next_cursor")
+            if not results:
+                cursor = None
+            yield results, cursor
+
+    def iter_works(
+        self,
+        params: Optional[Dict[str, Any]] = None,
+        select: Optional[Sequence[str]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield works one by one across all cursor pages (see `iter_work_pages`)."""
+        for results, _ in self.iter_work_pages(params, select=select):
+            yield from results
+
+    def count_works(self, params: Optional[Dict[str, Any]] = None) -> int:
+        """Count works by paging through them without retaining any records.
+
+        Only the `id` field is requested, so pages are small and memory stays constant.
+        """
+        return sum(len(results) for results, _ in self.iter_work_pages(params, select=["id"]))
+
+    def get_works(
+        self,
+        params: Optional[Dict[str, Any]] = None,
+        select: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Retrieve all works for given params using cursor-based pagination.
+
+        Materializes every page; prefer `iter_works` or `count_works` for large result sets.
+
+        Args:
+            params: Query parameters to pass to /works.
+            select: Optional field projection.
+        Returns:
+            A combined list of works (results from all pages).
+        """
+        return list(self.iter_works(params, select=select))
 
     # Convenience endpoints (not used directly in the demo, but kept for completeness)
     def get_concepts(self, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         return self.get("concepts", params)
 
+    def resolve_concept(self, query: str) -> Optional[Dict[str, Any]]:
+        """Top concept search hit for `query` as {"id", "display_name", "works_count"}, or None.
+
+        Hits and misses are stored in `concept_cache`, so a persistent cache answers
+        repeated lookups without a request.
+        """
+        key = concept_index_key(query)
+        cached = self.concept_cache.get(key)
+        if cached is not None:
+            return cached.get("record")
+        record = parse_concept_record(self.get("concepts", concept_search_params(query)))
+        self.concept_cache.set(key, {"record": record}, ttl=CONCEPT_MISS_TTL if record is None else None)
+        return record
+
+    def resolve_concepts(self, queries: Sequence[str], max_workers: int = 4) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Bulk `resolve_concept`: cached queries cost nothing, the rest are looked up concurrently."""
+        unique = list(dict.fromkeys(queries))
+        if max_workers <= 1 or len(unique) <= 1:
+            return {q: self.resolve_concept(q) for q in unique}
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return dict(zip(unique, pool.map(self.resolve_concept, unique)))
+
     def resolve_concept_id(self, query: str) -> str:
         """Resolve an OpenAlex concept ID from a free-text query.
 
         Returns the full OpenAlex ID URI (e.g., "https://openalex.org/C154945302").
         Raises a ValueError if not found.
         """
-        q = query.strip().lower()
-        if q in self._concept_cache:
-            return self._concept_cache[q]
-        data = self.get("concepts", {"search": query, "per_page": 1})
-        results = data.get("results", []) if isinstance(data, dict) else []
-        if not results:
+        record = self.resolve_concept(query)
+        if record is None:
             raise ValueError(f"No concept found for query: {query}")
-        concept_id = results[0].get("id")
-        if not concept_id:
-            raise ValueError(f"Concept result missing id for query: {query}")
-        self._concept_cache[q] = concept_id
-        return concept_id
+        return record["id"]
 
     def get_authors(self, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         return self.get("authors", params)
 
     def rate_limit_safe_get(self, endpoint: str, params: Optional[Dict[str, Any]] = None, delay: float = 1.0) -> Dict[str, Any]:
-        data = self.get(endpoint, params)
-        time.sleep(delay)
-        return data
+        """Kept for backwards compatibility; `get` is already paced and retried.
+
+        `delay` is ignored: pacing is handled by the client's rate limiter.
+        """
+        return self.get(endpoint, params)
 
     def fetch_nlp_counts_group_by(self, start_year: int, end_year: int) -> Dict[int, int]:
         """High-speed yearly counts using a single group_by query.
@@ -114,55 +439,57 @@ class OpenAlexClient:
             "per_page": 200,
         }
         data = self.get("works", params)
-        rows = data.get("group_by") or data.get("results") or []
-        out: Dict[int, int] = {}
-        for r in rows:
-            try:
-                year = int(r.get("key"))
-            except Exception:
-                continue
-            count = int(r.get("count", 0))
-            out[year] = count
-        return out
-
-    def fetch_nlp_counts_full_paging(self, start_year: int = 2010, end_year: int = 2025) -> Dict[int, int]:
+        return parse_year_counts(data)
+
+    def fetch_nlp_counts_full_paging(
+        self,
+        start_year: int = 2010,
+        end_year: int = 2025,
+        max_workers: int = 1,
+        split_by: Optional[str] = None,
+        checkpoint_path: Optional[str] = None,
+        on_progress: Optional[Callable[[ShardProgress], None]] = None,
+    ) -> Dict[int, int]:
         """Full-detail yearly counts via cursor pagination (slower).
 
         For each year, counts the number of works matching:
         filter = "concepts.id:<nlp_concept_id>,publication_year:YYYY"
 
         - Resolves the NLP concept id once.
-        - Fetches all works (slow) and counts them per year.
-        - Suitable when you also need to inspect detailed metadata of works.
+        - Pages through all works (slow) and counts them per year; pages are
+          discarded as they are counted, so memory use does not grow with the result set.
+        - Years (or, with `split_by="month"` / `"type"`, sub-shards of a year) are
+          independent cursor chains paged `max_workers` at a time under the client's
+          shared rate limit.
+        - With `checkpoint_path`, per-shard cursors are saved after every page and an
+          interrupted run resumes where each shard stopped.
+        - Progress is reported as `ShardProgress` events to `on_progress` (default: logging).
+        - Suitable when you also need to inspect detailed metadata of works
+          (see `src.api.sharded_paging.page_shards` with `on_page`).
         """
         nlp_concept_id = self.resolve_concept_id("natural language processing")
-
-        counts: Dict[int, int] = {}
-        for year in range(start_year, end_year + 1):
-            try:
-                filter_str = f"concepts.id:{nlp_concept_id},publication_year:{year}"
-                params = {
-                    "filter": filter_str,
-                    "per_page": 200,
-                }
-                works = self.get_works(params)
-                counts[year] = len(works)
-                print(f"[OK] {year}: {counts[year]} works")
-            except Exception as e:
-                print(f"[ERROR] {year}: {e}")
-                counts[year] = 0
-        return counts
-
-    def fetch_nlp_counts(self, start_year: int, end_year: int, mode: str = "group_by") -> Dict[int, int]:
+        shards = build_shards(f"concepts.id:{nlp_concept_id}", start_year, end_year, split_by=split_by)
+        shard_counts = page_shards(
+            self,
+            shards,
+            max_workers=max_workers,
+            checkpoint_path=checkpoint_path,
+            on_progress=on_progress,
+        )
+        return sum_by_year(shards, shard_counts)
+
+    def fetch_nlp_counts(self, start_year: int, end_year: int, mode: str = "group_by", **full_options: Any) -> Dict[int, int]:
         """Unified public function to fetch NLP yearly counts.
 
         - mode="group_by": fast, aggregated counts (recommended for trends)
-        - mode="full": slow, fetches all works via pagination (for detailed metadata)
+        - mode="full": slow, fetches all works via pagination (for detailed metadata);
+          `full_options` (max_workers, split_by, checkpoint_path, on_progress) are
+          passed to `fetch_nlp_counts_full_paging`.
         """
         if mode == "group_by":
             return self.fetch_nlp_counts_group_by(start_year, end_year)
         elif mode == "full":
-            return self.fetch_nlp_counts_full_paging(start_year, end_year)
+            return self.fetch_nlp_counts_full_paging(start_year, end_year, **full_options)
         else:
             raise ValueError("Invalid mode. Use 'group_by' or 'full'.")
 
@@ -176,41 +503,87 @@ class OpenAlexClient:
             "per_page": 200,
         }
         data = self.get("works", params)
-        rows = data.get("group_by") or data.get("results") or []
-        out: Dict[int, int] = {}
-        for r in rows:
-            try:
-                year = int(r.get("key"))
-            except Exception:
-                continue
-            count = int(r.get("count", 0))
-            out[year] = count
+        return parse_year_counts(data)
+
+    def fetch_counts_by_concepts(
+        self,
+        concept_ids: Sequence[str],
+        start_year: int,
+        end_year: int,
+        strategy: str = "auto",
+    ) -> Dict[str, Dict[int, int]]:
+        """Yearly counts for many concepts at once: {concept_id: {year: count}}.
+
+        strategy: "per_concept", "per_year" or "auto" (whichever `concept_query_plan`
+        says needs fewer requests). In "per_year" mode each year's OR-filtered
+        `group_by=concepts.id` is paged until every requested concept has been seen,
+        so co-occurring concepts ranking above ours do not hide them, but for at most
+        MAX_CONCEPT_GROUP_PAGES pages. A concept with no works in a year never shows
+        up in its groups; concepts still missing after that are resolved with one
+        per-concept request over the whole range (years it lacks count as 0), instead
+        of paging through every co-occurring concept.
+        """
+        ids = list(dict.fromkeys(concept_ids))
+        if strategy == "auto":
+            strategy = concept_query_plan(len(ids), start_year, end_year)
+        if strategy == "per_concept":
+            return {cid: self.fetch_counts_by_concept(cid, start_year, end_year) for cid in ids}
+        if strategy != "per_year":
+            raise ValueError("Invalid strategy. Use 'auto', 'per_concept' or 'per_year'.")
+
+        out: Dict[str, Dict[int, int]] = {cid: {} for cid in ids}
+        by_short = {short_concept_id(cid): cid for cid in ids}
+        shorts = list(by_short)
+        unresolved: Dict[str, List[int]] = {}
+        for i in range(0, len(shorts), MAX_FILTER_VALUES):
+            chunk = shorts[i:i + MAX_FILTER_VALUES]
+            for year in range(start_year, end_year + 1):
+                wanted, cursor, pages = set(chunk), "*", 0
+                while cursor and wanted and pages < MAX_CONCEPT_GROUP_PAGES:
+                    data = self.get("works", concept_year_params(chunk, year, cursor))
+                    pages += 1
+                    for sid, count in parse_concept_counts(data).items():
+                        if sid in wanted:
+                            out[by_short[sid]][year] = count
+                            wanted.discard(sid)
+                    cursor = data.get("meta", {}).get("next_cursor") if data.get("group_by") else None
+                if cursor:  # groups left unread: the remaining concepts may still be in them
+                    for sid in wanted:
+                        unresolved.setdefault(by_short[sid], []).append(year)
+        for cid, years in unresolved.items():
+            counts = self.fetch_counts_by_concept(cid, start_year, end_year)
+            out[cid].update({y: counts[y] for y in years if y in counts})
         return out
 
-    def fetch_counts_by_keywords(self, keywords: List[str], start_year: int, end_year: int) -> Dict[int, int]:
+    def fetch_counts_by_keywords(
+        self,
+        keywords: List[str],
+        start_year: int,
+        end_year: int,
+        mode: Optional[str] = None,
+    ) -> Dict[int, int]:
         """Fast counts by keyword search (fallback) using group_by=publication_year.
 
-        Uses the `search` parameter across works; combines keywords with OR semantics
-        by issuing one request per keyword and summing counts per year (approximate and may double-count intersections).
+        mode (defaults to the client's `keyword_mode`):
+        - "or": a single request searching `kw1 OR kw2 ...`; works matching several
+          keywords are counted once.
+        - "sum": one request per keyword, counts summed per year (approximate and may
+          double-count intersections); kept for comparison.
+        Requests are paced by the client's rate limiter.
         """
+        mode = _check_keyword_mode(mode or self.keyword_mode)
+        searches = [keyword_search_expression(keywords)] if mode == "or" else list(keywords)
         combined: Dict[int, int] = {}
-        for kw in keywords:
+        for search in searches:
             params = {
-                "search": kw,
+                "search": search,
                 "filter": f"publication_year:{start_year}-{end_year}",
                 "group_by": "publication_year",
                 "per_page": 200,
             }
             data = self.get("works", params)
-            rows = data.get("group_by") or data.get("results") or []
-            for r in rows:
-                try:
-                    year = int(r.get("key"))
-                except Exception:
-                    continue
-                count = int(r.get("count", 0))
+            for year, count in parse_year_counts(data).items():
                 combined[year] = combined.get(year, 0) + count
-            time.sleep(0.15)
         return combined
 
     def fetch_direction_counts(self, direction: Dict[str, Any], start_year: int, end_year: int) -> Dict[int, int]:
@@ -226,6 +599,49 @@ class OpenAlexClient:
             raise ValueError(f"No keywords available for direction: {direction}")
         return self.fetch_counts_by_keywords(keywords, start_year, end_year)
 
+    # ---------- Sub-year (publication_date) API ----------
+    def _direction_queries(self, direction: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Base /works params counting `direction`: its concept filter, else its keyword search(es)."""
+        concept_id = direction.get("concept_id")
+        if concept_id:
+            return [{"filter": f"concepts.id:{concept_id}"}]
+        keywords = direction.get("keywords") or []
+        if not keywords:
+            raise ValueError(f"No keywords available for direction: {direction}")
+        searches = [keyword_search_expression(keywords)] if self.keyword_mode == "or" else list(keywords)
+        return [{"search": search, "filter": ""} for search in searches]
+
+    def fetch_daily_counts(self, direction: Dict[str, Any], start_year: int, end_year: int) -> Dict[str, int]:
+        """Per-day counts {"YYYY-MM-DD": count} for a direction via `group_by=publication_date`.
+
+        One cursor chain over the whole date range (~200 days per page), so weekly and
+        monthly buckets come from ~2 requests per year instead of one per bucket.
+        Keyword directions follow the client's `keyword_mode` like `fetch_counts_by_keywords`.
+        """
+        combined: Dict[str, int] = {}
+        for base in self._direction_queries(direction):
+            base_filter = ",".join(f for f in (base["filter"], date_range_filter(start_year, end_year)) if f)
+            params = {**base, "filter": base_filter, "group_by": "publication_date", "per_page": 200}
+            cursor = "*"
+            while cursor:
+                data = self.get("works", {**params, "cursor": cursor})
+                for day, count in parse_date_counts(data).items():
+                    combined[day] = combined.get(day, 0) + count
+                cursor = data.get("meta", {}).get("next_cursor") if data.get("group_by") else None
+        return combined
+
+    def fetch_monthly_counts(self, direction: Dict[str, Any], start_year: int, end_year: int) -> Dict[str, int]:
+        """Per-month counts {"YYYY-MM": count}, one `meta.count` request per month.
+
+        Fallback for when `fetch_daily_counts` is unavailable; twelve requests per year.
+        """
+        combined: Dict[str, int] = {}
+        for base in self._direction_queries(direction):
+            for shard in build_shards(base["filter"], start_year, end_year, split_by="month"):
+                data = self.get("works", {**base, "filter": shard.filter, "per_page": 1, "select": "id"})
+                combined[shard.key] = combined.get(shard.key, 0) + int(data.get("meta", {}).get("count") or 0)
+        return combined
+
 
 
 
@@ -0,0 +1,11 @@
+"""
+Query strategy version shared by the OpenAlex client and the direction registry.
+
+Bump QUERY_VERSION whenever the way counts are queried changes; direction cache
+keys include it, so counts fetched with an older strategy are never served.
+
+- 2: keyword directions use one OR-combined search by default.
+"""
+from __future__ import annotations
+
+QUERY_VERSION = 2
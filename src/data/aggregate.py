@@ -2,79 +2,508 @@
 Aggregation utilities for combining per-direction yearly counts into a long DataFrame.
 """
 from __future__ import annotations
-from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+import asyncio
 import os
 import json
 import hashlib
+import time
 
+import numpy as np
 import pandas as pd
 
-from src.api.openalex_client import OpenAlexClient
+from src.api.async_openalex_client import AsyncOpenAlexClient
+from src.api.openalex_client import OpenAlexClient, concept_query_plan
+from src.cache import CacheBackend, DiskCache
+from src.config.directions import as_direction
+from src.config import directions as _registry
+from src.data.concepts import auto_resolve_concepts, auto_resolve_concepts_async
+from src.metrics import Metrics
 
 CACHE_DIR = os.path.join("cache")
 os.makedirs(CACHE_DIR, exist_ok=True)
 
+# Tail years older than this are re-queried during an incremental refresh.
+DEFAULT_REFRESH_AFTER = 24 * 3600
+# Whole series are re-fetched at least this often, since OpenAlex also revises older years.
+DEFAULT_CACHE_TTL = 30 * 24 * 3600
+# OpenAlex concepts are effectively frozen; resolved ids are kept for a quarter.
+CONCEPT_INDEX_TTL = 90 * 24 * 3600
+
 
 def _safe_cache_name(name: str) -> str:
-    """Create a filesystem-safe cache filename for a direction name."""
-    slug = name.lower().replace(" ", "_").replace("/", "_")
+    """Create a filesystem-safe cache filename for a direction name (legacy layout)."""
+    slug = _registry.direction_slug(name)
     # ensure bounded length
     h = hashlib.md5(name.encode("utf-8")).hexdigest()[:8]
     return f"{slug}_{h}.json"
 
 
 def _cache_path_for(direction_name: str, start_year: int, end_year: int) -> str:
+    """Path of a cache file written before versioned cache keys were introduced."""
     fname = _safe_cache_name(f"{direction_name}_{start_year}_{end_year}")
     return os.path.join(CACHE_DIR, fname)
 
 
-def aggregate_all_directions(directions: List[dict], start_year: int, end_year: int) -> pd.DataFrame:
+def direction_cache_key(direction: dict, start_year: int, end_year: int, keyword_mode: str = "or") -> str:
+    """Cache key covering everything that determines a direction's counts (see `Direction.key_for`).
+
+    Editing a direction or changing the query strategy never serves stale counts;
+    registry directions reuse the key precomputed when the registry was loaded.
     """
-    Fetch and aggregate yearly counts for all directions.
+    return as_direction(direction).key_for(start_year, end_year, keyword_mode)
+
+
+def default_cache() -> CacheBackend:
+    """On-disk cache under CACHE_DIR/series used when no backend is passed in."""
+    return DiskCache(os.path.join(CACHE_DIR, "series"), default_ttl=DEFAULT_CACHE_TTL)
+
+
+def default_concept_index() -> CacheBackend:
+    """Persistent concept resolution index under CACHE_DIR/concepts."""
+    return DiskCache(os.path.join(CACHE_DIR, "concepts"), default_ttl=CONCEPT_INDEX_TTL)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _decode_entry(value: dict) -> dict:
+    """Decode a stored entry; an empty series is a valid result. Raises on corrupt values."""
+    counts = {int(k): int(v) for k, v in value["counts"].items()}
+    fetched_at = {int(k): datetime.fromisoformat(v) for k, v in value.get("fetched_at", {}).items()}
+    return {"counts": counts, "fetched_at": fetched_at}
+
+
+def _encode_entry(entry: dict) -> dict:
+    return {
+        "counts": {str(y): c for y, c in sorted(entry["counts"].items())},
+        "fetched_at": {str(y): ts.isoformat(timespec="seconds") for y, ts in sorted(entry["fetched_at"].items())},
+    }
+
+
+def _read_legacy(cache_path: str) -> Optional[dict]:
+    """Read a pre-versioning cache file (flat {year: count} or {"counts", "fetched_at"}).
+
+    Flat files carry no freshness info; their years count as fetched at the file's mtime.
+    Files older than DEFAULT_CACHE_TTL are ignored so they cannot outlive the new cache.
+    """
+    if not os.path.exists(cache_path):
+        return None
+    mtime = os.path.getmtime(cache_path)
+    if time.time() - mtime > DEFAULT_CACHE_TTL:
+        return None
+    with open(cache_path, "r", encoding="utf-8") as f:
+        cached = json.load(f)
+    if "counts" in cached:
+        return _decode_entry(cached)
+    counts = {int(k): int(v) for k, v in cached.items()}
+    fetched = datetime.fromtimestamp(mtime, timezone.utc)
+    return {"counts": counts, "fetched_at": {year: fetched for year in counts}}
+
 
-    Uses on-disk JSON caches per direction and period to avoid redundant API calls.
-    Returns a long-format DataFrame with columns ["year", "direction", "count"].
+def _legacy_compatible(direction: dict, keyword_mode: str) -> bool:
+    """Legacy files hold per-keyword sums; they match "or" counts only for concept or single-keyword directions."""
+    return bool(direction.get("concept_id")) or keyword_mode == "sum" or len(direction.get("keywords") or []) <= 1
+
+
+def _remaining_ttl(entry: dict) -> float:
+    """Seconds until the entry's oldest year is DEFAULT_CACHE_TTL old.
+
+    Incremental refreshes only renew the tail, so the expiry stays tied to the oldest
+    fetch; otherwise a daily refresh would keep older years cached forever.
     """
-    client = OpenAlexClient()
-    rows = []
+    if not entry["fetched_at"]:
+        return DEFAULT_CACHE_TTL
+    age = (_now() - min(entry["fetched_at"].values())).total_seconds()
+    return max(DEFAULT_CACHE_TTL - age, 0.0)
+
+
+def _read_cache(
+    cache: CacheBackend, direction: dict, start_year: int, end_year: int, keyword_mode: str = "or"
+) -> Optional[dict]:
+    """Return the cache entry {"counts": {year: count}, "fetched_at": {year: datetime}}, or None on a miss.
+
+    Falls back to the legacy per-name file layout and migrates a hit into `cache`.
+    """
+    name = direction.get("name", "unknown")
+    key = direction_cache_key(direction, start_year, end_year, keyword_mode)
+    try:
+        value = cache.get(key)
+        entry = _decode_entry(value) if value is not None else None
+        source = key
+        if entry is None and _legacy_compatible(direction, keyword_mode):
+            legacy_path = _cache_path_for(name, start_year, end_year)
+            entry = _read_legacy(legacy_path)
+            source = legacy_path
+            if entry is not None:
+                cache.set(key, _encode_entry(entry), ttl=_remaining_ttl(entry))
+    except Exception as e:
+        print(f"[WARN] Ignoring unreadable cache for {name}: {e}")
+        return None
+    if entry is not None:
+        print(f"[CACHE] Loaded {name} from {source}")
+    return entry
+
+
+def _write_cache(
+    cache: CacheBackend, direction: dict, start_year: int, end_year: int, entry: dict, keyword_mode: str = "or"
+) -> None:
+    name = direction.get("name", "unknown")
+    key = direction_cache_key(direction, start_year, end_year, keyword_mode)
+    try:
+        cache.set(key, _encode_entry(entry), ttl=_remaining_ttl(entry))
+        print(f"[CACHE] Saved {name} as {key}")
+    except Exception as e:
+        print(f"[WARN] Could not write cache for {name}: {e}")
 
+
+def _stale_years(entry: dict, start_year: int, end_year: int, refresh_years: int, refresh_after: float) -> List[int]:
+    """Tail years (the last `refresh_years` of the range) not fetched within `refresh_after` seconds."""
+    if refresh_years <= 0:
+        return []
+    cutoff = _now() - timedelta(seconds=refresh_after)
+    tail = range(max(start_year, end_year - refresh_years + 1), end_year + 1)
+    return [y for y in tail if entry["fetched_at"].get(y) is None or entry["fetched_at"][y] < cutoff]
+
+
+def _merge(entry: dict, fresh: Dict[int, int], years: List[int]) -> dict:
+    """Replace `years` in a cache entry with freshly fetched counts."""
+    counts = {y: c for y, c in entry["counts"].items() if y not in years}
+    counts.update({y: c for y, c in fresh.items() if y in years})
+    fetched_at = dict(entry["fetched_at"])
+    now = _now()
+    fetched_at.update({y: now for y in years})
+    return {"counts": counts, "fetched_at": fetched_at}
+
+
+def _full_entry(counts: Dict[int, int], start_year: int, end_year: int) -> dict:
+    now = _now()
+    return {"counts": counts, "fetched_at": {y: now for y in range(start_year, end_year + 1)}}
+
+
+def _concept_batches(
+    cache: CacheBackend,
+    directions: List[dict],
+    start_year: int,
+    end_year: int,
+    refresh_years: int,
+    refresh_after: float,
+    keyword_mode: str,
+) -> Dict[Tuple[int, int], List[Tuple[dict, Optional[dict]]]]:
+    """Concept-backed directions needing a fetch, grouped by the year span they need.
+
+    Cache misses need the whole range, stale entries their stale tail. Only spans
+    where a batched per-year query is cheaper than one request per concept are kept;
+    everything else is left to the per-direction path.
+    """
+    groups: Dict[Tuple[int, int], List[Tuple[dict, Optional[dict]]]] = {}
     for d in directions:
-        name = d.get("name", "unknown")
-        cache_path = _cache_path_for(name, start_year, end_year)
-
-        if os.path.exists(cache_path):
-            try:
-                with open(cache_path, "r", encoding="utf-8") as f:
-                    cached = json.load(f)
-                counts = {int(k): int(v) for k, v in cached.items()}
-                print(f"[CACHE] Loaded {name} from {cache_path}")
-            except Exception:
-                counts = None
+        if not d.get("concept_id"):
+            continue
+        try:
+            value = cache.get(direction_cache_key(d, start_year, end_year, keyword_mode))
+            entry = _decode_entry(value) if value is not None else None
+        except Exception:
+            entry = None
+        if entry is None:
+            if os.path.exists(_cache_path_for(d.get("name", "unknown"), start_year, end_year)):
+                continue  # migrated from the legacy file by the per-direction path
+            span = (start_year, end_year)
         else:
-            counts = None
-
-        if counts is None:
-            # Fetch via client router (concept id preferred, keywords fallback)
-            try:
-                counts = client.fetch_direction_counts(d, start_year, end_year)
-            except Exception as e:
-                print(f"[ERROR] Failed to fetch {name}: {e}")
-                counts = {}
-            # Save cache
-            try:
-                with open(cache_path, "w", encoding="utf-8") as f:
-                    json.dump(counts, f, ensure_ascii=False, indent=2)
-                print(f"[CACHE] Saved {name} to {cache_path}")
-            except Exception as e:
-                print(f"[WARN] Could not write cache for {name}: {e}")
-
-        # Append rows
-        for year, count in sorted(counts.items()):
-            rows.append({
-                "year": int(year),
-                "direction": name,
-                "count": int(count),
-            })
-
-    df = pd.DataFrame(rows, columns=["year", "direction", "count"])
-    return df
+            stale = _stale_years(entry, start_year, end_year, refresh_years, refresh_after)
+            if not stale:
+                continue
+            span = (stale[0], stale[-1])
+        groups.setdefault(span, []).append((d, entry))
+    return {span: g for span, g in groups.items() if concept_query_plan(len(g), *span) == "per_year"}
+
+
+def _store_concept_batch(
+    cache: CacheBackend,
+    group: List[Tuple[dict, Optional[dict]]],
+    span: Tuple[int, int],
+    by_concept: Dict[str, Dict[int, int]],
+    start_year: int,
+    end_year: int,
+    keyword_mode: str,
+) -> None:
+    print(f"[BATCH] {len(group)} concept directions fetched for {span[0]}-{span[1]}")
+    for d, entry in group:
+        counts = by_concept.get(d["concept_id"], {})
+        if entry is None:
+            entry = _full_entry(counts, start_year, end_year)
+        else:
+            entry = _merge(entry, counts, list(range(span[0], span[1] + 1)))
+        _write_cache(cache, d, start_year, end_year, entry, keyword_mode)
+
+
+def _prefetch_concepts(
+    client: OpenAlexClient,
+    cache: CacheBackend,
+    directions: List[dict],
+    start_year: int,
+    end_year: int,
+    refresh_years: int,
+    refresh_after: float,
+) -> None:
+    """Fill the cache for concept directions with batched multi-concept queries.
+
+    Directions handled here become fresh cache hits for `_load_or_fetch`; if a batch
+    fails, its directions simply fall through to one request each.
+    """
+    mode = getattr(client, "keyword_mode", "or")
+    for span, group in _concept_batches(cache, directions, start_year, end_year, refresh_years, refresh_after, mode).items():
+        try:
+            by_concept = client.fetch_counts_by_concepts([d["concept_id"] for d, _ in group], *span, strategy="per_year")
+        except Exception as e:
+            print(f"[WARN] Batched concept query failed for {span[0]}-{span[1]}, falling back per direction: {e}")
+            continue
+        _store_concept_batch(cache, group, span, by_concept, start_year, end_year, mode)
+
+
+async def _prefetch_concepts_async(
+    client: AsyncOpenAlexClient,
+    cache: CacheBackend,
+    directions: List[dict],
+    start_year: int,
+    end_year: int,
+    refresh_years: int,
+    refresh_after: float,
+) -> None:
+    """Async variant of `_prefetch_concepts`."""
+    mode = getattr(client, "keyword_mode", "or")
+    for span, group in _concept_batches(cache, directions, start_year, end_year, refresh_years, refresh_after, mode).items():
+        try:
+            by_concept = await client.fetch_counts_by_concepts([d["concept_id"] for d, _ in group], *span, strategy="per_year")
+        except Exception as e:
+            print(f"[WARN] Batched concept query failed for {span[0]}-{span[1]}, falling back per direction: {e}")
+            continue
+        _store_concept_batch(cache, group, span, by_concept, start_year, end_year, mode)
+
+
+def _load_or_fetch(
+    client: OpenAlexClient,
+    cache: CacheBackend,
+    direction: dict,
+    start_year: int,
+    end_year: int,
+    refresh_years: int = 0,
+    refresh_after: float = DEFAULT_REFRESH_AFTER,
+    metrics: Optional[Metrics] = None,
+) -> Dict[int, int]:
+    """Return {year: count} for one direction, from the cache when available.
+
+    With `refresh_years`, stale tail years of a cached series are re-queried and merged in.
+    Cache hits/misses/stale entries and failures are counted in `metrics`.
+    """
+    metrics = metrics if metrics is not None else Metrics()
+    name = direction.get("name", "unknown")
+    mode = getattr(client, "keyword_mode", "or")
+    entry = _read_cache(cache, direction, start_year, end_year, mode)
+    if entry is not None:
+        stale = _stale_years(entry, start_year, end_year, refresh_years, refresh_after)
+        if not stale:
+            metrics.inc("aggregate_cache_total", result="hit")
+            return entry["counts"]
+        metrics.inc("aggregate_cache_total", result="stale")
+        try:
+            fresh = client.fetch_direction_counts(direction, stale[0], stale[-1])
+        except Exception as e:
+            print(f"[WARN] Incremental refresh failed for {name}, keeping cached counts: {e}")
+            metrics.inc("aggregate_errors_total")
+            return entry["counts"]
+        print(f"[REFRESH] {name}: re-fetched {stale[0]}-{stale[-1]}")
+        entry = _merge(entry, fresh, stale)
+        _write_cache(cache, direction, start_year, end_year, entry, mode)
+        return entry["counts"]
+    # Fetch via client router (concept id preferred, keywords fallback)
+    metrics.inc("aggregate_cache_total", result="miss")
+    try:
+        counts = client.fetch_direction_counts(direction, start_year, end_year)
+    except Exception as e:
+        # Do not cache failures, so the next run retries this direction.
+        print(f"[ERROR] Failed to fetch {name}: {e}")
+        metrics.inc("aggregate_errors_total")
+        return {}
+    _write_cache(cache, direction, start_year, end_year, _full_entry(counts, start_year, end_year), mode)
+    return counts
+
+
+async def _load_or_fetch_async(
+    client: AsyncOpenAlexClient,
+    cache: CacheBackend,
+    direction: dict,
+    start_year: int,
+    end_year: int,
+    refresh_years: int = 0,
+    refresh_after: float = DEFAULT_REFRESH_AFTER,
+    metrics: Optional[Metrics] = None,
+) -> Dict[int, int]:
+    """Async variant of `_load_or_fetch`."""
+    metrics = metrics if metrics is not None else Metrics()
+    name = direction.get("name", "unknown")
+    mode = getattr(client, "keyword_mode", "or")
+    entry = _read_cache(cache, direction, start_year, end_year, mode)
+    if entry is not None:
+        stale = _stale_years(entry, start_year, end_year, refresh_years, refresh_after)
+        if not stale:
+            metrics.inc("aggregate_cache_total", result="hit")
+            return entry["counts"]
+        metrics.inc("aggregate_cache_total", result="stale")
+        try:
+            fresh = await client.fetch_direction_counts(direction, stale[0], stale[-1])
+        except Exception as e:
+            print(f"[WARN] Incremental refresh failed for {name}, keeping cached counts: {e}")
+            metrics.inc("aggregate_errors_total")
+            return entry["counts"]
+        print(f"[REFRESH] {name}: re-fetched {stale[0]}-{stale[-1]}")
+        entry = _merge(entry, fresh, stale)
+        _write_cache(cache, direction, start_year, end_year, entry, mode)
+        return entry["counts"]
+    metrics.inc("aggregate_cache_total", result="miss")
+    try:
+        counts = await client.fetch_direction_counts(direction, start_year, end_year)
+    except Exception as e:
+        print(f"[ERROR] Failed to fetch {name}: {e}")
+        metrics.inc("aggregate_errors_total")
+        return {}
+    _write_cache(cache, direction, start_year, end_year, _full_entry(counts, start_year, end_year), mode)
+    return counts
+
+
+def _to_frame(directions: List[dict], results: List[Dict[int, int]]) -> pd.DataFrame:
+    """Build the long frame column-wise: one array per column, categorical directions.
+
+    Rows are direction-major (in `directions` order) with years ascending, and
+    `direction` is a Categorical whose categories keep the configured order.
+    """
+    names = [d.get("name", "unknown") for d in directions]
+    categories = list(dict.fromkeys(names))
+    code_of = {name: i for i, name in enumerate(categories)}
+
+    lengths = np.fromiter((len(c) for c in results), dtype=np.int64, count=len(results))
+    total = int(lengths.sum())
+    years = np.empty(total, dtype=np.int64)
+    counts = np.empty(total, dtype=np.int64)
+    pos = 0
+    for series in results:
+        n = len(series)
+        if n:
+            ys = np.fromiter(series.keys(), dtype=np.int64, count=n)
+            cs = np.fromiter(series.values(), dtype=np.int64, count=n)
+            order = np.argsort(ys, kind="stable")
+            years[pos:pos + n] = ys[order]
+            counts[pos:pos + n] = cs[order]
+            pos += n
+    codes = np.repeat(np.fromiter((code_of[n] for n in names), dtype=np.int64, count=len(names)), lengths)
+
+    return pd.DataFrame({
+        "year": years,
+        "direction": pd.Categorical.from_codes(codes, categories=categories),
+        "count": counts,
+    })
+
+
+def aggregate_all_directions(
+    directions: List[dict],
+    start_year: int,
+    end_year: int,
+    max_workers: int = 4,
+    client: Optional[OpenAlexClient] = None,
+    refresh_years: int = 0,
+    refresh_after: float = DEFAULT_REFRESH_AFTER,
+    cache: Optional[CacheBackend] = None,
+    batch_concepts: bool = True,
+    resolve_concepts: bool = False,
+    metrics: Optional[Metrics] = None,
+) -> pd.DataFrame:
+    """
+    Fetch and aggregate yearly counts for all directions.
+
+    Caches each direction's series in `cache` (default: DiskCache under CACHE_DIR)
+    keyed by `direction_cache_key`; entries expire after DEFAULT_CACHE_TTL and
+    failed fetches are never cached.
+    Incremental refresh: with `refresh_years=N`, cached series keep their historical
+    years but the last N years of the range are re-queried (one request range per
+    direction) once they are older than `refresh_after` seconds, then merged in.
+    `refresh_years=0` trusts the cache as is.
+    With `batch_concepts`, concept-backed directions that need the same year span are
+    first fetched together with OR-filtered `group_by=concepts.id` queries whenever
+    that takes fewer requests than one per concept (see `concept_query_plan`).
+    With `resolve_concepts`, keyword-only directions whose name or a keyword exactly
+    names an OpenAlex concept are counted by that concept instead (see src.data.concepts);
+    lookups persist in the concept index under CACHE_DIR.
+    Up to `max_workers` directions are fetched concurrently through one shared client,
+    so all requests draw from the same rate limiter; `max_workers=1` runs serially.
+    Request and cache metrics go to `metrics` (default: the client's registry), see src.metrics.
+    Returns a long-format DataFrame with columns ["year", "direction", "count"],
+    ordered as `directions` regardless of completion order.
+    """
+    client = client or OpenAlexClient(
+        pool_size=max(max_workers, 1), concept_cache=default_concept_index(), metrics=metrics
+    )
+    metrics = metrics or getattr(client, "metrics", None) or Metrics()
+    cache = cache if cache is not None else default_cache()
+    if resolve_concepts:
+        directions = auto_resolve_concepts(client, directions)
+    if batch_concepts:
+        _prefetch_concepts(client, cache, directions, start_year, end_year, refresh_years, refresh_after)
+
+    def load(d: dict) -> Dict[int, int]:
+        with metrics.timer("aggregate_direction_seconds"):
+            return _load_or_fetch(client, cache, d, start_year, end_year, refresh_years, refresh_after, metrics)
+
+    if max_workers <= 1:
+        results = [load(d) for d in directions]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(load, directions))
+    return _to_frame(directions, results)
+
+
+async def aggregate_all_directions_async(
+    directions: List[dict],
+    start_year: int,
+    end_year: int,
+    connection_limit: int = 16,
+    client: Optional[AsyncOpenAlexClient] = None,
+    refresh_years: int = 0,
+    refresh_after: float = DEFAULT_REFRESH_AFTER,
+    cache: Optional[CacheBackend] = None,
+    batch_concepts: bool = True,
+    resolve_concepts: bool = False,
+    metrics: Optional[Metrics] = None,
+) -> pd.DataFrame:
+    """
+    Async counterpart of `aggregate_all_directions` (including incremental refresh,
+    concept batching and concept auto-resolution).
+
+    All directions are fanned out at once on one event loop; the client's connection
+    pool (`connection_limit`) and rate limiter bound what is actually in flight.
+    Returns the same DataFrame as the sync version.
+    """
+    if client is None:
+        async with AsyncOpenAlexClient(
+            connection_limit=connection_limit, concept_cache=default_concept_index(), metrics=metrics
+        ) as owned:
+            return await aggregate_all_directions_async(
+                directions, start_year, end_year,
+                client=owned, refresh_years=refresh_years, refresh_after=refresh_after, cache=cache,
+                batch_concepts=batch_concepts, resolve_concepts=resolve_concepts, metrics=metrics,
+            )
+    metrics = metrics or getattr(client, "metrics", None) or Metrics()
+    cache = cache if cache is not None else default_cache()
+    if resolve_concepts:
+        directions = await auto_resolve_concepts_async(client, directions)
+    if batch_concepts:
+        await _prefetch_concepts_async(client, cache, directions, start_year, end_year, refresh_years, refresh_after)
+
+    async def load(d: dict) -> Dict[int, int]:
+        with metrics.timer("aggregate_direction_seconds"):
+            return await _load_or_fetch_async(client, cache, d, start_year, end_year, refresh_years, refresh_after, metrics)
+
+    results = await asyncio.gather(*[load(d) for d in directions])
+    return _to_frame(directions, list(results))
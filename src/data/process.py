@@ -6,6 +6,7 @@ This module keeps things minimal and beginner-friendly. The primary utility turn
 """
 
 from typing import Dict, Tuple
+import numpy as np
 import pandas as pd
 
 
@@ -40,3 +41,59 @@ def multi_field_to_dataframe(stats: Dict[Tuple[str, int], int]) -> pd.DataFrame:
     df["count"] = pd.to_numeric(df["count"], errors="coerce").fillna(0).astype(int)
     df = df.reset_index(drop=True)
     return df
+
+
+def _direction_categorical(df: pd.DataFrame) -> pd.Categorical:
+    """The `direction` column as a Categorical, keeping existing category order or first appearance."""
+    if isinstance(df["direction"].dtype, pd.CategoricalDtype):
+        return df["direction"].array
+    # pd.Categorical would sort categories; keep first-appearance order instead
+    return pd.Categorical(df["direction"], categories=pd.unique(df["direction"]))
+
+
+def year_direction_matrix(df: pd.DataFrame, start_year: int, end_year: int) -> pd.DataFrame:
+    """
+    Scatter a long ["year", "direction", "count"] frame into a years x directions
+    int64 matrix (index=year, columns=direction) with NumPy, without pivot_table.
+
+    Years outside [start_year, end_year] are dropped, missing cells are 0 and
+    duplicate (year, direction) rows are summed. Column order follows the
+    categorical order of `direction` when present, else first appearance.
+    """
+    years = np.arange(start_year, end_year + 1)
+    if df is None or df.empty:
+        return pd.DataFrame(np.zeros((len(years), 0), dtype=np.int64), index=pd.Index(years, name="year"))
+
+    directions = _direction_categorical(df)
+    year_idx = df["year"].to_numpy(dtype=np.int64) - start_year
+    keep = (year_idx >= 0) & (year_idx < len(years))
+
+    matrix = np.zeros((len(years), len(directions.categories)), dtype=np.int64)
+    np.add.at(matrix, (year_idx[keep], directions.codes[keep]), df["count"].to_numpy(dtype=np.int64)[keep])
+    return pd.DataFrame(
+        matrix,
+        index=pd.Index(years, name="year"),
+        columns=pd.CategoricalIndex(directions.categories, categories=directions.categories, ordered=False, name="direction"),
+    )
+
+
+def counts_by_direction(df: pd.DataFrame) -> Dict[str, Dict[int, int]]:
+    """
+    Split a long ["year", "direction", "count"] frame into {direction: {year: count}}
+    (the per-direction JSON layout) using one stable sort and np.split instead of
+    iterating rows.
+    """
+    if df is None or df.empty:
+        return {}
+    directions = _direction_categorical(df)
+    order = np.argsort(directions.codes, kind="stable")
+    codes = directions.codes[order]
+    years = df["year"].to_numpy(dtype=np.int64)[order].tolist()
+    counts = df["count"].to_numpy(dtype=np.int64)[order].tolist()
+    bounds = np.flatnonzero(np.diff(codes)) + 1
+    starts = [0, *bounds.tolist()]
+    ends = [*bounds.tolist(), len(codes)]
+    return {
+        str(directions.categories[codes[a]]): dict(zip(years[a:b], counts[a:b]))
+        for a, b in zip(starts, ends)
+    }
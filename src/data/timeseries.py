@@ -0,0 +1,275 @@
+"""
+Sub-year time series: monthly and weekly counts per direction in one array-backed store.
+
+`TimeSeriesStore` keeps two int64 matrices over a fixed [start_year, end_year] range:
+directions x months and directions x weeks (weeks start on Monday; week 0 is the
+week containing January 1st of `start_year`). Quarterly and yearly views are rollups
+of the month matrix (a reshape and a sum), so they never cost extra API calls.
+Rows are preallocated (`capacity` / `reserve`) and otherwise grow geometrically, so
+adding n directions copies the matrices O(log n) times rather than once per direction.
+
+Counts come from `OpenAlexClient.fetch_daily_counts` (`group_by=publication_date`),
+which fills both resolutions; if the API rejects that grouping, the per-month
+`fetch_monthly_counts` fallback fills months only.
+
+Serialized as gzipped JSON, each row trimmed to its non-zero span:
+
+    {
+      "version": 1,
+      "start_year": 2010, "end_year": 2025,
+      "directions": ["Natural Language Processing", ...],
+      "month": {"Natural Language Processing": [first_index, [counts...]], ...},
+      "week": {...same, only for directions with daily data...}
+    }
+"""
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+import gzip
+import json
+
+import numpy as np
+import pandas as pd
+import requests
+
+TIMESERIES_VERSION = 1
+RESOLUTIONS = ("week", "month", "quarter", "year")
+
+
+def timeseries_name(start_year: int, end_year: int) -> str:
+    """Published object name, e.g. "timeseries_2010_2025.json"."""
+    return f"timeseries_{start_year}_{end_year}.json"
+
+
+def _week_zero(start_year: int) -> date:
+    jan1 = date(start_year, 1, 1)
+    return jan1 - timedelta(days=jan1.weekday())
+
+
+def _trim(row: np.ndarray) -> Optional[List[Any]]:
+    nonzero = np.flatnonzero(row)
+    if nonzero.size == 0:
+        return None
+    first, last = int(nonzero[0]), int(nonzero[-1])
+    return [first, row[first:last + 1].tolist()]
+
+
+class TimeSeriesStore:
+    """Directions x periods count matrices at week and month resolution."""
+
+    def __init__(self, start_year: int, end_year: int, capacity: int = 0):
+        if end_year < start_year:
+            raise ValueError("end_year must not be before start_year")
+        self.start_year = start_year
+        self.end_year = end_year
+        self.week_zero = _week_zero(start_year)
+        self.n_months = (end_year - start_year + 1) * 12
+        self.n_weeks = (date(end_year, 12, 31) - self.week_zero).days // 7 + 1
+        self.directions: List[str] = []
+        self._index: Dict[str, int] = {}
+        # Allocated rows; only the first len(self.directions) are in use
+        self._months = np.zeros((capacity, self.n_months), dtype=np.int64)
+        self._weeks = np.zeros((capacity, self.n_weeks), dtype=np.int64)
+        self._has_weeks = np.zeros(capacity, dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.directions)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._index
+
+    def reserve(self, rows: int) -> None:
+        """Make room for at least `rows` directions in total."""
+        capacity = len(self._has_weeks)
+        if rows <= capacity:
+            return
+        used = len(self.directions)
+        months = np.zeros((rows, self.n_months), dtype=np.int64)
+        weeks = np.zeros((rows, self.n_weeks), dtype=np.int64)
+        has_weeks = np.zeros(rows, dtype=bool)
+        months[:used], weeks[:used], has_weeks[:used] = self._months[:used], self._weeks[:used], self._has_weeks[:used]
+        self._months, self._weeks, self._has_weeks = months, weeks, has_weeks
+
+    def _row(self, name: str) -> int:
+        row = self._index.get(name)
+        if row is None:
+            row = len(self.directions)
+            if row == len(self._has_weeks):
+                self.reserve(max(4, 2 * row))
+            self._index[name] = row
+            self.directions.append(name)
+        return row
+
+    def set_daily(self, name: str, daily: Mapping[str, int]) -> None:
+        """Replace `name`'s series with per-day counts {"YYYY-MM-DD": count}; days outside the range are dropped."""
+        row = self._row(name)
+        days = np.array(list(daily), dtype="datetime64[D]")
+        counts = np.fromiter(daily.values(), dtype=np.int64, count=len(daily))
+        first = np.datetime64(f"{self.start_year}-01-01", "D")
+        last = np.datetime64(f"{self.end_year}-12-31", "D")
+        keep = (days >= first) & (days <= last)
+        days, counts = days[keep], counts[keep]
+        months = (days.astype("datetime64[M]") - first.astype("datetime64[M]")).astype(np.int64)
+        weeks = (days - np.datetime64(self.week_zero, "D")).astype(np.int64) // 7
+        self._months[row] = np.bincount(months, weights=counts, minlength=self.n_months).astype(np.int64)
+        self._weeks[row] = np.bincount(weeks, weights=counts, minlength=self.n_weeks).astype(np.int64)
+        self._has_weeks[row] = True
+
+    def set_monthly(self, name: str, monthly: Mapping[str, int]) -> None:
+        """Replace `name`'s series with per-month counts {"YYYY-MM": count}; weekly data becomes unavailable."""
+        row = self._row(name)
+        values = np.zeros(self.n_months, dtype=np.int64)
+        for key, count in monthly.items():
+            index = (int(key[:4]) - self.start_year) * 12 + int(key[5:7]) - 1
+            if 0 <= index < self.n_months:
+                values[index] += int(count)
+        self._months[row] = values
+        self._weeks[row] = 0
+        self._has_weeks[row] = False
+
+    def has_weeks(self, name: str) -> bool:
+        return bool(self._has_weeks[self._index[name]])
+
+    def matrix(self, resolution: str = "month") -> np.ndarray:
+        """Directions x periods counts; "quarter" and "year" are rolled up from months.
+
+        Rows of directions without daily data are all zero at "week" resolution.
+        """
+        n = len(self.directions)
+        months = self._months[:n]
+        if resolution == "month":
+            return months.copy()
+        if resolution == "quarter":
+            return months.reshape(n, -1, 3).sum(axis=2)
+        if resolution == "year":
+            return months.reshape(n, -1, 12).sum(axis=2)
+        if resolution == "week":
+            return self._weeks[:n].copy()
+        raise ValueError(f"Invalid resolution {resolution!r}. Use one of {RESOLUTIONS}.")
+
+    def periods(self, resolution: str = "month") -> List[str]:
+        """Period labels: weeks by their Monday ("2024-03-04"), "2024-03", "2024-Q1", "2024"."""
+        years = range(self.start_year, self.end_year + 1)
+        if resolution == "month":
+            return [f"{y}-{m:02d}" for y in years for m in range(1, 13)]
+        if resolution == "quarter":
+            return [f"{y}-Q{q}" for y in years for q in range(1, 5)]
+        if resolution == "year":
+            return [str(y) for y in years]
+        if resolution == "week":
+            return [(self.week_zero + timedelta(weeks=w)).isoformat() for w in range(self.n_weeks)]
+        raise ValueError(f"Invalid resolution {resolution!r}. Use one of {RESOLUTIONS}.")
+
+    def series(self, name: str, resolution: str = "month") -> Dict[str, int]:
+        """{period label: count} for one direction."""
+        if resolution == "week" and not self.has_weeks(name):
+            raise KeyError(f"No weekly data for {name}")
+        row = self.matrix(resolution)[self._index[name]]
+        return dict(zip(self.periods(resolution), row.tolist()))
+
+    def to_frame(self, resolution: str = "month") -> pd.DataFrame:
+        """Long ["period", "direction", "count"] DataFrame (direction-major, periods ascending)."""
+        matrix = self.matrix(resolution)
+        names = self.directions
+        if resolution == "week":
+            has_weeks = self._has_weeks[:len(names)]
+            matrix = matrix[has_weeks]
+            names = [d for d, ok in zip(self.directions, has_weeks) if ok]
+        periods = self.periods(resolution)
+        return pd.DataFrame({
+            "period": np.tile(np.array(periods, dtype=object), len(names)),
+            "direction": pd.Categorical(np.repeat(np.array(names, dtype=object), len(periods)), categories=names),
+            "count": matrix.reshape(-1),
+        })
+
+    def to_dict(self) -> Dict[str, Any]:
+        months = {name: _trim(self._months[i]) for i, name in enumerate(self.directions)}
+        weeks = {name: _trim(self._weeks[i]) or [0, []] for i, name in enumerate(self.directions) if self._has_weeks[i]}
+        return {
+            "version": TIMESERIES_VERSION,
+            "start_year": self.start_year,
+            "end_year": self.end_year,
+            "directions": list(self.directions),
+            "month": {k: v for k, v in months.items() if v is not None},
+            "week": weeks,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TimeSeriesStore":
+        if data.get("version") != TIMESERIES_VERSION:
+            raise ValueError(f"Unsupported time series version: {data.get('version')}")
+        store = cls(data["start_year"], data["end_year"], capacity=len(data["directions"]))
+        for name in data["directions"]:
+            row = store._row(name)
+            first, values = data["month"].get(name) or [0, []]
+            store._months[row, first:first + len(values)] = values
+            if name in data["week"]:
+                first, values = data["week"][name]
+                store._weeks[row, first:first + len(values)] = values
+                store._has_weeks[row] = True
+        return store
+
+
+def timeseries_bytes(store: TimeSeriesStore) -> bytes:
+    """Gzipped, compact JSON encoding of a store (what gets written and uploaded)."""
+    raw = json.dumps(store.to_dict(), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return gzip.compress(raw, mtime=0)
+
+
+def read_timeseries(data: bytes) -> TimeSeriesStore:
+    """Inverse of `timeseries_bytes`; accepts gzipped or plain JSON."""
+    if data[:2] == b"\x1f\x8b":
+        data = gzip.decompress(data)
+    return TimeSeriesStore.from_dict(json.loads(data))
+
+
+def _fetch_one(client, direction: dict, start_year: int, end_year: int) -> Tuple[str, Dict[str, int]]:
+    name = direction.get("name", "unknown")
+    try:
+        return "day", client.fetch_daily_counts(direction, start_year, end_year)
+    except requests.HTTPError as e:
+        status = e.response.status_code if e.response is not None else None
+        if status is None or not 400 <= status < 500 or status == 429:
+            raise
+        print(f"[WARN] Daily counts unavailable for {name} ({status}), falling back to monthly requests")
+    return "month", client.fetch_monthly_counts(direction, start_year, end_year)
+
+
+def fetch_timeseries(
+    client,
+    directions: List[dict],
+    start_year: int,
+    end_year: int,
+    max_workers: int = 4,
+    store: Optional[TimeSeriesStore] = None,
+) -> TimeSeriesStore:
+    """Fill a `TimeSeriesStore` with every direction's sub-year counts.
+
+    Up to `max_workers` directions are fetched concurrently through the shared client.
+    Directions that fail are logged and left out of the store.
+    """
+    store = store if store is not None else TimeSeriesStore(start_year, end_year)
+    store.reserve(len(store) + len(directions))
+
+    def load(d: dict) -> Optional[Tuple[str, Dict[str, int]]]:
+        try:
+            return _fetch_one(client, d, start_year, end_year)
+        except Exception as e:
+            print(f"[ERROR] Failed to fetch time series for {d.get('name')}: {e}")
+            return None
+
+    if max_workers <= 1:
+        results = [load(d) for d in directions]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(load, directions))
+    for d, result in zip(directions, results):
+        if result is None:
+            continue
+        kind, counts = result
+        if kind == "day":
+            store.set_daily(d["name"], counts)
+        else:
+            store.set_monthly(d["name"], counts)
+    return store
@@ -0,0 +1,180 @@
+"""
+In-process metrics: labelled counters and latency histograms.
+
+The OpenAlex clients and the aggregation pipeline record into a `Metrics`
+registry; at the end of a run it can be exported as JSON (`to_dict`) or in the
+Prometheus text exposition format (`to_prometheus`).
+
+Metric names used across the project:
+
+    openalex_requests_total{endpoint,status}         HTTP responses (status "error" = network failure)
+    openalex_request_seconds{endpoint}               histogram of per-attempt request latency (I/O time)
+    openalex_response_bytes_total{endpoint}          response body bytes received
+    openalex_retries_total{endpoint,reason}          retried attempts ("status" or "network")
+    openalex_rate_limit_wait_seconds_total           time spent waiting on the rate limiter
+    openalex_backoff_sleep_seconds_total             time spent sleeping between retries
+    openalex_response_cache_total{result}            response cache: hit / miss / revalidated
+    aggregate_cache_total{result}                    series cache: hit / miss / stale
+    aggregate_direction_seconds                      histogram of per-direction load-or-fetch time
+    aggregate_errors_total                           directions that failed to fetch
+"""
+from __future__ import annotations
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+import json
+import threading
+import time
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implicit.
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Optional[Dict[str, Any]]) -> LabelKey:
+    return tuple(sorted((str(k), str(v)) for k, v in (labels or {}).items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    """Sample value at full precision: integers as-is, floats by their shortest round-trip repr."""
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _format_labels(key: LabelKey, extra: Sequence[Tuple[str, str]] = ()) -> str:
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+class _Histogram:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[int]:
+        out, running = [], 0
+        for c in self.counts:
+            running += c
+            out.append(running)
+        return out
+
+
+class Metrics:
+    """Thread-safe registry of counters and histograms keyed by name and labels."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = _Histogram(self.buckets)
+            hist.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels: Any) -> Iterator[None]:
+        """Observe the wall time of the `with` block into histogram `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def counter(self, name: str, **labels: Any) -> float:
+        """Current value of one counter series (0 if never incremented)."""
+        with self._lock:
+            return self._counters.get(name, {}).get(_label_key(labels), 0.0)
+
+    def total(self, name: str) -> float:
+        """Sum of a counter over all label combinations."""
+        with self._lock:
+            return sum(self._counters.get(name, {}).values())
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable snapshot: {"counters": {...}, "histograms": {...}}."""
+        with self._lock:
+            counters = {
+                name: [{"labels": dict(key), "value": value} for key, value in sorted(series.items())]
+                for name, series in sorted(self._counters.items())
+            }
+            histograms = {
+                name: [
+                    {
+                        "labels": dict(key),
+                        "count": h.count,
+                        "sum": h.sum,
+                        "buckets": dict(zip([str(b) for b in h.bounds] + ["+Inf"], h.cumulative())),
+                    }
+                    for key, h in sorted(series.items())
+                ]
+                for name, series in sorted(self._histograms.items())
+            }
+        return {"counters": counters, "histograms": histograms}
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for key, h in sorted(series.items()):
+                    bounds = [f"{b:g}" for b in h.bounds] + ["+Inf"]
+                    for bound, cum in zip(bounds, h.cumulative()):
+                        lines.append(f"{name}_bucket{_format_labels(key, [('le', bound)])} {cum}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {_format_value(h.sum)}")
+                    lines.append(f"{name}_count{_format_labels(key)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> str:
+        """One-line human summary of the request metrics."""
+        with self._lock:
+            requests = sum(self._counters.get("openalex_requests_total", {}).values())
+            io_time = sum(h.sum for h in self._histograms.get("openalex_request_seconds", {}).values())
+            waited = sum(self._counters.get("openalex_rate_limit_wait_seconds_total", {}).values())
+            slept = sum(self._counters.get("openalex_backoff_sleep_seconds_total", {}).values())
+            retries = sum(self._counters.get("openalex_retries_total", {}).values())
+            received = sum(self._counters.get("openalex_response_bytes_total", {}).values())
+        return (
+            f"{requests:.0f} requests, {retries:.0f} retries, {received / 1024:.1f} KiB received, "
+            f"{io_time:.2f}s I/O, {waited:.2f}s rate-limit wait, {slept:.2f}s backoff"
+        )
@@ -1,30 +1,101 @@
+"""
+Upload/download helpers for the published bucket.
+
+Blobs are uploaded as real objects with a proper Content-Type and Cache-Control:
+JSON is compact and gzipped with `Content-Encoding: gzip` (GCS decompresses it
+transparently for clients that do not accept gzip), images and other binaries are
+uploaded as-is. `upload_many` pushes many blobs concurrently through a thread pool.
+
+The backend (GCS, local directory or memory) is chosen by src.config.storage and
+created on first use; every function also accepts an explicit `backend`.
+"""
+from __future__ import annotations
+from typing import Any, Dict, Iterable, List, Optional
+import gzip
 import json
-from google.cloud import storage
+import mimetypes
+import threading
+
 from fastapi import HTTPException
 
-BUCKET_NAME = "ai-trend-cache"
+from src.storage_backends import (
+    DEFAULT_CACHE_CONTROL,
+    StorageBackend,
+    Upload,
+    backend_from_config,
+    json_upload,
+)
+
+_backend: Optional[StorageBackend] = None
+_backend_lock = threading.Lock()
+
+
+def get_backend() -> StorageBackend:
+    """The configured storage backend, built on first use."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = backend_from_config()
+        return _backend
+
+
+def set_backend(backend: Optional[StorageBackend]) -> None:
+    """Replace the default backend (None re-reads the config on next use)."""
+    global _backend
+    with _backend_lock:
+        _backend = backend
+
+
+def _guess_type(path: str) -> str:
+    return mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+
+def upload_bytes(
+    path: str,
+    data: bytes,
+    content_type: Optional[str] = None,
+    content_encoding: Optional[str] = None,
+    cache_control: Optional[str] = DEFAULT_CACHE_CONTROL,
+    backend: Optional[StorageBackend] = None,
+) -> Dict[str, Any]:
+    """Upload raw bytes; the content type is guessed from `path` when not given."""
+    upload = Upload(path, data, content_type or _guess_type(path), content_encoding, cache_control)
+    return (backend or get_backend()).put(upload)
+
+
+def upload_file(
+    path: str,
+    local_path: str,
+    content_type: Optional[str] = None,
+    cache_control: Optional[str] = DEFAULT_CACHE_CONTROL,
+    backend: Optional[StorageBackend] = None,
+) -> Dict[str, Any]:
+    """Stream a local file to `path` without loading it into memory (where the backend allows)."""
+    return (backend or get_backend()).put_file(path, local_path, content_type or _guess_type(local_path), cache_control)
+
 
-client = storage.Client()
+def upload_json(path: str, data: Any, compress: bool = True, backend: Optional[StorageBackend] = None) -> Dict[str, Any]:
+    """Upload `data` as compact (by default gzip-encoded) JSON."""
+    return (backend or get_backend()).put(json_upload(path, data, compress=compress))
 
-def upload_json(path: str, data: dict):
-    """Upload dictionary as JSON to GCS."""
-    bucket = client.bucket(BUCKET_NAME)
-    blob = bucket.blob(path)
 
-    blob.upload_from_string(
-        json.dumps(data, indent=2),
-        content_type="application/json"
-    )
-    return {"status": "uploaded", "path": path}
+def upload_many(
+    uploads: Iterable[Upload],
+    max_workers: int = 8,
+    if_changed: bool = False,
+    backend: Optional[StorageBackend] = None,
+) -> List[Dict[str, Any]]:
+    """Upload blobs concurrently; with if_changed=True unchanged blobs are skipped."""
+    return (backend or get_backend()).put_many(uploads, max_workers=max_workers, if_changed=if_changed)
 
 
-def download_json(path: str) -> dict:
-    """Download JSON from GCS."""
-    bucket = client.bucket(BUCKET_NAME)
-    blob = bucket.blob(path)
+def download_json(path: str, backend: Optional[StorageBackend] = None) -> Any:
+    """Download JSON (plain or gzip-encoded)."""
+    content = (backend or get_backend()).get(path)
 
-    if not blob.exists():
+    if content is None:
         raise HTTPException(status_code=404, detail=f"{path} not found in bucket")
 
-    content = blob.download_as_string()
-    return json.loads(content)
\ No newline at end of file
+    if content[:2] == b"\x1f\x8b":
+        content = gzip.decompress(content)
+    return json.loads(content)
@@ -0,0 +1,265 @@
+"""
+Blob storage backends: GCS, local filesystem and in-memory.
+
+All backends share one interface (put/get/delete, batched put_many/get_many and
+content hashes), so the publish pipeline can run against a real bucket, a local
+directory, or memory in tests. The GCS client is only imported and constructed on
+first use, so nothing here needs GCP credentials until a GCS call is made.
+
+Content hashes are base64 MD5 digests of the stored bytes, the same value GCS
+keeps as `md5_hash`, so conditional writes (`put_many(..., if_changed=True)`)
+only need object metadata, never the object bodies.
+"""
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+import base64
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+from src.config.storage import BUCKET_NAME, STORAGE_BACKEND, STORAGE_ROOT
+
+# Data is refreshed at most daily; let browsers/CDN reuse objects for an hour.
+DEFAULT_CACHE_CONTROL = "public, max-age=3600"
+
+
+def content_hash(data: bytes) -> str:
+    """Base64 MD5 of `data` (matches GCS blob.md5_hash)."""
+    return base64.b64encode(hashlib.md5(data).digest()).decode("ascii")
+
+
+def encode_json(data: Any) -> bytes:
+    """Compact UTF-8 JSON."""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+@dataclass(frozen=True)
+class Upload:
+    """One blob to upload: raw bytes plus the HTTP metadata GCS serves them with."""
+
+    path: str
+    data: bytes
+    content_type: str = "application/octet-stream"
+    content_encoding: Optional[str] = None
+    cache_control: Optional[str] = DEFAULT_CACHE_CONTROL
+
+
+def json_upload(path: str, data: Any, compress: bool = True, cache_control: Optional[str] = DEFAULT_CACHE_CONTROL) -> Upload:
+    """An `Upload` of `data` as compact JSON, gzipped with Content-Encoding unless compress=False."""
+    body = encode_json(data)
+    if compress:
+        return Upload(path, gzip.compress(body, mtime=0), "application/json", "gzip", cache_control)
+    return Upload(path, body, "application/json", None, cache_control)
+
+
+class StorageBackend:
+    """Interface shared by storage backends."""
+
+    def put(self, upload: Upload) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def put_file(self, path: str, local_path: str, content_type: str, cache_control: Optional[str] = DEFAULT_CACHE_CONTROL) -> Dict[str, Any]:
+        """Upload a local file; backends that can stream override this."""
+        with open(local_path, "rb") as f:
+            return self.put(Upload(path, f.read(), content_type, None, cache_control))
+
+    def get(self, path: str) -> Optional[bytes]:
+        """Stored bytes exactly as uploaded (still gzipped if uploaded gzipped), or None."""
+        raise NotImplementedError
+
+    def delete(self, path: str) -> None:
+        raise NotImplementedError
+
+    def hashes(self, paths: Sequence[str]) -> Dict[str, Optional[str]]:
+        """{path: content hash or None if missing}."""
+        out: Dict[str, Optional[str]] = {}
+        for path in paths:
+            data = self.get(path)
+            out[path] = content_hash(data) if data is not None else None
+        return out
+
+    def get_many(self, paths: Sequence[str], max_workers: int = 8) -> Dict[str, Optional[bytes]]:
+        paths = list(paths)
+        if max_workers <= 1 or len(paths) <= 1:
+            return {p: self.get(p) for p in paths}
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return dict(zip(paths, pool.map(self.get, paths)))
+
+    def put_many(self, uploads: Iterable[Upload], max_workers: int = 8, if_changed: bool = False) -> List[Dict[str, Any]]:
+        """Upload blobs concurrently; results are returned in input order.
+
+        With if_changed=True, uploads whose bytes match the stored object's content
+        hash are skipped and reported with status "skipped".
+        """
+        uploads = list(uploads)
+        existing = self.hashes([u.path for u in uploads]) if if_changed else {}
+
+        def run(upload: Upload) -> Dict[str, Any]:
+            if if_changed and existing.get(upload.path) == content_hash(upload.data):
+                return {"status": "skipped", "path": upload.path, "bytes": len(upload.data)}
+            return self.put(upload)
+
+        if max_workers <= 1 or len(uploads) <= 1:
+            return [run(u) for u in uploads]
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(run, uploads))
+
+
+def _uploaded(upload: Upload) -> Dict[str, Any]:
+    return {"status": "uploaded", "path": upload.path, "bytes": len(upload.data)}
+
+
+class MemoryStorage(StorageBackend):
+    """Thread-safe in-process store; keeps each object's HTTP metadata for inspection."""
+
+    def __init__(self):
+        self.objects: Dict[str, Upload] = {}
+        self._lock = threading.Lock()
+
+    def put(self, upload: Upload) -> Dict[str, Any]:
+        with self._lock:
+            self.objects[upload.path] = upload
+        return _uploaded(upload)
+
+    def get(self, path: str) -> Optional[bytes]:
+        with self._lock:
+            upload = self.objects.get(path)
+        return upload.data if upload is not None else None
+
+    def delete(self, path: str) -> None:
+        with self._lock:
+            self.objects.pop(path, None)
+
+
+class LocalStorage(StorageBackend):
+    """Objects as files under `root` (object path = relative file path), written atomically.
+
+    Only the bytes are stored; HTTP metadata (content type, encoding, cache control) is dropped.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def path_for(self, path: str) -> str:
+        full = os.path.abspath(os.path.join(self.root, path))
+        if not full.startswith(os.path.abspath(self.root) + os.sep):
+            raise ValueError(f"Object path escapes storage root: {path!r}")
+        return full
+
+    def _write(self, full: str, write) -> None:
+        directory = os.path.dirname(full)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(tmp_path, full)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def put(self, upload: Upload) -> Dict[str, Any]:
+        self._write(self.path_for(upload.path), lambda f: f.write(upload.data))
+        return _uploaded(upload)
+
+    def put_file(self, path: str, local_path: str, content_type: str, cache_control: Optional[str] = DEFAULT_CACHE_CONTROL) -> Dict[str, Any]:
+        def copy(f):
+            with open(local_path, "rb") as src:
+                shutil.copyfileobj(src, f)
+
+        self._write(self.path_for(path), copy)
+        return {"status": "uploaded", "path": path, "bytes": os.path.getsize(local_path)}
+
+    def get(self, path: str) -> Optional[bytes]:
+        try:
+            with open(self.path_for(path), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def delete(self, path: str) -> None:
+        try:
+            os.remove(self.path_for(path))
+        except FileNotFoundError:
+            pass
+
+
+class GCSStorage(StorageBackend):
+    """Google Cloud Storage bucket; the client is created on first use.
+
+    Pass `bucket` to use an existing bucket object (or a fake with the same API).
+    """
+
+    def __init__(self, bucket_name: str = BUCKET_NAME, client=None, bucket=None):
+        self.bucket_name = bucket_name
+        self._client = client
+        self._bucket = bucket
+        self._lock = threading.Lock()
+
+    @property
+    def bucket(self):
+        with self._lock:
+            if self._bucket is None:
+                if self._client is None:
+                    from google.cloud import storage
+
+                    self._client = storage.Client()
+                self._bucket = self._client.bucket(self.bucket_name)
+            return self._bucket
+
+    def put(self, upload: Upload) -> Dict[str, Any]:
+        blob = self.bucket.blob(upload.path)
+        blob.cache_control = upload.cache_control
+        blob.content_encoding = upload.content_encoding
+        blob.upload_from_string(upload.data, content_type=upload.content_type)
+        return _uploaded(upload)
+
+    def put_file(self, path: str, local_path: str, content_type: str, cache_control: Optional[str] = DEFAULT_CACHE_CONTROL) -> Dict[str, Any]:
+        blob = self.bucket.blob(path)
+        blob.cache_control = cache_control
+        blob.upload_from_filename(local_path, content_type=content_type)
+        return {"status": "uploaded", "path": path, "bytes": os.path.getsize(local_path)}
+
+    def get(self, path: str) -> Optional[bytes]:
+        blob = self.bucket.get_blob(path)
+        if blob is None:
+            return None
+        # raw_download keeps gzip-encoded objects compressed, i.e. the bytes that were uploaded
+        return blob.download_as_bytes(raw_download=True)
+
+    def delete(self, path: str) -> None:
+        blob = self.bucket.get_blob(path)
+        if blob is not None:
+            blob.delete()
+
+    def hashes(self, paths: Sequence[str]) -> Dict[str, Optional[str]]:
+        """One listing under the paths' common prefix instead of a metadata request per object."""
+        paths = list(paths)
+        if not paths:
+            return {}
+        wanted = set(paths)
+        found = {
+            b.name: b.md5_hash
+            for b in self.bucket.list_blobs(prefix=os.path.commonprefix(paths))
+            if b.name in wanted
+        }
+        return {p: found.get(p) for p in paths}
+
+
+def backend_from_config(kind: Optional[str] = None, root: Optional[str] = None, bucket_name: Optional[str] = None) -> StorageBackend:
+    """Build the backend named by `kind`, defaulting to src.config.storage settings."""
+    kind = kind or STORAGE_BACKEND
+    if kind == "gcs":
+        return GCSStorage(bucket_name or BUCKET_NAME)
+    if kind == "local":
+        return LocalStorage(root or STORAGE_ROOT)
+    if kind == "memory":
+        return MemoryStorage()
+    raise ValueError("Invalid storage backend. Use 'gcs', 'local' or 'memory'.")
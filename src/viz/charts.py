@@ -6,9 +6,11 @@ import seaborn as sns
 import pandas as pd
 
 
-def plot_nlp_trend(df: pd.DataFrame, save_path: Optional[str] = "output/nlp_trend.png") -> None:
+def plot_nlp_trend(df: pd.DataFrame, save_path: Optional[str] = "output/nlp_trend.png", show: bool = True) -> None:
     """
     df: DataFrame with columns ["year", "count"]. Plots a basic line chart.
+    With show=False the figure is only saved and then closed (for scripts and batch jobs;
+    see src.viz.render for pyplot-free rendering).
     """
     if df is None or df.empty:
         print("No data to plot.")
@@ -29,10 +31,13 @@ def plot_nlp_trend(df: pd.DataFrame, save_path: Optional[str] = "output/nlp_tren
 
     if save_path:
         plt.savefig(save_path)
-    plt.show()
+    if show:
+        plt.show()
+    else:
+        plt.close()
 
 
-def plot_nlp_heatmap(df: pd.DataFrame) -> None:
+def plot_nlp_heatmap(df: pd.DataFrame, show: bool = True) -> None:
     """
     df: DataFrame with columns ["field", "year", "count"].
     """
@@ -47,4 +52,7 @@ def plot_nlp_heatmap(df: pd.DataFrame) -> None:
     plt.xlabel("Field")
     plt.ylabel("Year")
     plt.tight_layout()
-    plt.show()
+    if show:
+        plt.show()
+    else:
+        plt.close()
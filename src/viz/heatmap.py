@@ -10,25 +10,79 @@ import seaborn as sns
 import matplotlib.pyplot as plt
 import numpy as np
 
+from src.data.process import year_direction_matrix
 
-def plot_direction_heatmap(df: pd.DataFrame, start_year: int, end_year: int, save_path: Optional[str] = "output/ai_heatmap.png") -> None:
+TRANSFORMS = ("none", "log1p", "row_share", "zscore", "yoy")
+
+
+def build_heatmap_pivot(df: pd.DataFrame, start_year: int, end_year: int) -> pd.DataFrame:
+    """
+    Year (rows) x direction (columns) int64 count matrix over the full year range.
+
+    To draw several charts from one frame, build the pivot once and pass it to each
+    of them as `pivot=`.
+    """
+    return year_direction_matrix(df, start_year, end_year)
+
+
+def transform_heatmap(pivot: pd.DataFrame, transform: str = "log1p") -> pd.DataFrame:
+    """
+    Apply a vectorized transform to a year x direction count pivot.
+
+    - "none": raw counts
+    - "log1p": log(1 + count)
+    - "row_share": each direction's share of that year's total
+    - "zscore": per-direction z-score across years
+    - "yoy": year-over-year growth per direction ((x_t - x_{t-1}) / x_{t-1}); NaN where undefined
+    """
+    values = pivot.to_numpy(dtype=np.float64)
+    if transform == "none":
+        out = values
+    elif transform == "log1p":
+        out = np.log1p(values)
+    elif transform == "row_share":
+        totals = values.sum(axis=1, keepdims=True)
+        out = np.divide(values, totals, out=np.zeros_like(values), where=totals > 0)
+    elif transform == "zscore":
+        std = values.std(axis=0, keepdims=True)
+        out = np.divide(values - values.mean(axis=0, keepdims=True), std, out=np.zeros_like(values), where=std > 0)
+    elif transform == "yoy":
+        out = np.full_like(values, np.nan)
+        prev, cur = values[:-1], values[1:]
+        np.divide(cur - prev, prev, out=out[1:], where=prev > 0)
+    else:
+        raise ValueError(f"Invalid transform {transform!r}. Use one of {TRANSFORMS}.")
+    return pd.DataFrame(out, index=pivot.index, columns=pivot.columns)
+
+
+def plot_direction_heatmap(
+    df: pd.DataFrame,
+    start_year: int,
+    end_year: int,
+    save_path: Optional[str] = "output/ai_heatmap.png",
+    transform: str = "none",
+    show: bool = True,
+    pivot: Optional[pd.DataFrame] = None,
+) -> None:
     """
     Plot a heatmap for direction-year counts.
 
     Expects a long DataFrame with columns ["year", "direction", "count"].
-    Produces a year (rows) x direction (columns) heatmap.
+    Produces a year (rows) x direction (columns) heatmap; `transform` is one of TRANSFORMS.
+    With show=False the figure is saved and closed without opening a window;
+    batch jobs should prefer `src.viz.render.render_heatmap`. A precomputed
+    `build_heatmap_pivot` result can be passed as `pivot`.
     """
     if df is None or df.empty:
         print("No data provided for heatmap.")
         return
 
-    pivot = df.pivot_table(index="year", columns="direction", values="count", fill_value=0)
-    # Reindex years to ensure a full range
-    years = list(range(start_year, end_year + 1))
-    pivot = pivot.reindex(years, fill_value=0)
+    if pivot is None:
+        pivot = build_heatmap_pivot(df, start_year, end_year)
+    data = pivot if transform == "none" else transform_heatmap(pivot, transform)
 
     plt.figure(figsize=(max(12, len(pivot.columns) * 0.5), 10))
-    sns.heatmap(pivot, cmap="YlGnBu")
+    sns.heatmap(data, cmap="YlGnBu")
     plt.title("AI Directions - Works per Year (OpenAlex)")
     plt.xlabel("Direction")
     plt.ylabel("Year")
@@ -39,17 +93,21 @@ def plot_direction_heatmap(df: pd.DataFrame, start_year: int, end_year: int, sav
         if out_dir and not os.path.exists(out_dir):
             os.makedirs(out_dir)
         plt.savefig(save_path, dpi=150)
-    plt.show()
+    if show:
+        plt.show()
+    else:
+        plt.close()
 
 
-def compute_log_heatmap(df: pd.DataFrame, start_year: int, end_year: int) -> pd.DataFrame:
+def compute_log_heatmap(
+    df: pd.DataFrame, start_year: int, end_year: int, pivot: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
     """
     Compute a log1p-transformed pivot for display in notebooks.
     Returns a pivot DataFrame with index=year and columns=direction.
     """
     if df is None or df.empty:
         return pd.DataFrame()
-    pivot = df.pivot_table(index="year", columns="direction", values="count", fill_value=0)
-    years = list(range(start_year, end_year + 1))
-    pivot = pivot.reindex(years, fill_value=0)
-    return (pivot + 1).applymap(lambda x: float(np.log1p(x)))
+    if pivot is None:
+        pivot = build_heatmap_pivot(df, start_year, end_year)
+    return transform_heatmap(pivot, "log1p")
@@ -0,0 +1,121 @@
+"""
+Headless chart rendering to in-memory PNG/SVG bytes.
+
+Uses the object-oriented Figure API with the Agg canvas only: no pyplot state
+machine, no GUI backend, no `plt.show()`. Every figure is cleared as soon as its
+bytes are written, so rendering many charts in one process does not accumulate
+figures. `render_direction_trends` fans charts out over a process pool.
+"""
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import io
+
+import matplotlib
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import pandas as pd
+import seaborn as sns
+
+from src.config.directions import slug_for
+from src.data.process import counts_by_direction
+from src.viz.heatmap import build_heatmap_pivot, transform_heatmap
+
+FORMATS = ("png", "svg")
+
+
+@contextmanager
+def _figure(figsize: Tuple[float, float]) -> Iterator[Figure]:
+    """A pyplot-free Agg figure that is torn down deterministically on exit."""
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    try:
+        yield fig
+    finally:
+        fig.clear()
+
+
+def _to_bytes(fig: Figure, fmt: str, dpi: int) -> bytes:
+    if fmt not in FORMATS:
+        raise ValueError(f"Invalid format {fmt!r}. Use one of {FORMATS}.")
+    buf = io.BytesIO()
+    # Fixed hash salt and no timestamp: identical data renders to identical bytes.
+    metadata = {"Date": None} if fmt == "svg" else None
+    with matplotlib.rc_context({"svg.hashsalt": "ai-trend"}):
+        fig.savefig(buf, format=fmt, dpi=dpi, metadata=metadata)
+    return buf.getvalue()
+
+
+def render_trend(
+    years: Sequence[int],
+    counts: Sequence[int],
+    title: str,
+    fmt: str = "png",
+    dpi: int = 100,
+    figsize: Tuple[float, float] = (6, 4),
+) -> bytes:
+    """Render one yearly trend line chart and return the encoded image bytes."""
+    with _figure(figsize) as fig:
+        ax = fig.add_subplot()
+        ax.plot(list(years), list(counts), marker="o")
+        ax.set_title(title)
+        ax.set_xlabel("Year")
+        ax.set_ylabel("Number of works")
+        ax.grid(True, linestyle="--", alpha=0.4)
+        fig.tight_layout()
+        return _to_bytes(fig, fmt, dpi)
+
+
+def render_heatmap(
+    df: pd.DataFrame,
+    start_year: int,
+    end_year: int,
+    fmt: str = "png",
+    dpi: int = 150,
+    transform: str = "none",
+    pivot: Optional[pd.DataFrame] = None,
+) -> bytes:
+    """Render the year x direction heatmap (see `plot_direction_heatmap`) to image bytes."""
+    if pivot is None:
+        pivot = build_heatmap_pivot(df, start_year, end_year)
+    data = pivot if transform == "none" else transform_heatmap(pivot, transform)
+    with _figure((max(12, len(pivot.columns) * 0.5), 10)) as fig:
+        ax = fig.add_subplot()
+        sns.heatmap(data, cmap="YlGnBu", ax=ax)
+        ax.set_title("AI Directions - Works per Year (OpenAlex)")
+        ax.set_xlabel("Direction")
+        ax.set_ylabel("Year")
+        fig.tight_layout()
+        return _to_bytes(fig, fmt, dpi)
+
+
+def _render_job(job: Tuple[str, List[int], List[int], str, int]) -> bytes:
+    name, years, counts, fmt, dpi = job
+    return render_trend(years, counts, name, fmt=fmt, dpi=dpi)
+
+
+def render_direction_trends(
+    df: pd.DataFrame,
+    fmt: str = "png",
+    dpi: int = 100,
+    max_workers: Optional[int] = None,
+) -> Dict[str, bytes]:
+    """
+    Render one trend chart per direction of a long ["year", "direction", "count"] frame.
+
+    Charts are rendered in a process pool (`max_workers=1` renders in-process);
+    workers are recycled periodically so long batches do not grow memory.
+    Returns {slug: image bytes} in direction order.
+    """
+    series = counts_by_direction(df)
+    jobs = [
+        (name, sorted(counts), [counts[y] for y in sorted(counts)], fmt, dpi)
+        for name, counts in series.items()
+    ]
+    if max_workers == 1 or len(jobs) <= 1:
+        images = [_render_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, max_tasks_per_child=50) as pool:
+            images = list(pool.map(_render_job, jobs, chunksize=4))
+    return {slug_for(name): image for name, image in zip(series, images)}
@@ -0,0 +1,59 @@
+"""Shared fixtures: a scriptable local HTTP server standing in for the OpenAlex API."""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import json
+import threading
+
+import pytest
+
+
+class StubServer:
+    """Serves queued responses in order; once the queue is empty, repeats `default`.
+
+    Each response is a (status, headers, body) tuple where body is a dict (sent as
+    JSON) or bytes. Every request is recorded as (path, params) in `requests`.
+    """
+
+    def __init__(self):
+        self.responses = []
+        self.default = (200, {}, {"results": [], "meta": {}})
+        self.requests = []
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                with stub._lock:
+                    stub.requests.append((parsed.path, params))
+                    status, headers, body = stub.responses.pop(0) if stub.responses else stub.default
+                if callable(body):
+                    body = body(parsed.path, params)
+                payload = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def queue(self, status=200, body=None, headers=None):
+        self.responses.append((status, headers or {}, body if body is not None else {}))
+
+
+@pytest.fixture
+def stub_server():
+    server = StubServer()
+    server._thread.start()
+    yield server
+    server.httpd.shutdown()
+    server.httpd.server_close()
@@ -0,0 +1,178 @@
+"""Tests for multi-direction aggregation."""
+import os
+import random
+import time
+
+from src.cache import MemoryCache
+from src.data import aggregate
+
+
+class FakeClient:
+    """Returns synthetic counts after a random delay so workers finish out of order."""
+
+    def fetch_direction_counts(self, direction, start_year, end_year):
+        time.sleep(random.uniform(0, 0.02))
+        base = len(direction["name"])
+        return {year: base * (year - start_year + 1) for year in range(end_year, start_year - 1, -1)}
+
+
+def test_concurrent_aggregation_matches_serial_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(aggregate, "CACHE_DIR", str(tmp_path))
+    directions = [{"name": f"Direction {'x' * i}", "keywords": ["x"]} for i in range(12)]
+
+    serial = aggregate.aggregate_all_directions(
+        directions, 2020, 2022, max_workers=1, client=FakeClient(), cache=MemoryCache()
+    )
+    concurrent = aggregate.aggregate_all_directions(
+        directions, 2020, 2022, max_workers=6, client=FakeClient(), cache=MemoryCache()
+    )
+
+    assert list(serial.columns) == ["year", "direction", "count"]
+    assert serial.equals(concurrent)
+    assert list(concurrent["direction"].unique()) == [d["name"] for d in directions]
+    assert list(concurrent["year"][:3]) == [2020, 2021, 2022]
+
+
+class FailingClient:
+    def fetch_direction_counts(self, direction, start_year, end_year):
+        raise RuntimeError("boom")
+
+
+def test_failed_fetch_is_not_cached(tmp_path, monkeypatch):
+    monkeypatch.setattr(aggregate, "CACHE_DIR", str(tmp_path))
+    directions = [{"name": "Broken", "keywords": ["x"]}]
+
+    cache = MemoryCache()
+    df = aggregate.aggregate_all_directions(directions, 2020, 2021, client=FailingClient(), cache=cache)
+
+    assert df.empty
+    assert len(cache) == 0
+
+
+class EmptyClient:
+    def __init__(self):
+        self.calls = 0
+
+    def fetch_direction_counts(self, direction, start_year, end_year):
+        self.calls += 1
+        return {}
+
+
+def test_cached_empty_series_is_a_hit(tmp_path, monkeypatch):
+    # A direction with no works in the range is a result, not a miss to re-query every run
+    monkeypatch.setattr(aggregate, "CACHE_DIR", str(tmp_path))
+    directions = [{"name": "Niche", "keywords": ["niche"]}]
+    cache, client = MemoryCache(), EmptyClient()
+
+    aggregate.aggregate_all_directions(directions, 2020, 2021, client=client, cache=cache)
+    aggregate.aggregate_all_directions(directions, 2020, 2021, client=client, cache=cache)
+
+    assert len(cache) == 1
+    assert client.calls == 1
+
+
+def test_empty_cache_backend_is_not_replaced(tmp_path, monkeypatch):
+    # An empty MemoryCache is falsy (it has __len__); it must still be the cache used
+    monkeypatch.setattr(aggregate, "CACHE_DIR", str(tmp_path))
+    cache = MemoryCache()
+    aggregate.aggregate_all_directions([{"name": "Solo", "keywords": ["x"]}], 2020, 2021, client=FakeClient(), cache=cache)
+
+    assert len(cache) == 1
+    assert os.listdir(tmp_path) == []
+
+
+class RecordingClient:
+    def __init__(self, counts):
+        self.counts = counts
+        self.calls = []
+
+    def fetch_direction_counts(self, direction, start_year, end_year):
+        self.calls.append((start_year, end_year))
+        return {y: c for y, c in self.counts.items() if start_year <= y <= end_year}
+
+
+def test_incremental_refresh_only_requeries_stale_tail(tmp_path, monkeypatch):
+    monkeypatch.setattr(aggregate, "CACHE_DIR", str(tmp_path))
+    directions = [{"name": "RAG", "keywords": ["rag"]}]
+    cache_file = tmp_path / aggregate._safe_cache_name("RAG_2020_2025")
+    # Legacy flat cache file, written "long ago"
+    cache_file.write_text('{"2020": 1, "2021": 2, "2022": 3, "2023": 4, "2024": 5, "2025": 6}')
+    old = time.time() - 7 * 24 * 3600
+    os.utime(cache_file, (old, old))
+
+    client = RecordingClient({2024: 50, 2025: 60})
+    df = aggregate.aggregate_all_directions(directions, 2020, 2025, client=client, refresh_years=2)
+
+    assert client.calls == [(2024, 2025)]
+    assert dict(zip(df["year"], df["count"])) == {2020: 1, 2021: 2, 2022: 3, 2023: 4, 2024: 50, 2025: 60}
+
+    # Tail is fresh now: a second incremental run issues no requests
+    aggregate.aggregate_all_directions(directions, 2020, 2025, client=client, refresh_years=2)
+    assert client.calls == [(2024, 2025)]
+
+
+def test_tail_refresh_keeps_the_expiry_of_the_oldest_year(tmp_path, monkeypatch):
+    monkeypatch.setattr(aggregate, "CACHE_DIR", str(tmp_path))
+    directions = [{"name": "RAG", "keywords": ["rag"]}]
+    cache = MemoryCache()
+    entry = aggregate._full_entry({y: 1 for y in range(2020, 2026)}, 2020, 2025)
+    # One day of the cache TTL left
+    fetched = aggregate._now() - aggregate.timedelta(seconds=aggregate.DEFAULT_CACHE_TTL - 24 * 3600)
+    entry["fetched_at"] = {y: fetched for y in entry["fetched_at"]}
+    aggregate._write_cache(cache, directions[0], 2020, 2025, entry)
+
+    client = RecordingClient({2024: 50, 2025: 60})
+    aggregate.aggregate_all_directions(directions, 2020, 2025, client=client, cache=cache, refresh_years=2)
+
+    assert client.calls == [(2024, 2025)]
+    expires, value = cache._data[aggregate.direction_cache_key(directions[0], 2020, 2025)]
+    assert value["counts"]["2025"] == 60
+    assert expires - time.time() < 24 * 3600 + 60
+
+
+def test_cache_key_changes_with_query_config():
+    base = {"name": "RAG", "concept_id": None, "keywords": ["rag"]}
+    key = aggregate.direction_cache_key(base, 2010, 2025)
+
+    assert key.startswith("rag_2010_2025_")
+    assert key == aggregate.direction_cache_key(dict(base), 2010, 2025)
+    assert key != aggregate.direction_cache_key({**base, "keywords": ["rag", "retrieval"]}, 2010, 2025)
+    assert key != aggregate.direction_cache_key({**base, "concept_id": "C1"}, 2010, 2025)
+    assert key != aggregate.direction_cache_key(base, 2010, 2024)
+
+
+def test_stale_concept_tails_are_refreshed_in_one_batch(stub_server, tmp_path, monkeypatch):
+    from src.api.openalex_client import OpenAlexClient
+    from src.api.rate_limit import RateLimiter
+
+    monkeypatch.setattr(aggregate, "CACHE_DIR", str(tmp_path))
+    directions = [{"name": f"D{i}", "concept_id": f"https://openalex.org/C{i}", "keywords": []} for i in range(1, 4)]
+    cache = MemoryCache()
+    stale = aggregate._full_entry({2020: 1, 2021: 1, 2022: 1}, 2020, 2022)
+    stale["fetched_at"] = {y: aggregate._now() - aggregate.timedelta(days=2) for y in stale["fetched_at"]}
+    for d in directions:
+        aggregate._write_cache(cache, d, 2020, 2022, stale)
+    stub_server.default = (200, {}, {"group_by": [{"key": f"C{i}", "count": 10 * i} for i in range(1, 4)], "meta": {}})
+    client = OpenAlexClient(base_url=stub_server.url, rate_limiter=RateLimiter(1000))
+
+    df = aggregate.aggregate_all_directions(directions, 2020, 2022, client=client, cache=cache, refresh_years=2)
+
+    # Two stale years for three concepts: one request per year instead of one per concept
+    assert len(stub_server.requests) == 2
+    assert df[df["year"] == 2022].set_index("direction")["count"].to_dict() == {"D1": 10, "D2": 20, "D3": 30}
+    assert df[df["year"] == 2020]["count"].tolist() == [1, 1, 1]
+
+
+def test_aggregate_records_cache_metrics(tmp_path, monkeypatch):
+    from src.metrics import Metrics
+
+    monkeypatch.setattr(aggregate, "CACHE_DIR", str(tmp_path))
+    directions = [{"name": "A", "keywords": ["a"]}, {"name": "B", "keywords": ["b"]}]
+    cache, metrics = MemoryCache(), Metrics()
+
+    aggregate.aggregate_all_directions(directions, 2020, 2021, client=FakeClient(), cache=cache, metrics=metrics)
+    aggregate.aggregate_all_directions(directions, 2020, 2021, client=FakeClient(), cache=cache, metrics=metrics)
+
+    assert metrics.counter("aggregate_cache_total", result="miss") == 2
+    assert metrics.counter("aggregate_cache_total", result="hit") == 2
+    assert metrics.to_dict()["histograms"]["aggregate_direction_seconds"][0]["count"] == 4
@@ -0,0 +1,64 @@
+"""Tests for the trend analytics computed from the snapshot matrix."""
+import gzip
+import json
+
+import numpy as np
+import pandas as pd
+
+from src.data.analytics import analytics_bytes, build_analytics, build_ranking_index, compute_metrics, rank_order, ranks
+from src.data.snapshot import build_snapshot
+
+
+def test_growth_metrics_are_vectorized_over_the_matrix():
+    counts = np.array([[100, 200, 400, 800], [0, 10, 10, 5]])
+
+    m = compute_metrics(counts, windows=(2,))
+
+    assert np.allclose(m["share"][:, 1], [200 / 210, 10 / 210])
+    assert np.isnan(m["yoy"][0, 0]) and m["yoy"][0, 1] == 1.0
+    assert np.isnan(m["yoy"][1, 1])  # zero base
+    assert m["yoy"][1, 3] == -0.5
+    assert np.allclose(m["cagr_2"][0, 2:], [1.0, 1.0])
+    assert m["acceleration"][0, 2] == 0.0 and m["acceleration"][1, 3] == -0.5
+    # Too few works to count as emerging
+    assert np.isnan(m["emerging"][1, 3]) and m["emerging"][0, 3] == 1.0
+
+
+def test_ranks_put_undefined_values_last():
+    values = np.array([[1.0, np.nan], [3.0, 2.0], [3.0, 5.0]])
+
+    assert rank_order(values).tolist() == [[1, 2, 0], [2, 1, 0]]
+    r = ranks(values)
+    assert r[:, 0].tolist() == [3.0, 1.0, 2.0]
+    assert np.isnan(r[0, 1]) and r[2, 1] == 1.0
+
+
+def test_published_analytics_are_json_with_nulls():
+    df = pd.DataFrame({
+        "year": [2020, 2021, 2020, 2021],
+        "direction": ["A", "A", "B", "B"],
+        "count": [10, 30, 20, 20],
+    })
+    analytics = build_analytics(build_snapshot(df, 2020, 2021))
+
+    decoded = json.loads(gzip.decompress(analytics_bytes(analytics)))
+
+    assert decoded["metrics"]["count"] == [[10, 30], [20, 20]]
+    assert decoded["metrics"]["yoy"] == [[None, 2.0], [None, 0.0]]
+    assert decoded["order"]["count"] == [[1, 0], [0, 1]]
+    assert decoded["ranks"]["count"] == [[2, 1], [1, 2]]
+    assert "share" not in decoded["ranks"]
+
+
+def test_ranking_index_lists_every_year_with_rank_moves():
+    df = pd.DataFrame({
+        "year": [2020, 2021, 2020, 2021, 2020, 2021],
+        "direction": ["A", "A", "B", "B", "C", "C"],
+        "count": [10, 50, 20, 20, 30, 5],
+    })
+
+    index = build_ranking_index(build_snapshot(df, 2020, 2021))
+
+    assert index["names"] == {"a": "A", "b": "B", "c": "C"}
+    assert index["years"]["2020"] == [["c", 30, 1, None], ["b", 20, 2, None], ["a", 10, 3, None]]
+    assert index["years"]["2021"] == [["a", 50, 1, 2], ["b", 20, 2, 0], ["c", 5, 3, -2]]
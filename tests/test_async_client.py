@@ -0,0 +1,68 @@
+"""Tests for the asyncio OpenAlex client against a local stub server."""
+import asyncio
+
+from src.api.async_openalex_client import AsyncOpenAlexClient
+from src.api.openalex_client import MAX_CONCEPT_GROUP_PAGES
+from src.api.rate_limit import RateLimiter
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_keyword_counts_are_summed(stub_server):
+    stub_server.default = (200, {}, {"group_by": [{"key": "2020", "count": 2}, {"key": "2021", "count": 3}]})
+
+    async def go():
+        async with AsyncOpenAlexClient(
+            base_url=stub_server.url, rate_limiter=RateLimiter(1000), keyword_mode="sum"
+        ) as client:
+            return await client.fetch_direction_counts({"name": "X", "keywords": ["a", "b", "c"]}, 2020, 2021)
+
+    assert run(go()) == {2020: 6, 2021: 9}
+    assert sorted(p["search"] for _, p in stub_server.requests) == ["a", "b", "c"]
+
+
+def test_keyword_counts_or_mode_is_one_request(stub_server):
+    stub_server.default = (200, {}, {"group_by": [{"key": "2020", "count": 4}]})
+
+    async def go():
+        async with AsyncOpenAlexClient(base_url=stub_server.url, rate_limiter=RateLimiter(1000)) as client:
+            return await client.fetch_counts_by_keywords(["a", "b c"], 2020, 2020)
+
+    assert run(go()) == {2020: 4}
+    assert [p["search"] for _, p in stub_server.requests] == ["a OR (b c)"]
+
+
+def test_async_get_retries_server_errors(stub_server):
+    stub_server.queue(503)
+    stub_server.queue(200, {"group_by": [{"key": "2020", "count": 7}]})
+
+    async def go():
+        async with AsyncOpenAlexClient(base_url=stub_server.url, rate_limiter=RateLimiter(1000), backoff_base=0.01) as client:
+            return await client.fetch_counts_by_concept("C1", 2020, 2020)
+
+    assert run(go()) == {2020: 7}
+    assert len(stub_server.requests) == 2
+
+
+def endless_concept_groups(path, params):
+    """C1 on the first page of every year, then endless co-occurring concepts; C3 has no works in 2020."""
+    if params.get("group_by") == "publication_year":
+        return {"group_by": [{"key": "2021", "count": 5}]}
+    page = 0 if params["cursor"] == "*" else int(params["cursor"])
+    groups = [{"key": "https://openalex.org/C1", "count": 7}] if page == 0 else [{"key": f"C9{page}", "count": 1}]
+    return {"group_by": groups, "meta": {"next_cursor": str(page + 1)}}
+
+
+def test_batched_concept_paging_is_bounded_for_absent_concepts(stub_server):
+    stub_server.default = (200, {}, endless_concept_groups)
+    ids = ["https://openalex.org/C1", "https://openalex.org/C3"]
+
+    async def go():
+        async with AsyncOpenAlexClient(base_url=stub_server.url, rate_limiter=RateLimiter(1000)) as client:
+            return await client.fetch_counts_by_concepts(ids, 2020, 2021, strategy="per_year")
+
+    assert run(go()) == {ids[0]: {2020: 7, 2021: 7}, ids[1]: {2021: 5}}
+    # MAX_CONCEPT_GROUP_PAGES pages per year, then one per-concept request for C3
+    assert len(stub_server.requests) == 2 * MAX_CONCEPT_GROUP_PAGES + 1
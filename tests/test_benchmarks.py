@@ -0,0 +1,41 @@
+"""Tests for the offline benchmark suite: fixture coverage, server rate limiting, regression checks."""
+from benchmarks import run_benchmarks as bench
+from benchmarks.mock_server import MockOpenAlexServer, load_fixture
+
+
+def test_recorded_fixture_covers_every_network_scenario():
+    with MockOpenAlexServer(latency=0.0, fixture=load_fixture(bench.FIXTURE_PATH), fallback=False) as server:
+        results = bench.run_suite(server, repeat=1, only=list(bench.NETWORK_SCENARIOS))
+
+    assert server.misses == []
+    assert set(results) == set(bench.NETWORK_SCENARIOS)
+    assert all(r["requests"] > 0 for r in results.values())
+
+
+def test_server_rate_limit_is_honored_by_the_client():
+    fixture = load_fixture(bench.FIXTURE_PATH)
+    with MockOpenAlexServer(latency=0.0, fixture=fixture, fallback=False) as server:
+        expected = bench.client_factory(server.url)().fetch_nlp_counts_full_paging(2023, 2024, on_progress=lambda e: None)
+    with MockOpenAlexServer(latency=0.0, fixture=fixture, fallback=False, rate_limit=4) as server:
+        make_client = bench.client_factory(server.url, rate=1000)
+        counts = make_client().fetch_nlp_counts_full_paging(2023, 2024, max_workers=2, on_progress=lambda e: None)
+
+    assert server.throttled > 0
+    assert counts == expected
+
+
+def entry(seconds, requests=10, machine="m", latency=0.02):
+    return {
+        "machine": machine,
+        "config": {"latency": latency},
+        "results": {"fetch": {"seconds": seconds, "min": seconds, "requests": requests}},
+    }
+
+
+def test_regressions_compare_with_matching_runs_only():
+    history = [entry(1.0), entry(1.1), entry(0.2, machine="other"), entry(0.2, latency=0.0)]
+
+    assert bench.find_regressions(entry(1.15), history) == []
+    assert len(bench.find_regressions(entry(1.5), history)) == 1
+    assert "requests" in bench.find_regressions(entry(1.0, requests=11), history)[0]
+    assert bench.find_regressions(entry(5.0), []) == []
@@ -0,0 +1,56 @@
+"""Tests for the cache backends."""
+import os
+import time
+
+from src.cache import DiskCache, MemoryCache, fingerprint
+
+
+def test_fingerprint_is_order_independent_for_dicts():
+    assert fingerprint({"a": 1, "b": [1, 2]}, 3) == fingerprint({"b": [1, 2], "a": 1}, 3)
+    assert fingerprint({"a": 1}) != fingerprint({"a": 2})
+
+
+def test_memory_cache_ttl_and_lru():
+    cache = MemoryCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+    cache.set("short", "x", ttl=0)
+    assert cache.get("short") is None
+
+
+def test_disk_cache_round_trip_and_expiry(tmp_path):
+    cache = DiskCache(str(tmp_path), compress=True)
+    cache.set("k/1", {"counts": {"2020": 5}})
+    assert cache.get("k/1") == {"counts": {"2020": 5}}
+    assert [p.name for p in tmp_path.iterdir()] == ["k_1.json.gz"]
+
+    cache.set("old", 1, ttl=-1)
+    assert cache.get("old") is None
+    assert not os.path.exists(cache.path_for("old"))
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskCache(str(tmp_path), max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    past = time.time() - 60
+    os.utime(cache.path_for("a"), (past, past))
+    os.utime(cache.path_for("b"), (past + 1, past + 1))
+    cache.get("a")  # touch: "b" becomes least recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_disk_cache_evicts_by_size(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=300)
+    for i in range(10):
+        cache.set(f"k{i}", "x" * 50)
+    assert sum(p.stat().st_size for p in tmp_path.iterdir()) <= 300
+    assert cache.get("k9") == "x" * 50
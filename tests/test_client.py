@@ -1,6 +1,116 @@
 """Tests for the OpenAlex client."""
+import pytest
 
+from src.api import openalex_client
+from src.api.openalex_client import OpenAlexClient, keyword_search_expression
+from src.api.rate_limit import RateLimiter
 
-def test_client():
-    """Basic test for the OpenAlex client."""
-    assert True
\ No newline at end of file
+
+def paged_works(path, params):
+    """Three cursor pages of two works each, then an empty page."""
+    pages = {"*": ("c1", [1, 2]), "c1": ("c2", [3, 4]), "c2": ("c3", [5, 6]), "c3": (None, [])}
+    next_cursor, ids = pages[params["cursor"]]
+    return {"meta": {"next_cursor": next_cursor}, "results": [{"id": f"W{i}"} for i in ids]}
+
+
+def test_iter_works_streams_all_pages(stub_server):
+    stub_server.default = (200, {}, paged_works)
+    client = OpenAlexClient(base_url=stub_server.url, rate_limiter=RateLimiter(1000))
+
+    works = client.iter_works({"filter": "publication_year:2020"}, select=["id", "title"])
+
+    assert next(works) == {"id": "W1"}
+    assert [w["id"] for w in works] == ["W2", "W3", "W4", "W5", "W6"]
+    assert stub_server.requests[0][1]["select"] == "id,title"
+
+
+def test_count_works_only_selects_ids(stub_server):
+    stub_server.default = (200, {}, paged_works)
+    client = OpenAlexClient(base_url=stub_server.url, rate_limiter=RateLimiter(1000))
+
+    assert client.count_works({"filter": "publication_year:2020"}) == 6
+    assert {p["select"] for _, p in stub_server.requests} == {"id"}
+    assert [p["cursor"] for _, p in stub_server.requests] == ["*", "c1", "c2", "c3"]
+
+
+def test_get_works_resumes_from_cursor(stub_server):
+    stub_server.default = (200, {}, paged_works)
+    client = OpenAlexClient(base_url=stub_server.url, rate_limiter=RateLimiter(1000))
+
+    assert [w["id"] for w in client.get_works({"cursor": "c2"})] == ["W5", "W6"]
+
+
+def test_keyword_search_expression_parenthesizes_phrases():
+    expr = keyword_search_expression(["large language model", "LLM", "llm", " "])
+    assert expr == "(large language model) OR LLM"
+
+
+def test_keyword_modes(stub_server):
+    stub_server.default = (200, {}, {"group_by": [{"key": "2020", "count": 5}]})
+    client = OpenAlexClient(base_url=stub_server.url, rate_limiter=RateLimiter(1000))
+    direction = {"name": "Multimodal", "keywords": ["multimodal", "cross-modal", "audio visual"]}
+
+    assert client.fetch_direction_counts(direction, 2020, 2020) == {2020: 5}
+    assert [p["search"] for _, p in stub_server.requests] == ["multimodal OR cross-modal OR (audio visual)"]
+
+    assert client.fetch_counts_by_keywords(direction["keywords"], 2020, 2020, mode="sum") == {2020: 15}
+    assert len(stub_server.requests) == 4
+    with pytest.raises(ValueError):
+        OpenAlexClient(keyword_mode="and")
+
+
+def concept_groups(path, params):
+    """group_by=concepts.id pages: C1 on the first page next to a popular co-occurring concept, C2 on the second."""
+    year = int(params["filter"].rsplit(":", 1)[1])
+    if params["cursor"] == "*":
+        groups = [{"key": "https://openalex.org/C41008148", "count": 999}, {"key": "https://openalex.org/C1", "count": year}]
+        return {"group_by": groups, "meta": {"next_cursor": "p2"}}
+    return {"group_by": [{"key": "https://openalex.org/C2", "count": 2 * year}], "meta": {"next_cursor": None}}
+
+
+def test_batched_concept_counts_split_back_per_concept(stub_server):
+    stub_server.default = (200, {}, concept_groups)
+    client = OpenAlexClient(base_url=stub_server.url, rate_limiter=RateLimiter(1000))
+    ids = ["https://openalex.org/C1", "https://openalex.org/C2"]
+
+    counts = client.fetch_counts_by_concepts(ids, 2020, 2021, strategy="per_year")
+
+    assert counts == {ids[0]: {2020: 2020, 2021: 2021}, ids[1]: {2020: 4040, 2021: 4042}}
+    assert {p["filter"].split(",")[0] for _, p in stub_server.requests} == {"concepts.id:C1|C2"}
+    assert len(stub_server.requests) == 4
+
+
+def test_response_cache_serves_fresh_and_revalidates_stale(stub_server):
+    from src.cache import MemoryCache
+
+    stub_server.queue(200, {"group_by": [{"key": "2020", "count": 1}]}, {"ETag": '"v1"'})
+    stub_server.queue(304, b"")
+    client = OpenAlexClient(base_url=stub_server.url, rate_limiter=RateLimiter(1000), response_cache=MemoryCache())
+
+    first = client.get("works", {"filter": "x", "per_page": 200})
+    assert client.get("works", {"per_page": "200", "filter": "x"}) == first
+    assert len(stub_server.requests) == 1
+
+    client.response_max_age = 0
+    assert client.get("works", {"filter": "x", "per_page": 200}) == first
+    assert len(stub_server.requests) == 2
+
+
+def test_batched_concept_paging_is_bounded_for_absent_concepts(stub_server):
+    def respond(path, params):
+        if params.get("group_by") == "publication_year":
+            return {"group_by": [{"key": "2021", "count": 5}]}
+        # Endless co-occurring concepts; C3 has no works in either year
+        page = 0 if params["cursor"] == "*" else int(params["cursor"])
+        return {"group_by": [{"key": "https://openalex.org/C1", "count": 7}] if page == 0 else [{"key": f"C9{page}", "count": 1}],
+                "meta": {"next_cursor": str(page + 1)}}
+
+    stub_server.default = (200, {}, respond)
+    client = OpenAlexClient(base_url=stub_server.url, rate_limiter=RateLimiter(1000))
+    ids = ["https://openalex.org/C1", "https://openalex.org/C3"]
+
+    counts = client.fetch_counts_by_concepts(ids, 2020, 2021, strategy="per_year")
+
+    assert counts == {ids[0]: {2020: 7, 2021: 7}, ids[1]: {2021: 5}}
+    # MAX_CONCEPT_GROUP_PAGES pages per year, then one per-concept request for C3
+    assert len(stub_server.requests) == 2 * openalex_client.MAX_CONCEPT_GROUP_PAGES + 1
@@ -0,0 +1,57 @@
+"""Tests for concept resolution and the auto-resolve pass."""
+from src.api.openalex_client import OpenAlexClient
+from src.api.rate_limit import RateLimiter
+from src.cache import DiskCache
+from src.data.concepts import apply_resolved, auto_resolve_concepts, concept_queries
+
+
+def concept_search(path, params):
+    hits = {
+        "computer vision": {"id": "https://openalex.org/C31972630", "display_name": "Computer vision", "works_count": 9},
+        "llm": {"id": "https://openalex.org/C999", "display_name": "Master of Laws", "works_count": 1},
+    }
+    hit = hits.get(params["search"].lower())
+    return {"results": [hit] if hit else []}
+
+
+def test_concept_index_persists_across_clients(stub_server, tmp_path):
+    stub_server.default = (200, {}, concept_search)
+    index = DiskCache(str(tmp_path / "concepts"))
+
+    first = OpenAlexClient(base_url=stub_server.url, rate_limiter=RateLimiter(1000), concept_cache=index)
+    assert first.resolve_concept_id("Computer Vision") == "https://openalex.org/C31972630"
+    assert first.resolve_concepts(["computer vision", "nothing here"]) == {
+        "computer vision": concept_search(None, {"search": "computer vision"})["results"][0],
+        "nothing here": None,
+    }
+
+    second = OpenAlexClient(base_url=stub_server.url, rate_limiter=RateLimiter(1000), concept_cache=DiskCache(str(tmp_path / "concepts")))
+    second.resolve_concepts(["computer  vision", "nothing here"])
+
+    # One request per distinct query in total; misses are remembered too
+    assert len(stub_server.requests) == 2
+
+
+def test_only_exact_matches_are_adopted(stub_server):
+    stub_server.default = (200, {}, concept_search)
+    client = OpenAlexClient(base_url=stub_server.url, rate_limiter=RateLimiter(1000))
+    directions = [
+        {"name": "Computer Vision (CV)", "concept_id": None, "keywords": ["computer vision"]},
+        {"name": "Large Language Models (LLM)", "concept_id": None, "keywords": ["LLM"]},
+        {"name": "NLP", "concept_id": "https://openalex.org/C154945302", "keywords": ["nlp"]},
+    ]
+
+    resolved = auto_resolve_concepts(client, directions)
+
+    assert resolved[0]["concept_id"] == "https://openalex.org/C31972630"
+    assert resolved[1]["concept_id"] is None
+    assert resolved[2] is directions[2]
+    assert directions[0]["concept_id"] is None
+
+
+def test_plural_names_match_singular_concepts():
+    direction = {"name": "Graph Neural Networks (GNN)", "keywords": ["graph neural network"]}
+    record = {"id": "C1", "display_name": "Graph neural network"}
+
+    assert concept_queries(direction)[0] == "Graph Neural Networks"
+    assert apply_resolved([direction], {"Graph Neural Networks": record})[0]["concept_id"] == "C1"
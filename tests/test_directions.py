@@ -0,0 +1,80 @@
+"""Tests for the direction registry shared by the pipeline, the Cloud Function and the manifest."""
+import dataclasses
+import json
+import os
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+from src.config import directions
+from src.config.directions import BY_SLUG, DIRECTIONS, REGISTRY, as_direction, load_registry
+from src.data.aggregate import direction_cache_key
+from src.data.snapshot import build_snapshot, direction_index, manifest_metadata
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize("name", ["directions.json", "directions.py", "query.py"])
+def test_cloud_function_copies_match_the_source(name):
+    with open(os.path.join(ROOT, "src", "config", name), "rb") as f:
+        source = f.read()
+    with open(os.path.join(ROOT, "cloud-function", "src", "config", name), "rb") as f:
+        assert f.read() == source
+
+
+def test_registry_precomputes_identifiers():
+    nlp = BY_SLUG["natural_language_processing"]
+
+    assert nlp.name == "Natural Language Processing"
+    assert DIRECTIONS[0] == nlp.as_dict()
+    assert nlp.cache_key == direction_cache_key(DIRECTIONS[0], directions.START_YEAR, directions.END_YEAR)
+    assert nlp.key_for(2020, 2021) == direction_cache_key(DIRECTIONS[0], 2020, 2021)
+    assert nlp.filename(2010, 2025) == "natural_language_processing_2010_2025.json"
+    assert nlp.object_path(2010, 2025) == directions.DIRECTION_OBJECT_PREFIX + nlp.filename(2010, 2025)
+    assert as_direction(DIRECTIONS[0]) is nlp
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        nlp.slug = "nlp"
+
+
+def test_edited_direction_gets_its_own_fingerprint():
+    edited = as_direction({**DIRECTIONS[0], "keywords": ["nlp"]})
+
+    assert edited is not REGISTRY[0] and edited.slug == REGISTRY[0].slug
+    assert edited.fingerprint != REGISTRY[0].fingerprint
+    assert edited.cache_key != REGISTRY[0].cache_key
+
+
+def test_duplicate_slugs_are_rejected(tmp_path):
+    path = tmp_path / "directions.json"
+    path.write_text(json.dumps({
+        "start_year": 2020, "end_year": 2021,
+        "directions": [{"name": "A/B", "keywords": ["a"]}, {"name": "A B", "keywords": ["b"]}],
+    }))
+
+    with pytest.raises(ValueError, match="slug"):
+        load_registry(str(path))
+
+
+def test_snapshot_slugs_match_the_registry():
+    df = pd.DataFrame({"year": [2020] * len(REGISTRY), "direction": [d.name for d in REGISTRY], "count": 1})
+
+    snapshot = build_snapshot(df, 2020, 2020, directions=[d.name for d in REGISTRY])
+
+    assert snapshot["slugs"] == [d.slug for d in REGISTRY]
+    assert [entry["slug"] for entry in direction_index(REGISTRY)] == snapshot["slugs"]
+
+
+def test_manifest_metadata_lists_the_artifact_year_range():
+    metadata = manifest_metadata(REGISTRY, 2020, 2024)
+
+    assert (metadata["start_year"], metadata["end_year"]) == (2020, 2024)
+    assert metadata["directions"] == direction_index(REGISTRY)
+
+
+def test_registry_does_not_import_the_http_client():
+    code = "import sys, src.config.directions; print('src.api.openalex_client' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+
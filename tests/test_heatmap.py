@@ -0,0 +1,59 @@
+"""Tests for the heatmap pivot and transforms."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.viz.heatmap import build_heatmap_pivot, compute_log_heatmap, transform_heatmap
+
+
+def sample_frame():
+    return pd.DataFrame(
+        {"year": [2020, 2021, 2022, 2020, 2022], "direction": ["A", "A", "A", "B", "B"], "count": [1, 3, 6, 3, 0]}
+    )
+
+
+def test_pivot_covers_the_range_and_follows_the_frame():
+    df = sample_frame()
+    pivot = build_heatmap_pivot(df, 2019, 2022)
+
+    assert list(pivot.index) == [2019, 2020, 2021, 2022]
+    assert pivot.loc[2019].tolist() == [0, 0]
+    # Not shared between calls: in-place edits of the frame or the pivot are never stale
+    df.loc[0, "count"] = 100
+    pivot.loc[2019, "A"] = 7
+    fresh = build_heatmap_pivot(df, 2019, 2022)
+    assert fresh.loc[2020, "A"] == 100 and fresh.loc[2019, "A"] == 0
+
+
+def test_precomputed_pivot_is_used():
+    pivot = build_heatmap_pivot(sample_frame(), 2020, 2022) * 0
+
+    assert compute_log_heatmap(sample_frame(), 2020, 2022, pivot=pivot).to_numpy().sum() == 0.0
+
+
+def test_log_heatmap_applies_log1p_once():
+    log = compute_log_heatmap(sample_frame(), 2020, 2022)
+    assert log.loc[2021, "A"] == pytest.approx(np.log1p(3))
+    assert log.loc[2021, "B"] == 0.0
+
+
+def test_normalizations():
+    pivot = build_heatmap_pivot(sample_frame(), 2020, 2022)
+
+    share = transform_heatmap(pivot, "row_share")
+    assert share.loc[2020].tolist() == [0.25, 0.75]
+    assert share.loc[2022].tolist() == [1.0, 0.0]
+
+    z = transform_heatmap(pivot, "zscore")
+    assert z["A"].mean() == pytest.approx(0.0)
+    assert z["A"].std(ddof=0) == pytest.approx(1.0)
+
+    yoy = transform_heatmap(pivot, "yoy")
+    assert np.isnan(yoy.loc[2020, "A"])
+    assert yoy.loc[2021, "A"] == pytest.approx(2.0)
+    assert yoy.loc[2022, "A"] == pytest.approx(1.0)
+    assert yoy.loc[2021, "B"] == pytest.approx(-1.0)
+    assert np.isnan(yoy.loc[2022, "B"])
+
+    with pytest.raises(ValueError):
+        transform_heatmap(pivot, "bogus")
@@ -0,0 +1,49 @@
+"""Tests for the metrics registry and client instrumentation."""
+import json
+
+from src.api.openalex_client import OpenAlexClient
+from src.api.rate_limit import RateLimiter
+from src.metrics import Metrics
+
+
+def test_prometheus_and_json_exports():
+    metrics = Metrics(buckets=(0.1, 1.0))
+    metrics.inc("openalex_requests_total", endpoint="works", status=200)
+    metrics.inc("openalex_requests_total", endpoint="works", status=200)
+    metrics.observe("openalex_request_seconds", 0.05, endpoint="works")
+    metrics.observe("openalex_request_seconds", 0.5, endpoint="works")
+
+    text = metrics.to_prometheus()
+    assert 'openalex_requests_total{endpoint="works",status="200"} 2' in text
+    assert 'openalex_request_seconds_bucket{endpoint="works",le="0.1"} 1' in text
+    assert 'openalex_request_seconds_bucket{endpoint="works",le="+Inf"} 2' in text
+    assert 'openalex_request_seconds_count{endpoint="works"} 2' in text
+
+    data = json.loads(metrics.to_json())
+    assert data["histograms"]["openalex_request_seconds"][0]["buckets"] == {"0.1": 1, "1.0": 2, "+Inf": 2}
+
+
+def test_prometheus_values_keep_full_precision():
+    metrics = Metrics(buckets=(1.0,))
+    metrics.inc("openalex_response_bytes_total", 5242881)
+    metrics.observe("openalex_request_seconds", 1234.5678901)
+
+    text = metrics.to_prometheus()
+    assert "openalex_response_bytes_total 5242881\n" in text
+    assert "openalex_request_seconds_sum 1234.5678901\n" in text
+
+
+def test_client_records_requests_retries_and_bytes(stub_server):
+    stub_server.queue(503)
+    stub_server.queue(200, {"group_by": []})
+    client = OpenAlexClient(base_url=stub_server.url, rate_limiter=RateLimiter(1000), backoff_base=0.01)
+
+    client.get("works", {"filter": "x"})
+
+    m = client.metrics
+    assert m.counter("openalex_requests_total", endpoint="works", status=503) == 1
+    assert m.counter("openalex_requests_total", endpoint="works", status=200) == 1
+    assert m.counter("openalex_retries_total", endpoint="works", reason="status") == 1
+    assert m.counter("openalex_response_bytes_total", endpoint="works") > 0
+    assert m.total("openalex_backoff_sleep_seconds_total") > 0
+    assert m.to_dict()["histograms"]["openalex_request_seconds"][0]["count"] == 2
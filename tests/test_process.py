@@ -0,0 +1,36 @@
+"""Tests for vectorized frame/matrix conversions."""
+import pandas as pd
+
+from src.data.aggregate import _to_frame
+from src.data.process import counts_by_direction, year_direction_matrix
+
+
+def test_to_frame_is_direction_major_and_categorical():
+    df = _to_frame(
+        [{"name": "B"}, {"name": "A"}, {"name": "C"}],
+        [{2021: 2, 2020: 1}, {}, {2020: 5}],
+    )
+
+    assert list(df.itertuples(index=False, name=None)) == [(2020, "B", 1), (2021, "B", 2), (2020, "C", 5)]
+    assert list(df["direction"].cat.categories) == ["B", "A", "C"]
+    assert df["year"].dtype == "int64" and df["count"].dtype == "int64"
+
+
+def test_year_direction_matrix_fills_and_clips():
+    df = pd.DataFrame({"year": [2020, 2021, 2020, 2030], "direction": ["b", "b", "a", "a"], "count": [1, 2, 3, 4]})
+
+    m = year_direction_matrix(df, 2019, 2021)
+
+    assert list(m.index) == [2019, 2020, 2021]
+    assert list(m.columns) == ["b", "a"]
+    assert m.to_numpy().tolist() == [[0, 0], [1, 3], [2, 0]]
+
+
+def test_counts_by_direction_matches_row_iteration():
+    df = _to_frame([{"name": "X"}, {"name": "Y"}], [{2020: 1, 2021: 2}, {2019: 7}])
+
+    expected = {}
+    for _, row in df.iterrows():
+        expected.setdefault(row["direction"], {})[int(row["year"])] = int(row["count"])
+
+    assert counts_by_direction(df) == expected
@@ -0,0 +1,98 @@
+"""Tests for manifest-driven publishing."""
+from src.publish import MANIFEST_PATH, publish, read_manifest
+from src.storage_backends import MemoryStorage, Upload, json_upload
+
+
+def direction_uploads(nlp_2025):
+    return [
+        json_upload("nlp_2010_2025.json", {"2024": 10, "2025": nlp_2025}),
+        json_upload("cv_2010_2025.json", {"2024": 7, "2025": 8}),
+    ]
+
+
+def test_second_publish_skips_unchanged_objects():
+    backend = MemoryStorage()
+    first = publish(backend, direction_uploads(11))
+    assert first.uploaded == ["nlp_2010_2025.json", "cv_2010_2025.json"]
+    assert first.skipped == []
+
+    second = publish(backend, direction_uploads(12))
+    assert second.uploaded == ["nlp_2010_2025.json"]
+    assert second.skipped == ["cv_2010_2025.json"]
+    assert second.bytes_skipped == len(direction_uploads(12)[1].data)
+
+    manifest = read_manifest(backend)
+    assert set(manifest["objects"]) == {"nlp_2010_2025.json", "cv_2010_2025.json"}
+
+
+def test_unchanged_run_does_not_rewrite_manifest():
+    backend = MemoryStorage()
+    publish(backend, direction_uploads(11))
+    manifest_before = backend.objects[MANIFEST_PATH]
+
+    report = publish(backend, direction_uploads(11))
+
+    assert report.uploaded == []
+    assert backend.objects[MANIFEST_PATH] is manifest_before
+
+
+def test_missing_manifest_falls_back_to_stored_hashes():
+    backend = MemoryStorage()
+    backend.put(Upload("a.json", b"1"))
+
+    report = publish(backend, [Upload("a.json", b"1"), Upload("b.json", b"2")])
+
+    assert report.skipped == ["a.json"]
+    assert report.uploaded == ["b.json"]
+    assert read_manifest(backend) is not None
+
+
+def test_metadata_is_stored_and_rewrites_the_manifest_only_when_changed():
+    backend = MemoryStorage()
+    directions = [{"slug": "nlp", "name": "NLP"}]
+    publish(backend, direction_uploads(11), metadata={"directions": directions})
+    manifest_before = backend.objects[MANIFEST_PATH]
+
+    publish(backend, direction_uploads(11), metadata={"directions": directions})
+    assert backend.objects[MANIFEST_PATH] is manifest_before
+
+    renamed = [{"slug": "nlp", "name": "Natural Language Processing"}]
+    report = publish(backend, direction_uploads(11), metadata={"directions": renamed})
+    assert report.uploaded == []
+    assert read_manifest(backend)["directions"] == renamed
+
+
+def test_rebuilt_dashboard_artifacts_keep_their_hash():
+    import pandas as pd
+
+    from src.data.analytics import analytics_bytes, build_analytics, build_ranking_index
+    from src.data.snapshot import build_snapshot, snapshot_bytes
+
+    df = pd.DataFrame({"year": [2020, 2021, 2020, 2021], "direction": ["A", "A", "B", "B"], "count": [1, 2, 3, 4]})
+
+    def artifacts():
+        snapshot = build_snapshot(df, 2020, 2021)
+        return [
+            Upload("snapshot.json", snapshot_bytes(snapshot), "application/json", "gzip"),
+            Upload("analytics.json", analytics_bytes(build_analytics(snapshot)), "application/json", "gzip"),
+            Upload("ranking.json", analytics_bytes(build_ranking_index(snapshot)), "application/json", "gzip"),
+        ]
+
+    backend = MemoryStorage()
+    publish(backend, artifacts())
+    stamps = {path: entry["updated_at"] for path, entry in read_manifest(backend)["objects"].items()}
+
+    report = publish(backend, artifacts())
+
+    assert report.uploaded == [] and len(report.skipped) == 3
+    assert {path: entry["updated_at"] for path, entry in read_manifest(backend)["objects"].items()} == stamps
+
+
+def test_retired_paths_leave_the_manifest():
+    backend = MemoryStorage()
+    publish(backend, direction_uploads(11) + [json_upload("cache/nlp_2010_2025.json", {"2025": 11})])
+
+    report = publish(backend, direction_uploads(11), retired=["cache/nlp_2010_2025.json"])
+
+    assert report.uploaded == []
+    assert set(read_manifest(backend)["objects"]) == {"nlp_2010_2025.json", "cv_2010_2025.json"}
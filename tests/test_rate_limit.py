@@ -0,0 +1,87 @@
+"""Tests for client pacing, retries and backoff against a local stub server."""
+import time
+
+import pytest
+import requests
+
+from src.api.openalex_client import OpenAlexClient
+from src.api.rate_limit import RateLimiter, backoff_delay, parse_retry_after
+
+
+def make_client(stub_server, **kwargs):
+    kwargs.setdefault("rate_limiter", RateLimiter(rate=1000))
+    kwargs.setdefault("backoff_base", 0.01)
+    return OpenAlexClient(base_url=stub_server.url, **kwargs)
+
+
+def test_token_bucket_allows_burst_then_paces():
+    limiter = RateLimiter(rate=20, burst=5)
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.acquire()
+    assert time.monotonic() - start < 0.05
+    for _ in range(4):
+        limiter.acquire()
+    # 4 extra tokens at 20/s need ~0.2s
+    assert time.monotonic() - start >= 0.15
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("garbage") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_backoff_delay_grows_and_is_capped():
+    assert 0.5 <= backoff_delay(1, base=1.0, cap=10.0) <= 1.0
+    assert 2.0 <= backoff_delay(3, base=1.0, cap=10.0) <= 4.0
+    assert 5.0 <= backoff_delay(10, base=1.0, cap=10.0) <= 10.0
+
+
+def test_get_retries_transient_errors(stub_server):
+    stub_server.queue(503)
+    stub_server.queue(502)
+    stub_server.queue(200, {"ok": True})
+    client = make_client(stub_server)
+
+    assert client.get("works") == {"ok": True}
+    assert len(stub_server.requests) == 3
+
+
+def test_get_honors_retry_after(stub_server):
+    stub_server.queue(429, headers={"Retry-After": "1"})
+    stub_server.queue(200, {"ok": True})
+    client = make_client(stub_server)
+
+    start = time.monotonic()
+    assert client.get("works") == {"ok": True}
+    assert time.monotonic() - start >= 0.9
+
+
+def test_get_does_not_retry_client_errors(stub_server):
+    stub_server.queue(404)
+    client = make_client(stub_server)
+
+    with pytest.raises(requests.HTTPError):
+        client.get("works")
+    assert len(stub_server.requests) == 1
+
+
+def test_get_gives_up_after_max_retries(stub_server):
+    stub_server.default = (500, {}, {})
+    client = make_client(stub_server, max_retries=2)
+
+    with pytest.raises(requests.HTTPError):
+        client.get("works")
+    assert len(stub_server.requests) == 3
+
+
+def test_get_respects_request_deadline(stub_server):
+    stub_server.default = (429, {"Retry-After": "30"}, {})
+    client = make_client(stub_server, request_deadline=1.0)
+
+    start = time.monotonic()
+    with pytest.raises(requests.HTTPError):
+        client.get("works")
+    assert time.monotonic() - start < 1.0
@@ -0,0 +1,44 @@
+"""Tests for headless chart rendering."""
+import sys
+
+import pandas as pd
+import pytest
+
+from src.viz.render import render_direction_trends, render_heatmap, render_trend
+
+
+def sample_frame():
+    return pd.DataFrame(
+        {
+            "year": [2020, 2021, 2020, 2021, 2020],
+            "direction": ["NLP", "NLP", "Computer Vision", "Computer Vision", "Robotics"],
+            "count": [1, 3, 2, 5, 4],
+        }
+    )
+
+
+def test_render_trend_returns_png_and_svg_bytes():
+    png = render_trend([2020, 2021], [1, 3], "NLP")
+    svg = render_trend([2020, 2021], [1, 3], "NLP", fmt="svg")
+
+    assert png.startswith(b"\x89PNG")
+    assert b"<svg" in svg
+    with pytest.raises(ValueError):
+        render_trend([2020], [1], "NLP", fmt="gif")
+
+
+def test_render_heatmap_does_not_touch_pyplot():
+    png = render_heatmap(sample_frame(), 2020, 2021, transform="log1p")
+
+    assert png.startswith(b"\x89PNG")
+    if "matplotlib.pyplot" in sys.modules:
+        assert sys.modules["matplotlib.pyplot"].get_fignums() == []
+
+
+def test_render_direction_trends_in_pool_matches_in_process():
+    df = sample_frame()
+    serial = render_direction_trends(df, fmt="svg", max_workers=1)
+    pooled = render_direction_trends(df, fmt="svg", max_workers=2)
+
+    assert list(serial) == ["nlp", "computer_vision", "robotics"]
+    assert pooled == serial
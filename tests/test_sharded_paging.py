@@ -0,0 +1,85 @@
+"""Tests for sharded, resumable full paging."""
+import json
+import logging
+
+from src.api.openalex_client import OpenAlexClient
+from src.api.rate_limit import RateLimiter
+from src.api.sharded_paging import build_shards, page_shards, sum_by_year
+
+
+def test_build_shards_by_month_and_type():
+    months = build_shards("concepts.id:C1", 2024, 2024, split_by="month")
+    assert len(months) == 12
+    assert months[1].filter == "concepts.id:C1,from_publication_date:2024-02-01,to_publication_date:2024-02-29"
+
+    types = build_shards("", 2020, 2021, split_by="type", types=("article", "preprint"))
+    assert [s.key for s in types] == [
+        "2020:article", "2020:preprint", "2020:other", "2021:article", "2021:preprint", "2021:other",
+    ]
+    assert types[2].filter == "publication_year:2020,type:!article,type:!preprint"
+
+
+def year_pages(path, params):
+    """Two pages of works per year: cursor "*" -> "<year>-p2" -> end."""
+    year = params["filter"].split("publication_year:")[1]
+    if params["cursor"] == "*":
+        return {"meta": {"next_cursor": f"{year}-p2"}, "results": [{"id": "a"}, {"id": "b"}]}
+    return {"meta": {"next_cursor": None}, "results": [{"id": "c"}]}
+
+
+def test_page_shards_counts_and_reports_progress(stub_server):
+    stub_server.default = (200, {}, year_pages)
+    client = OpenAlexClient(base_url=stub_server.url, rate_limiter=RateLimiter(1000))
+    shards = build_shards("concepts.id:C1", 2010, 2013)
+    events = []
+
+    counts = page_shards(client, shards, max_workers=3, on_progress=events.append)
+
+    assert sum_by_year(shards, counts) == {2010: 3, 2011: 3, 2012: 3, 2013: 3}
+    assert sorted((e.shard, e.pages, e.works, e.done) for e in events if e.done) == [
+        (str(y), 2, 3, True) for y in range(2010, 2014)
+    ]
+
+
+def test_interrupted_run_resumes_from_checkpoint(stub_server, tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+    client = OpenAlexClient(base_url=stub_server.url, rate_limiter=RateLimiter(1000), max_retries=0)
+    shards = build_shards("", 2020, 2020)
+
+    stub_server.queue(200, year_pages)
+    stub_server.queue(404)
+    failed = page_shards(client, shards, max_workers=1, checkpoint_path=str(checkpoint), on_progress=lambda e: None)
+    assert failed == {"2020": None}
+    assert sum_by_year(shards, failed) == {2020: 0}
+    assert json.loads(checkpoint.read_text())["2020"]["cursor"] == "2020-p2"
+
+    stub_server.default = (200, {}, year_pages)
+    resumed = page_shards(client, shards, max_workers=1, checkpoint_path=str(checkpoint), on_progress=lambda e: None)
+    assert resumed == {"2020": 3}
+    assert [p["cursor"] for _, p in stub_server.requests] == ["*", "2020-p2", "2020-p2"]
+
+
+def test_checkpoint_of_a_different_filter_is_not_reused(stub_server, tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+    stub_server.default = (200, {}, year_pages)
+    client = OpenAlexClient(base_url=stub_server.url, rate_limiter=RateLimiter(1000))
+
+    page_shards(client, build_shards("concepts.id:C1", 2020, 2020), max_workers=1, checkpoint_path=str(checkpoint),
+                on_progress=lambda e: None)
+    assert len(stub_server.requests) == 2
+
+    # Same shard key ("2020"), different base filter: paged again from the start
+    other = build_shards("concepts.id:C2", 2020, 2020)
+    assert page_shards(client, other, max_workers=1, checkpoint_path=str(checkpoint), on_progress=lambda e: None) == {"2020": 3}
+    assert len(stub_server.requests) == 4
+    assert stub_server.requests[2][1]["filter"] == "concepts.id:C2,publication_year:2020"
+
+
+def test_default_progress_log_names_shard_and_counts(stub_server, caplog):
+    stub_server.default = (200, {}, year_pages)
+    client = OpenAlexClient(base_url=stub_server.url, rate_limiter=RateLimiter(1000))
+
+    with caplog.at_level(logging.INFO, logger="src.api.sharded_paging"):
+        page_shards(client, build_shards("", 2021, 2021), max_workers=1)
+
+    assert "Shard 2021: 2 pages, 3 works, done" in caplog.messages
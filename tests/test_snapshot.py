@@ -0,0 +1,36 @@
+"""Tests for the consolidated snapshot."""
+import gzip
+import json
+
+import pandas as pd
+
+from src.data.snapshot import build_snapshot, load_snapshot, snapshot_name, write_snapshot
+
+
+def sample_frame():
+    return pd.DataFrame(
+        [(2020, "RLHF", 3), (2022, "RLHF", 9), (2020, "Computer Vision", 100), (2021, "Computer Vision", 120)],
+        columns=["year", "direction", "count"],
+    )
+
+
+def test_build_snapshot_matrix():
+    snap = build_snapshot(sample_frame(), 2020, 2022)
+
+    assert snap["years"] == [2020, 2021, 2022]
+    assert snap["directions"] == ["RLHF", "Computer Vision"]
+    assert snap["slugs"] == ["rlhf", "computer_vision"]
+    assert snap["counts"] == [[3, 0, 9], [100, 120, 0]]
+    assert snapshot_name(2020, 2022) == "snapshot_2020_2022.json"
+
+
+def test_write_and_load_round_trip(tmp_path):
+    path = tmp_path / "snapshot.json.gz"
+    write_snapshot(build_snapshot(sample_frame(), 2020, 2022, directions=["Computer Vision", "RLHF", "RAG"]), str(path))
+
+    assert json.loads(gzip.decompress(path.read_bytes()))["directions"] == ["Computer Vision", "RLHF", "RAG"]
+    df = load_snapshot(str(path))
+    assert list(df.columns) == ["year", "direction", "count"]
+    assert len(df) == 9
+    assert df[(df["direction"] == "RLHF") & (df["year"] == 2022)]["count"].item() == 9
+    assert df[df["direction"] == "RAG"]["count"].sum() == 0
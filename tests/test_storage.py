@@ -0,0 +1,110 @@
+"""Tests for upload helpers and storage backends (fake GCS bucket, local, memory)."""
+import gzip
+import json
+
+import pytest
+
+from src.storage import Upload, download_json, upload_bytes, upload_json, upload_many
+from src.storage_backends import GCSStorage, LocalStorage, MemoryStorage, backend_from_config, content_hash
+
+
+class FakeBlob:
+    def __init__(self, bucket, name):
+        self.bucket = bucket
+        self.name = name
+        self.cache_control = None
+        self.content_encoding = None
+
+    @property
+    def md5_hash(self):
+        return content_hash(self.bucket.objects[self.name]["data"])
+
+    def upload_from_string(self, data, content_type=None):
+        self.bucket.objects[self.name] = {
+            "data": data,
+            "content_type": content_type,
+            "content_encoding": self.content_encoding,
+            "cache_control": self.cache_control,
+        }
+
+    def exists(self):
+        return self.name in self.bucket.objects
+
+    def download_as_bytes(self, raw_download=False):
+        return self.bucket.objects[self.name]["data"]
+
+
+class FakeBucket:
+    def __init__(self):
+        self.objects = {}
+
+    def blob(self, name):
+        return FakeBlob(self, name)
+
+    def get_blob(self, name):
+        return FakeBlob(self, name) if name in self.objects else None
+
+    def list_blobs(self, prefix=""):
+        return [FakeBlob(self, n) for n in sorted(self.objects) if n.startswith(prefix)]
+
+
+def test_upload_json_is_compact_gzip_with_headers():
+    bucket = FakeBucket()
+    backend = GCSStorage(bucket=bucket)
+    upload_json("a.json", {"2020": 1}, backend=backend)
+
+    obj = bucket.objects["a.json"]
+    assert obj["content_type"] == "application/json"
+    assert obj["content_encoding"] == "gzip"
+    assert obj["cache_control"].startswith("public")
+    assert gzip.decompress(obj["data"]) == b'{"2020":1}'
+    assert download_json("a.json", backend=backend) == {"2020": 1}
+
+
+def test_upload_bytes_guesses_content_type():
+    bucket = FakeBucket()
+    upload_bytes("charts/nlp.png", b"\x89PNG", backend=GCSStorage(bucket=bucket))
+
+    obj = bucket.objects["charts/nlp.png"]
+    assert obj["content_type"] == "image/png"
+    assert obj["content_encoding"] is None
+    assert obj["data"] == b"\x89PNG"
+
+
+def test_upload_many_preserves_order():
+    bucket = FakeBucket()
+    uploads = [Upload(f"{i}.json", json.dumps(i).encode(), "application/json") for i in range(20)]
+    results = upload_many(uploads, max_workers=4, backend=GCSStorage(bucket=bucket))
+
+    assert [r["path"] for r in results] == [f"{i}.json" for i in range(20)]
+    assert len(bucket.objects) == 20
+
+
+def test_gcs_client_is_created_lazily():
+    backend = backend_from_config("gcs")
+    assert backend._client is None and backend._bucket is None
+
+
+@pytest.mark.parametrize("kind", ["memory", "local", "gcs"])
+def test_put_many_if_changed_skips_identical_content(kind, tmp_path):
+    backend = {
+        "memory": lambda: MemoryStorage(),
+        "local": lambda: LocalStorage(str(tmp_path)),
+        "gcs": lambda: GCSStorage(bucket=FakeBucket()),
+    }[kind]()
+    backend.put_many([Upload("d/a.json", b"1"), Upload("d/b.json", b"2")])
+
+    results = backend.put_many([Upload("d/a.json", b"1"), Upload("d/b.json", b"3"), Upload("d/c.json", b"4")], if_changed=True)
+
+    assert [r["status"] for r in results] == ["skipped", "uploaded", "uploaded"]
+    assert backend.get_many(["d/a.json", "d/b.json", "missing.json"]) == {
+        "d/a.json": b"1",
+        "d/b.json": b"3",
+        "missing.json": None,
+    }
+
+
+def test_local_storage_rejects_paths_outside_root(tmp_path):
+    backend = LocalStorage(str(tmp_path / "bucket"))
+    with pytest.raises(ValueError):
+        backend.put(Upload("../escape.json", b"x"))
@@ -0,0 +1,83 @@
+"""Tests for sub-year counts and the multi-resolution time series store."""
+import numpy as np
+
+from src.api.openalex_client import OpenAlexClient, keyword_search_expression
+from src.api.rate_limit import RateLimiter
+from src.data.timeseries import TimeSeriesStore, fetch_timeseries, read_timeseries, timeseries_bytes
+
+
+def test_rollups_and_weeks_from_daily_counts():
+    store = TimeSeriesStore(2023, 2024)
+    store.set_daily("RAG", {"2023-01-01": 1, "2023-01-02": 2, "2023-03-31": 4, "2024-12-31": 8, "2025-01-01": 99})
+
+    months = store.series("RAG", "month")
+    assert months["2023-01"] == 3 and months["2023-03"] == 4 and months["2024-12"] == 8
+    assert store.series("RAG", "quarter")["2023-Q1"] == 7
+    assert store.series("RAG", "year") == {"2023": 7, "2024": 8}
+    # 2023-01-01 is a Sunday: it falls in the week starting Monday 2022-12-26
+    weeks = store.series("RAG", "week")
+    assert weeks["2022-12-26"] == 1 and weeks["2023-01-02"] == 2
+    assert sum(weeks.values()) == 15
+
+
+def test_monthly_fallback_and_sparse_round_trip():
+    store = TimeSeriesStore(2020, 2022)
+    store.set_daily("A", {"2021-06-15": 5})
+    store.set_monthly("B", {"2020-02": 1, "2022-11": 3})
+
+    restored = read_timeseries(timeseries_bytes(store))
+
+    assert restored.directions == ["A", "B"]
+    assert np.array_equal(restored.matrix("month"), store.matrix("month"))
+    assert restored.has_weeks("A") and not restored.has_weeks("B")
+    assert store.to_dict()["month"]["B"] == [1, [1] + [0] * 32 + [3]]
+    assert list(restored.to_frame("week")["direction"].unique()) == ["A"]
+
+
+def date_groups(path, params):
+    """Two group_by=publication_date pages; unknown keys are ignored."""
+    if params["cursor"] == "*":
+        return {"meta": {"next_cursor": "c1"}, "group_by": [{"key": "2024-05-01", "count": 3}, {"key": "unknown", "count": 9}]}
+    if params["cursor"] == "c1":
+        return {"meta": {"next_cursor": "c2"}, "group_by": [{"key": "2024-05-20", "count": 2}]}
+    return {"meta": {"next_cursor": None}, "group_by": []}
+
+
+def test_daily_counts_page_the_date_groups(stub_server):
+    stub_server.default = (200, {}, date_groups)
+    client = OpenAlexClient(base_url=stub_server.url, rate_limiter=RateLimiter(1000))
+
+    counts = client.fetch_daily_counts({"name": "RAG", "keywords": ["retrieval augmented", "RAG"]}, 2024, 2024)
+
+    assert counts == {"2024-05-01": 3, "2024-05-20": 2}
+    params = stub_server.requests[0][1]
+    assert params["group_by"] == "publication_date"
+    assert params["filter"] == "from_publication_date:2024-01-01,to_publication_date:2024-12-31"
+    assert params["search"] == keyword_search_expression(["retrieval augmented", "RAG"])
+
+
+def test_rejected_date_grouping_falls_back_to_monthly_counts(stub_server):
+    def respond(path, params):
+        return {"meta": {"count": int(params["filter"][-5:-3])}}
+
+    stub_server.queue(400, {"error": "bad group_by"})
+    stub_server.default = (200, {}, respond)
+    client = OpenAlexClient(base_url=stub_server.url, rate_limiter=RateLimiter(1000))
+
+    store = fetch_timeseries(client, [{"name": "NLP", "concept_id": "C1"}], 2024, 2024, max_workers=1)
+
+    assert store.series("NLP", "month")["2024-02"] == 2
+    assert store.series("NLP", "year") == {"2024": 78}
+    assert not store.has_weeks("NLP")
+    assert len(stub_server.requests) == 13
+
+
+def test_rows_grow_geometrically():
+    store = TimeSeriesStore(2024, 2024)
+    for i in range(100):
+        store.set_monthly(f"D{i}", {"2024-01": i})
+
+    assert store.matrix("month").shape == (100, 12)
+    assert store.matrix("year")[:, 0].tolist() == list(range(100))
+    assert len(store._has_weeks) == 128
+    assert read_timeseries(timeseries_bytes(store)).directions == store.directions